@@ -5,24 +5,36 @@ Batch processing utility
 """
 
 from aws_lambda_powertools.utilities.batch.base import (
+    AsyncBatchProcessor,
+    BasePartialBatchProcessor,
     BasePartialProcessor,
     BatchProcessor,
     EventType,
     FailureResponse,
     SuccessResponse,
+    async_batch_processor,
     batch_processor,
 )
 from aws_lambda_powertools.utilities.batch.exceptions import ExceptionInfo
+from aws_lambda_powertools.utilities.batch.firehose import FirehoseTransformationProcessor
+from aws_lambda_powertools.utilities.batch.s3_pointer import S3PointerResolver
 from aws_lambda_powertools.utilities.batch.sqs import PartialSQSProcessor, sqs_batch_processor
+from aws_lambda_powertools.utilities.batch.sqs_fifo_partial_processor import SqsFifoPartialProcessor
 
 __all__ = (
+    "AsyncBatchProcessor",
     "BatchProcessor",
+    "BasePartialBatchProcessor",
     "BasePartialProcessor",
     "ExceptionInfo",
     "EventType",
     "FailureResponse",
+    "FirehoseTransformationProcessor",
     "PartialSQSProcessor",
+    "S3PointerResolver",
+    "SqsFifoPartialProcessor",
     "SuccessResponse",
+    "async_batch_processor",
     "batch_processor",
     "sqs_batch_processor",
 )
@@ -3,18 +3,44 @@
 """
 Batch processing utilities
 """
+import asyncio
 import copy
+import functools
+import json
 import logging
+import math
+import os
 import sys
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, overload
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type, Union, overload
+
+import jmespath
 
 from aws_lambda_powertools.middleware_factory import lambda_handler_decorator
-from aws_lambda_powertools.utilities.batch.exceptions import BatchProcessingError, ExceptionInfo
+from aws_lambda_powertools.utilities.batch.exceptions import (
+    BatchDeadlineExceededError,
+    BatchProcessingError,
+    ExceptionInfo,
+)
+from aws_lambda_powertools.utilities.batch.instrumentation import BatchStats, perf_counter_ns
+from aws_lambda_powertools.utilities.batch.process_pool import (
+    ProcessPool,
+    WorkerProcessError,
+    process_records,
+    to_exception_info,
+)
+from aws_lambda_powertools.utilities.batch.s3_pointer import S3PointerResolver
 from aws_lambda_powertools.utilities.data_classes.dynamo_db_stream_event import DynamoDBRecord
 from aws_lambda_powertools.utilities.data_classes.kinesis_stream_event import KinesisStreamRecord
 from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
+from aws_lambda_powertools.utilities.jmespath_utils import PowertoolsFunctions
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+if TYPE_CHECKING:
+    from aws_lambda_powertools.metrics.base import MetricManager
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +85,7 @@ class BasePartialProcessor(ABC):
         self.success_messages: List[BatchEventTypes] = []
         self.fail_messages: List[BatchEventTypes] = []
         self.exceptions: List[ExceptionInfo] = []
+        self.lambda_context: Optional[LambdaContext] = None
 
     @abstractmethod
     def _prepare(self):
@@ -81,7 +108,7 @@ class BasePartialProcessor(ABC):
         """
         raise NotImplementedError()
 
-    def process(self) -> List[Tuple]:
+    def process(self) -> List[Union[SuccessResponse, FailureResponse]]:
         """
         Call instance's handler for each record.
         """
@@ -94,7 +121,7 @@ class BasePartialProcessor(ABC):
     def __exit__(self, exception_type, exception_value, traceback):
         self._clean()
 
-    def __call__(self, records: List[dict], handler: Callable):
+    def __call__(self, records: List[dict], handler: Callable, lambda_context: Optional[LambdaContext] = None):
         """
         Set instance attributes before execution
 
@@ -104,9 +131,12 @@ class BasePartialProcessor(ABC):
             List with objects to be processed.
         handler: Callable
             Callable to process "records" entries.
+        lambda_context: Optional[LambdaContext]
+            Lambda's Context, used by processors that take the remaining invocation time into account
         """
         self.records = records
         self.handler = handler
+        self.lambda_context = lambda_context
         return self
 
     def success_handler(self, record, result: Any) -> SuccessResponse:
@@ -155,7 +185,7 @@ class BasePartialProcessor(ABC):
 
 @lambda_handler_decorator
 def batch_processor(
-    handler: Callable, event: Dict, context: Dict, record_handler: Callable, processor: BasePartialProcessor
+    handler: Callable, event: Dict, context: LambdaContext, record_handler: Callable, processor: BasePartialProcessor
 ):
     """
     Middleware to handle batch event processing
@@ -166,7 +196,7 @@ def batch_processor(
         Lambda's handler
     event: Dict
         Lambda's Event
-    context: Dict
+    context: LambdaContext
         Lambda's Context
     record_handler: Callable
         Callable to process each record from the batch
@@ -188,18 +218,228 @@ def batch_processor(
 
     Limitations
     -----------
-    * Async batch processors
+    * Async record handlers, use `async_batch_processor` with `AsyncBatchProcessor` instead
 
     """
-    records = event["Records"]
+    # Kinesis Data Firehose events use a lowercase records key
+    records = event["Records"] if "Records" in event else event["records"]
 
-    with processor(records, record_handler):
+    with processor(records, record_handler, lambda_context=context):
         processor.process()
 
     return handler(event, context)
 
 
-class BatchProcessor(BasePartialProcessor):
+class BasePartialBatchProcessor(BasePartialProcessor):
+    DEFAULT_RESPONSE: Dict[str, List[Optional[dict]]] = {"batchItemFailures": []}
+
+    def __init__(
+        self,
+        event_type: EventType,
+        model: Optional["BatchTypeModels"] = None,
+        metrics: Optional["MetricManager"] = None,
+    ):
+        """Process batch and partially report failed items
+
+        Parameters
+        ----------
+        event_type: EventType
+            Whether this is a SQS, DynamoDB Streams, or Kinesis Data Stream event
+        model: Optional["BatchTypeModels"]
+            Parser's data model using either SqsRecordModel, DynamoDBStreamRecordModel, KinesisDataStreamRecord
+        metrics: Optional[MetricManager]
+            Metrics instance to add record handler latency, record conversion time, and success and failure counts
+            to once per batch, e.g. `aws_lambda_powertools.metrics.Metrics`
+
+        Exceptions
+        ----------
+        BatchProcessingError
+            Raised when the entire batch has failed processing
+        """
+        self.event_type = event_type
+        self.model = model
+        self.metrics = metrics
+        self._stats: Optional[BatchStats] = BatchStats() if metrics is not None else None
+        self.batch_response = copy.deepcopy(self.DEFAULT_RESPONSE)
+        self._COLLECTOR_MAPPING = {
+            EventType.SQS: self._collect_sqs_failures,
+            EventType.KinesisDataStreams: self._collect_kinesis_failures,
+            EventType.DynamoDBStreams: self._collect_dynamodb_failures,
+        }
+        self._IDENTIFIER_MAPPING = {
+            EventType.SQS: self._get_sqs_identifier,
+            EventType.KinesisDataStreams: self._get_kinesis_identifier,
+            EventType.DynamoDBStreams: self._get_dynamodb_identifier,
+        }
+        self._DATA_CLASS_MAPPING = {
+            EventType.SQS: SQSRecord,
+            EventType.KinesisDataStreams: KinesisStreamRecord,
+            EventType.DynamoDBStreams: DynamoDBRecord,
+        }
+
+        super().__init__()
+
+    def response(self):
+        """Batch items that failed processing, if any"""
+        return self.batch_response
+
+    def _prepare(self):
+        """
+        Remove results from previous execution.
+        """
+        self.success_messages.clear()
+        self.fail_messages.clear()
+        self.exceptions.clear()
+        self.batch_response = copy.deepcopy(self.DEFAULT_RESPONSE)
+        if self._stats is not None:
+            self._stats.clear()
+
+    def _clean(self):
+        """
+        Report messages to be deleted in case of partial failure.
+        """
+        if self._stats is not None:
+            self._stats.publish(self.metrics, successes=self._get_success_count(), failures=self._get_failure_count())
+
+        if not self._has_messages_to_report():
+            return
+
+        if self._entire_batch_failed():
+            raise BatchProcessingError(
+                msg=f"All records failed processing. {len(self.exceptions)} individual errors logged "
+                f"separately below.",
+                child_exceptions=self.exceptions,
+            )
+
+        messages = self._get_messages_to_report()
+        self.batch_response = {"batchItemFailures": messages}
+
+    def _has_messages_to_report(self) -> bool:
+        if self._get_failure_count():
+            return True
+
+        logger.debug(f"All {self._get_success_count()} records successfully processed")
+        return False
+
+    def _get_success_count(self) -> int:
+        return len(self.success_messages)
+
+    def _get_failure_count(self) -> int:
+        return len(self.fail_messages)
+
+    def _entire_batch_failed(self) -> bool:
+        return len(self.exceptions) == len(self.records)
+
+    def _get_messages_to_report(self) -> List[Dict[str, str]]:
+        """
+        Format messages to use in batch deletion
+        """
+        return self._COLLECTOR_MAPPING[self.event_type]()
+
+    def _collect_sqs_failures(self):
+        return [{"itemIdentifier": self._get_sqs_identifier(msg)} for msg in self.fail_messages]
+
+    def _collect_kinesis_failures(self):
+        return [{"itemIdentifier": self._get_kinesis_identifier(msg)} for msg in self.fail_messages]
+
+    def _collect_dynamodb_failures(self):
+        return [{"itemIdentifier": self._get_dynamodb_identifier(msg)} for msg in self.fail_messages]
+
+    def _get_item_identifier(self, msg: Union[BatchEventTypes, dict]) -> str:
+        """
+        Identifier of a failed record, as reported in batchItemFailures
+        """
+        return self._IDENTIFIER_MAPPING[self.event_type](msg)
+
+    # Event Source Data Classes follow python idioms for fields
+    # while Parser/Pydantic follows the event field names to the latter.
+    # Raw records are reported when they couldn't be converted, e.g. failed model validation
+    def _get_sqs_identifier(self, msg) -> str:
+        if isinstance(msg, dict):
+            return msg["messageId"]
+        return msg.messageId if self.model else msg.message_id
+
+    def _get_kinesis_identifier(self, msg) -> str:
+        if isinstance(msg, dict):
+            return msg["kinesis"]["sequenceNumber"]
+        return msg.kinesis.sequenceNumber if self.model else msg.kinesis.sequence_number
+
+    def _get_dynamodb_identifier(self, msg) -> str:
+        if isinstance(msg, dict):
+            return msg["dynamodb"]["SequenceNumber"]
+        return msg.dynamodb.SequenceNumber if self.model else msg.dynamodb.sequence_number
+
+    @overload
+    def _to_batch_type(self, record: dict, event_type: EventType, model: "BatchTypeModels") -> "BatchTypeModels":
+        ...  # pragma: no cover
+
+    @overload
+    def _to_batch_type(self, record: dict, event_type: EventType) -> EventSourceDataClassTypes:
+        ...  # pragma: no cover
+
+    def _to_batch_type(self, record: dict, event_type: EventType, model: Optional["BatchTypeModels"] = None):
+        if self._stats is None:
+            return self._convert_record(record=record, event_type=event_type, model=model)
+
+        start = perf_counter_ns()
+        try:
+            return self._convert_record(record=record, event_type=event_type, model=model)
+        finally:
+            self._stats.add_conversion_time(perf_counter_ns() - start)
+
+    def _to_batch_types(self, records: List[dict]) -> List[Tuple[Any, Optional[ExceptionInfo]]]:
+        """
+        Convert records, validating them all at once when using a model.
+
+        Returns
+        -------
+        List[Tuple[Any, Optional[ExceptionInfo]]]
+            Converted record, or the raw record along with the exception when it failed conversion
+        """
+        if self.model is not None:
+            models = self._parse_models(records)
+            if models is not None:
+                return [(data, None) for data in models]
+
+        return [self._try_to_batch_type(record) for record in records]
+
+    def _try_to_batch_type(self, record: dict) -> Tuple[Any, Optional[ExceptionInfo]]:
+        try:
+            return self._to_batch_type(record=record, event_type=self.event_type, model=self.model), None
+        except Exception:
+            return record, sys.exc_info()
+
+    def _parse_models(self, records: List[dict]) -> Optional[List["BatchTypeModels"]]:
+        """
+        Validate all records with a single list model, falling back to per record validation on failure.
+        """
+        from pydantic import ValidationError, parse_obj_as
+
+        start = perf_counter_ns()
+        try:
+            # parse_obj_as caches the list model it creates, so it's only built once per model
+            return parse_obj_as(List[self.model], records)  # type: ignore[name-defined]
+        except ValidationError as exc:
+            logger.debug(f"{len(exc.errors())} validation errors in batch, validating records individually")
+            return None
+        finally:
+            if self._stats is not None:
+                self._stats.add_conversion_time(perf_counter_ns() - start)
+
+    def _convert_record(self, record: dict, event_type: EventType, model: Optional["BatchTypeModels"] = None):
+        if model is not None:
+            return model.parse_obj(record)
+        return self._DATA_CLASS_MAPPING[event_type](record)
+
+    def _handler_timer(self) -> Optional[int]:
+        return perf_counter_ns() if self._stats is not None else None
+
+    def _record_handler_latency(self, start: Optional[int]):
+        if self._stats is not None and start is not None:
+            self._stats.add_handler_latency(perf_counter_ns() - start)
+
+
+class BatchProcessor(BasePartialBatchProcessor):
     """Process native partial responses from SQS, Kinesis Data Streams, and DynamoDB.
 
 
@@ -308,9 +548,23 @@ class BatchProcessor(BasePartialProcessor):
         When all batch records fail processing
     """
 
-    DEFAULT_RESPONSE: Dict[str, List[Optional[dict]]] = {"batchItemFailures": []}
-
-    def __init__(self, event_type: EventType, model: Optional["BatchTypeModels"] = None):
+    def __init__(
+        self,
+        event_type: EventType,
+        model: Optional["BatchTypeModels"] = None,
+        max_concurrency: Optional[int] = None,
+        checkpoint: bool = False,
+        use_process_pool: bool = False,
+        chunk_size: Optional[int] = None,
+        timeout_margin_ms: Optional[int] = None,
+        metrics: Optional["MetricManager"] = None,
+        streaming: bool = False,
+        result_callback: Optional[Callable[[Union[SuccessResponse, FailureResponse]], Any]] = None,
+        deduplication_key_jmespath: Optional[str] = None,
+        jmespath_options: Optional[Dict] = None,
+        s3_pointer_resolver: Optional[S3PointerResolver] = None,
+        deaggregate: bool = False,
+    ):
         """Process batch and partially report failed items
 
         Parameters
@@ -319,40 +573,515 @@ class BatchProcessor(BasePartialProcessor):
             Whether this is a SQS, DynamoDB Streams, or Kinesis Data Stream event
         model: Optional["BatchTypeModels"]
             Parser's data model using either SqsRecordModel, DynamoDBStreamRecordModel, KinesisDataStreamRecord
+        max_concurrency: Optional[int]
+            Maximum number of records processed concurrently in a thread pool, by default records are processed
+            sequentially. The thread pool is kept across warm invocations.
+        checkpoint: bool
+            Stop processing at the first failed record and only report its sequence number, by default False.
+            Only supported for Kinesis Data Streams and DynamoDB Streams, as Lambda resumes from the lowest
+            reported sequence number anyway.
+        use_process_pool: bool
+            Process records in a pool of worker processes instead of threads, by default False. Use it for CPU bound
+            record handlers. `max_concurrency` sets the number of worker processes, by default the number of CPUs.
+            Raw records are sent to worker processes, so record handler and model must be picklable,
+            e.g. defined at module level. Worker processes are kept across warm invocations.
+        chunk_size: Optional[int]
+            Call the record handler with chunks of up to `chunk_size` records, e.g. for bulk writes, instead of
+            one record at a time. The record handler receives a `records` list, and returns either None when all
+            records succeeded, or a list with one outcome per record in the same order. Outcomes that are
+            exception instances mark their record as failed. Chunks are processed concurrently when
+            `max_concurrency` is set.
+        timeout_margin_ms: Optional[int]
+            Stop starting new records once the invocation remaining time drops below this margin, in milliseconds.
+            Records not started are reported as failures, so only those are retried instead of the entire batch
+            when the function times out. Requires the Lambda context, e.g. using the `batch_processor` decorator.
+        metrics: Optional[MetricManager]
+            Metrics instance to add record handler latency, record conversion time, and success and failure counts
+            to once per batch, e.g. `aws_lambda_powertools.metrics.Metrics`
+        streaming: bool
+            Process records one at a time without keeping converted records nor results in memory, by default
+            False. Only identifiers of failed records are kept for the partial response, along with exception types
+            and messages without tracebacks. `success_messages` and `fail_messages` are not populated, and
+            `process()` returns an empty list. Use `result_callback` to access each result instead.
+        result_callback: Optional[Callable]
+            Called with each success or failure entry, in record order, as soon as it is available
+        deduplication_key_jmespath: Optional[str]
+            JMESPath expression to extract a deduplication key from each raw record, e.g.
+            `powertools_json(body).order_id`. The record handler is called once per distinct key, and its outcome
+            is reported for every record sharing that key. Records without a key are always processed.
+        jmespath_options: Optional[Dict]
+            Alternative JMESPath options used with `deduplication_key_jmespath`
+        s3_pointer_resolver: Optional[S3PointerResolver]
+            Fetch payloads of SQS Extended Client messages from S3 concurrently before processing records, so
+            `SQSRecord.body` is the actual payload instead of a S3 pointer. Records whose payload can't be
+            fetched are reported as failures without calling the record handler. Only supported for SQS.
+        deaggregate: bool
+            De-aggregate Kinesis Producer Library (KPL) aggregated records, by default False. The record handler is
+            called with each `KinesisUserRecord`, and the Kinesis record is reported as failed when any of its
+            user records fails, skipping its remaining user records. Only supported for Kinesis Data Streams.
 
         Exceptions
         ----------
         BatchProcessingError
             Raised when the entire batch has failed processing
         """
-        self.event_type = event_type
-        self.model = model
-        self.batch_response = copy.deepcopy(self.DEFAULT_RESPONSE)
-        self._COLLECTOR_MAPPING = {
-            EventType.SQS: self._collect_sqs_failures,
-            EventType.KinesisDataStreams: self._collect_kinesis_failures,
-            EventType.DynamoDBStreams: self._collect_dynamodb_failures,
-        }
-        self._DATA_CLASS_MAPPING = {
-            EventType.SQS: SQSRecord,
-            EventType.KinesisDataStreams: KinesisStreamRecord,
-            EventType.DynamoDBStreams: DynamoDBRecord,
-        }
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer")
 
-        super().__init__()
+        if streaming and (use_process_pool or chunk_size is not None or max_concurrency not in (None, 1)):
+            raise ValueError("streaming processes records sequentially and can't be used with other processing modes")
 
-    def response(self):
-        """Batch items that failed processing, if any"""
-        return self.batch_response
+        if checkpoint and event_type == EventType.SQS:
+            raise ValueError("checkpoint is only supported for Kinesis Data Streams and DynamoDB Streams")
+
+        if checkpoint and (use_process_pool or max_concurrency not in (None, 1)):
+            raise ValueError("checkpoint processes records sequentially and can't be used with max_concurrency")
+
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        if chunk_size is not None and (checkpoint or use_process_pool):
+            raise ValueError("chunk_size can't be used with checkpoint or use_process_pool")
+
+        if s3_pointer_resolver is not None and event_type != EventType.SQS:
+            raise ValueError("s3_pointer_resolver is only supported for SQS")
+
+        if deaggregate and (event_type != EventType.KinesisDataStreams or model is not None):
+            raise ValueError("deaggregate is only supported for Kinesis Data Streams, without model")
+
+        if deaggregate and (use_process_pool or chunk_size is not None):
+            raise ValueError("deaggregate can't be used with use_process_pool or chunk_size")
+
+        if deduplication_key_jmespath and (streaming or checkpoint or use_process_pool or chunk_size is not None):
+            raise ValueError(
+                "deduplication_key_jmespath can't be used with streaming, checkpoint, use_process_pool or chunk_size"
+            )
+
+        self.max_concurrency = max_concurrency
+        self.checkpoint = checkpoint
+        self.use_process_pool = use_process_pool
+        self.chunk_size = chunk_size
+        self.timeout_margin_ms = timeout_margin_ms
+        self.streaming = streaming
+        self.result_callback = result_callback
+        self._deadline: Optional[float] = None
+        self._success_count = 0
+        self._failed_item_identifiers: List[str] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPool] = None
+        self.s3_pointer_resolver = s3_pointer_resolver
+        self.deaggregate = deaggregate
+        self.deduplication_key_jmespath = deduplication_key_jmespath
+        self._deduplication_key_compiled_jmespath = None
+        if deduplication_key_jmespath:
+            self._deduplication_key_compiled_jmespath = jmespath.compile(deduplication_key_jmespath)
+        self.jmespath_options: Dict = jmespath_options or {}
+        if not self.jmespath_options:
+            self.jmespath_options = {"custom_functions": PowertoolsFunctions()}
+
+        super().__init__(event_type=event_type, model=model, metrics=metrics)
+
+    def process(self) -> List[Union[SuccessResponse, FailureResponse]]:
+        """
+        Call instance's handler for each record, concurrently when max_concurrency is set.
+        """
+        self._deadline = self._get_deadline()
+
+        if self.s3_pointer_resolver is not None:
+            return self._process_with_s3_pointers(self.s3_pointer_resolver)
+
+        return self._process_records()
+
+    def _process_records(self) -> List[Union[SuccessResponse, FailureResponse]]:
+        if self.streaming:
+            return self._process_streaming()
+
+        if self.checkpoint:
+            return self._process_until_failure()
+
+        if self.use_process_pool:
+            return self._process_in_process_pool()
+
+        if self.chunk_size is not None:
+            return self._process_in_chunks(chunk_size=self.chunk_size)
+
+        if self._deduplication_key_compiled_jmespath is not None:
+            return self._process_deduplicated()
+
+        if self.max_concurrency is None or self.max_concurrency == 1:
+            if self.model is not None:
+                return self._process_sequentially()
+            return super().process()
+
+        return self._process_concurrently()
 
     def _prepare(self):
         """
         Remove results from previous execution.
         """
-        self.success_messages.clear()
-        self.fail_messages.clear()
-        self.exceptions.clear()
-        self.batch_response = copy.deepcopy(self.DEFAULT_RESPONSE)
+        super()._prepare()
+        self._success_count = 0
+        self._failed_item_identifiers.clear()
+
+    def success_handler(self, record, result: Any) -> SuccessResponse:
+        if self.streaming:
+            entry: SuccessResponse = ("success", result, record)
+            self._success_count += 1
+        else:
+            entry = super().success_handler(record=record, result=result)
+
+        if self.result_callback is not None:
+            self.result_callback(entry)
+        return entry
+
+    def failure_handler(self, record, exception: ExceptionInfo) -> FailureResponse:
+        if self.streaming:
+            exception = self._detach_exception(exception)
+            exception_string = f"{exception[0]}:{exception[1]}"
+            entry: FailureResponse = ("fail", exception_string, record)
+            logger.debug(f"Record processing exception: {exception_string}")
+            self.exceptions.append(exception)
+            self._failed_item_identifiers.append(self._get_item_identifier(record))
+        else:
+            entry = super().failure_handler(record=record, exception=exception)
+
+        if self.result_callback is not None:
+            self.result_callback(entry)
+        return entry
+
+    @staticmethod
+    def _detach_exception(exception: ExceptionInfo) -> ExceptionInfo:
+        """
+        Keep only the exception type and message of a failed record.
+
+        Tracebacks, chained exceptions' included, reference the frames that called the record handler,
+        and their locals reference the records, so they can't be kept without keeping records in memory.
+        """
+        exc_type, exc_value, _ = exception
+        if exc_value is not None:
+            exc_value.__traceback__ = None
+            exc_value.__cause__ = None
+            exc_value.__context__ = None
+        return exc_type, exc_value, None
+
+    def _get_success_count(self) -> int:
+        return self._success_count if self.streaming else super()._get_success_count()
+
+    def _get_failure_count(self) -> int:
+        return len(self._failed_item_identifiers) if self.streaming else super()._get_failure_count()
+
+    def _get_messages_to_report(self) -> List[Dict[str, str]]:
+        if self.streaming:
+            return [{"itemIdentifier": identifier} for identifier in self._failed_item_identifiers]
+        return super()._get_messages_to_report()
+
+    def _process_streaming(self) -> List[Union[SuccessResponse, FailureResponse]]:
+        """
+        Call instance's handler for each record, without keeping records nor results in memory.
+
+        Records are converted lazily, one at a time, so they can be released as soon as they're processed.
+        """
+        for record in self.records:
+            status, *_ = self._process_record(record)
+            if self.checkpoint and status == "fail":
+                logger.debug("Record failed processing, stopping at checkpoint")
+                break
+
+        return []
+
+    def _process_sequentially(self) -> List[Union[SuccessResponse, FailureResponse]]:
+        """
+        Convert all records at once, then call instance's handler for each record.
+        """
+        batch = self._to_batch_types(self.records)
+        return [
+            self._process_converted_record(record=record, data=data, exception=exception)
+            for record, (data, exception) in zip(self.records, batch)
+        ]
+
+    def _process_with_s3_pointers(self, resolver: S3PointerResolver) -> List[Union[SuccessResponse, FailureResponse]]:
+        """
+        Resolve SQS Extended Client payloads, then process records whose payload was fetched.
+        """
+        records = self.records
+        resolved = resolver.resolve(records)
+
+        unresolved: Dict[int, FailureResponse] = {}
+        for index, (record, exception) in enumerate(resolved):
+            if exception is not None:
+                data, _ = self._try_to_batch_type(record)
+                unresolved[index] = self.failure_handler(record=data, exception=exception)
+
+        self.records = [record for record, exception in resolved if exception is None]
+        try:
+            processed_messages = iter(self._process_records())
+        finally:
+            self.records = records
+
+        if self.streaming:
+            return []
+
+        # keep record order, as if records had been processed in a single pass
+        return [unresolved[index] if index in unresolved else next(processed_messages) for index in range(len(records))]
+
+    def _process_deduplicated(self) -> List[Union[SuccessResponse, FailureResponse]]:
+        """
+        Call instance's handler once for each distinct deduplication key, concurrently when max_concurrency is set.
+
+        The handler outcome of the first record with a given key is reported for all its duplicates.
+        """
+        batch = self._to_batch_types(self.records)
+
+        # index of the record whose handler outcome is reported, for each record
+        outcome_indexes: List[int] = []
+        first_index_by_key: Dict[str, int] = {}
+        for index, (record, (_, exception)) in enumerate(zip(self.records, batch)):
+            # records failing conversion are reported on their own, and never shadow their duplicates
+            key = self._get_deduplication_key(record) if exception is None else None
+            outcome_indexes.append(index if key is None else first_index_by_key.setdefault(key, index))
+
+        unique_indexes = [
+            index
+            for index, outcome_index in enumerate(outcome_indexes)
+            if index == outcome_index and batch[index][1] is None
+        ]
+        logger.debug(f"Processing {len(unique_indexes)} distinct records out of {len(self.records)}")
+
+        if self.max_concurrency is None or self.max_concurrency == 1:
+            outcomes = {index: self._call_handler_safely(batch[index][0]) for index in unique_indexes}
+        else:
+            executor = self._get_executor()
+            futures = {index: executor.submit(self._call_handler_safely, batch[index][0]) for index in unique_indexes}
+            outcomes = {index: future.result() for index, future in futures.items()}
+
+        processed_messages: List[Union[SuccessResponse, FailureResponse]] = []
+        for record, (data, exception), outcome_index in zip(self.records, batch, outcome_indexes):
+            result = None
+            if exception is None:
+                result, exception = outcomes[outcome_index]
+
+            if exception is None:
+                processed_messages.append(self.success_handler(record=record, result=result))
+            else:
+                processed_messages.append(self.failure_handler(record=data, exception=exception))
+
+        return processed_messages
+
+    def _get_deduplication_key(self, record: dict) -> Optional[str]:
+        try:
+            key = self._deduplication_key_compiled_jmespath.search(  # type: ignore[union-attr]
+                record, options=jmespath.Options(**self.jmespath_options)
+            )
+        except Exception as exc:
+            # e.g. powertools_json() on a body that isn't JSON, let the record handler deal with such records
+            logger.debug(f"Unable to extract deduplication key, processing record as distinct: {exc}")
+            return None
+
+        if key is None:
+            return None
+
+        # keys can be lists or objects, which aren't hashable
+        return json.dumps(key, sort_keys=True, default=str)
+
+    def _call_handler_safely(self, data: Any) -> Tuple[Any, Optional[ExceptionInfo]]:
+        try:
+            return self._call_handler(data), None
+        except Exception:
+            return None, sys.exc_info()
+
+    def _process_until_failure(self) -> List[Union[SuccessResponse, FailureResponse]]:
+        """
+        Call instance's handler for each record, stopping at the first failure.
+
+        Records after the failed one are neither converted nor processed, since
+        Lambda retries the stream from the failed record sequence number.
+        """
+        processed_messages: List[Union[SuccessResponse, FailureResponse]] = []
+        for record in self.records:
+            entry = self._process_record(record)
+            processed_messages.append(entry)
+
+            if entry[0] == "fail":
+                logger.debug(
+                    f"Record failed processing, stopping at checkpoint. "
+                    f"{len(self.records) - len(processed_messages)} records left unprocessed"
+                )
+                break
+
+        return processed_messages
+
+    def _process_concurrently(self) -> List[Union[SuccessResponse, FailureResponse]]:
+        """
+        Run handler for all records in a thread pool.
+
+        Handler results are collected in record order from the calling thread, so that
+        success_handler and failure_handler are never called concurrently.
+        """
+        executor = self._get_executor()
+        batch = self._to_batch_types(self.records)
+        # records that failed conversion are never submitted, so futures are consumed in record order as we go
+        futures = iter([executor.submit(self._call_handler, data) for data, exception in batch if exception is None])
+
+        return [
+            self._collect_future_result(record=record, data=data, future=next(futures))
+            if exception is None
+            else self.failure_handler(record=data, exception=exception)
+            for record, (data, exception) in zip(self.records, batch)
+        ]
+
+    def _process_in_chunks(self, chunk_size: int) -> List[Union[SuccessResponse, FailureResponse]]:
+        """
+        Call handler with chunks of records, concurrently when max_concurrency is set.
+
+        Per-record outcomes returned by the handler are collected in record order from the calling thread.
+        """
+        batch = self._to_batch_types(self.records)
+        # records that failed conversion are reported right away, and never passed to the handler
+        converted = [data for data, exception in batch if exception is None]
+        chunks = [converted[index : index + chunk_size] for index in range(0, len(converted), chunk_size)]
+
+        if self.max_concurrency is None or self.max_concurrency == 1:
+            chunk_outcomes = [self._process_chunk(chunk) for chunk in chunks]
+        else:
+            executor = self._get_executor()
+            futures = [executor.submit(self._process_chunk, chunk) for chunk in chunks]
+            chunk_outcomes = [future.result() for future in futures]
+
+        outcomes = (outcome for chunk_outcome in chunk_outcomes for outcome in chunk_outcome)
+        processed_messages: List[Union[SuccessResponse, FailureResponse]] = []
+        for record, (data, exception) in zip(self.records, batch):
+            result = None
+            if exception is None:
+                result, exception = next(outcomes)
+
+            if exception is None:
+                processed_messages.append(self.success_handler(record=record, result=result))
+            else:
+                processed_messages.append(self.failure_handler(record=data, exception=exception))
+
+        return processed_messages
+
+    def _process_chunk(self, chunk: List[BatchEventTypes]) -> List[Tuple[Any, Optional[ExceptionInfo]]]:
+        """
+        Call handler with a chunk of records, and map its return value to a result or exception for each record.
+        """
+        start = self._handler_timer()
+        try:
+            self._check_deadline()
+            results = self.handler(records=chunk)
+        except Exception:
+            # nothing was reported per record, so the entire chunk failed
+            return [(None, sys.exc_info())] * len(chunk)
+        finally:
+            self._record_handler_latency(start)
+
+        if results is None:
+            return [(None, None)] * len(chunk)
+
+        # strings or dicts are iterable too, but would silently map characters or keys to records
+        if not isinstance(results, (list, tuple)):
+            exception = ValueError(
+                f"Record handler must return a list or tuple of outcomes, or None, not {type(results).__name__}"
+            )
+            return [(None, (ValueError, exception, None))] * len(chunk)
+
+        if len(results) != len(chunk):
+            exception = ValueError(f"Record handler returned {len(results)} outcomes for {len(chunk)} records")
+            return [(None, (ValueError, exception, None))] * len(chunk)
+
+        return [
+            (None, (type(result), result, result.__traceback__)) if isinstance(result, Exception) else (result, None)
+            for result in results
+        ]
+
+    def _collect_future_result(
+        self, record: dict, data: BatchEventTypes, future: Future
+    ) -> Union[SuccessResponse, FailureResponse]:
+        try:
+            result = future.result()
+            return self.success_handler(record=record, result=result)
+        except Exception:
+            return self.failure_handler(record=data, exception=sys.exc_info())
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Lazily created and reused across warm invocations to avoid paying thread start up on every batch
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="powertools-batch")
+        return self._executor
+
+    def _process_in_process_pool(self) -> List[Union[SuccessResponse, FailureResponse]]:
+        """
+        Run handler for all records in a pool of worker processes.
+
+        Raw records are sent in chunks to worker processes, where they're converted before calling the handler.
+        Handler results, or exceptions, are sent back and collected in record order.
+        """
+        pool = self._get_process_pool()
+        # smaller chunks than one per worker balance the load when record processing time varies
+        chunk_size = max(1, math.ceil(len(self.records) / (pool.max_workers * 4)))
+        chunks = [self.records[index : index + chunk_size] for index in range(0, len(self.records), chunk_size)]
+
+        process_chunk = functools.partial(process_records, self.handler, self.event_type, self.model, self._deadline)
+        chunk_outcomes = pool.map_chunks(process_chunk, chunks)
+
+        processed_messages: List[Union[SuccessResponse, FailureResponse]] = []
+        for chunk, outcomes in zip(chunks, chunk_outcomes):
+            if isinstance(outcomes, WorkerProcessError):
+                outcomes = [(False, (outcomes, ""), None)] * len(chunk)
+
+            for record, (succeeded, value, timings) in zip(chunk, outcomes):
+                if self._stats is not None and timings is not None:
+                    conversion_time_ns, handler_latency_ns = timings
+                    self._stats.add_conversion_time(conversion_time_ns)
+                    self._stats.add_handler_latency(handler_latency_ns)
+
+                if succeeded:
+                    processed_messages.append(self.success_handler(record=record, result=value))
+                    continue
+
+                # only failed records need to be converted, so we can report them in the partial response
+                data, _ = self._try_to_batch_type(record)
+                processed_messages.append(self.failure_handler(record=data, exception=to_exception_info(*value)))
+
+        return processed_messages
+
+    def _get_process_pool(self) -> ProcessPool:
+        # Lazily created and reused across warm invocations to avoid paying process start up on every batch
+        if self._process_pool is None:
+            self._process_pool = ProcessPool(max_workers=self.max_concurrency or os.cpu_count() or 1)
+        return self._process_pool
+
+    def _get_deadline(self) -> Optional[float]:
+        """
+        Monotonic time after which no new record should be started, if timeout_margin_ms is set.
+        """
+        if self.timeout_margin_ms is None:
+            return None
+
+        if self.lambda_context is None:
+            logger.debug("No Lambda context available, ignoring timeout_margin_ms")
+            return None
+
+        remaining_ms = self.lambda_context.get_remaining_time_in_millis()
+        return time.monotonic() + (remaining_ms - self.timeout_margin_ms) / 1000
+
+    def _check_deadline(self):
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            raise BatchDeadlineExceededError(
+                f"Record not processed as less than {self.timeout_margin_ms}ms of invocation time remained"
+            )
+
+    def _call_handler(self, data: BatchEventTypes) -> Any:
+        self._check_deadline()
+        start = self._handler_timer()
+        try:
+            if self.deaggregate:
+                # failures are reported for the Kinesis record, so its remaining user records aren't processed
+                user_records = data.kinesis.user_records()  # type: ignore[union-attr]
+                return [self.handler(record=user_record) for user_record in user_records]
+            return self.handler(record=data)
+        finally:
+            self._record_handler_latency(start)
 
     def _process_record(self, record: dict) -> Union[SuccessResponse, FailureResponse]:
         """
@@ -363,79 +1092,197 @@ class BatchProcessor(BasePartialProcessor):
         record: dict
             A batch record to be processed.
         """
-        data = self._to_batch_type(record=record, event_type=self.event_type, model=self.model)
+        data, exception = self._try_to_batch_type(record)
+        return self._process_converted_record(record=record, data=data, exception=exception)
+
+    def _process_converted_record(
+        self, record: dict, data: Any, exception: Optional[ExceptionInfo]
+    ) -> Union[SuccessResponse, FailureResponse]:
+        if exception is not None:
+            return self.failure_handler(record=data, exception=exception)
+
         try:
-            result = self.handler(record=data)
+            result = self._call_handler(data)
             return self.success_handler(record=record, result=result)
         except Exception:
             return self.failure_handler(record=data, exception=sys.exc_info())
 
-    def _clean(self):
-        """
-        Report messages to be deleted in case of partial failure.
-        """
 
-        if not self._has_messages_to_report():
-            return
+@lambda_handler_decorator
+def async_batch_processor(
+    handler: Callable,
+    event: Dict,
+    context: LambdaContext,
+    record_handler: Callable[..., Awaitable[Any]],
+    processor: "AsyncBatchProcessor",
+):
+    """
+    Middleware to handle batch event processing with async record handlers
 
-        if self._entire_batch_failed():
-            raise BatchProcessingError(
-                msg=f"All records failed processing. {len(self.exceptions)} individual errors logged "
-                f"separately below.",
-                child_exceptions=self.exceptions,
-            )
+    Parameters
+    ----------
+    handler: Callable
+        Lambda's handler
+    event: Dict
+        Lambda's Event
+    context: LambdaContext
+        Lambda's Context
+    record_handler: Callable[..., Awaitable[Any]]
+        Coroutine function to process each record from the batch
+    processor: AsyncBatchProcessor
+        Batch Processor to handle partial failure cases
 
-        messages = self._get_messages_to_report()
-        self.batch_response = {"batchItemFailures": messages}
+    Examples
+    --------
+    **Processes Lambda's event with AsyncBatchProcessor**
 
-    def _has_messages_to_report(self) -> bool:
-        if self.fail_messages:
-            return True
+        >>> from aws_lambda_powertools.utilities.batch import AsyncBatchProcessor, EventType, async_batch_processor
+        >>>
+        >>> processor = AsyncBatchProcessor(event_type=EventType.SQS)
+        >>>
+        >>> async def record_handler(record):
+        >>>     return record.body
+        >>>
+        >>> @async_batch_processor(record_handler=record_handler, processor=processor)
+        >>> def handler(event, context):
+        >>>     return processor.response()
+    """
+    records = event["Records"]
 
-        logger.debug(f"All {len(self.success_messages)} records successfully processed")
-        return False
+    with processor(records, record_handler, lambda_context=context):
+        processor.process()
 
-    def _entire_batch_failed(self) -> bool:
-        return len(self.exceptions) == len(self.records)
+    return handler(event, context)
 
-    def _get_messages_to_report(self) -> List[Dict[str, str]]:
+
+class AsyncBatchProcessor(BasePartialBatchProcessor):
+    """Process native partial responses from SQS, Kinesis Data Streams, and DynamoDB with async record handlers.
+
+    Records are awaited concurrently on a single event loop, which is kept across warm invocations.
+
+    Example
+    -------
+
+    ## Process batch triggered by SQS
+
+    ```python
+    import json
+
+    import aiohttp
+
+    from aws_lambda_powertools.utilities.batch import AsyncBatchProcessor, EventType, async_batch_processor
+    from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
+    from aws_lambda_powertools.utilities.typing import LambdaContext
+
+
+    processor = AsyncBatchProcessor(event_type=EventType.SQS, max_concurrency=50)
+
+
+    async def record_handler(record: SQSRecord):
+        payload: dict = json.loads(record.body)
+        async with aiohttp.ClientSession() as session:
+            async with session.post("https://example.com/orders", json=payload) as response:
+                response.raise_for_status()
+
+    @async_batch_processor(record_handler=record_handler, processor=processor)
+    def lambda_handler(event, context: LambdaContext):
+        return processor.response()
+    ```
+
+    Raises
+    ------
+    BatchProcessingError
+        When all batch records fail processing
+    """
+
+    def __init__(
+        self,
+        event_type: EventType,
+        model: Optional["BatchTypeModels"] = None,
+        max_concurrency: Optional[int] = None,
+        metrics: Optional["MetricManager"] = None,
+    ):
+        """Process batch and partially report failed items
+
+        Parameters
+        ----------
+        event_type: EventType
+            Whether this is a SQS, DynamoDB Streams, or Kinesis Data Stream event
+        model: Optional["BatchTypeModels"]
+            Parser's data model using either SqsRecordModel, DynamoDBStreamRecordModel, KinesisDataStreamRecord
+        max_concurrency: Optional[int]
+            Maximum number of record handlers awaited at the same time, by default all records are awaited at once
+        metrics: Optional[MetricManager]
+            Metrics instance to add record handler latency, record conversion time, and success and failure counts
+            to once per batch, e.g. `aws_lambda_powertools.metrics.Metrics`
+
+        Exceptions
+        ----------
+        BatchProcessingError
+            Raised when the entire batch has failed processing
         """
-        Format messages to use in batch deletion
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer")
+
+        self.max_concurrency = max_concurrency
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        super().__init__(event_type=event_type, model=model, metrics=metrics)
+
+    def process(self) -> List[Union[SuccessResponse, FailureResponse]]:
         """
-        return self._COLLECTOR_MAPPING[self.event_type]()
+        Await instance's handler for each record on the processor's event loop.
 
-    # Event Source Data Classes follow python idioms for fields
-    # while Parser/Pydantic follows the event field names to the latter
-    def _collect_sqs_failures(self):
-        failures = []
-        for msg in self.fail_messages:
-            msg_id = msg.messageId if self.model else msg.message_id
-            failures.append({"itemIdentifier": msg_id})
-        return failures
+        Use `async_process` instead when you're already within a running event loop.
+        """
+        return self._get_event_loop().run_until_complete(self.async_process())
 
-    def _collect_kinesis_failures(self):
-        failures = []
-        for msg in self.fail_messages:
-            msg_id = msg.kinesis.sequenceNumber if self.model else msg.kinesis.sequence_number
-            failures.append({"itemIdentifier": msg_id})
-        return failures
+    async def async_process(self) -> List[Union[SuccessResponse, FailureResponse]]:
+        """
+        Await instance's handler for each record, with at most max_concurrency records in flight.
+        """
+        # Semaphore must be created within the running loop (Python < 3.10 binds it at creation)
+        semaphore = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        return list(await asyncio.gather(*(self._async_process_record(record, semaphore) for record in self.records)))
 
-    def _collect_dynamodb_failures(self):
-        failures = []
-        for msg in self.fail_messages:
-            msg_id = msg.dynamodb.SequenceNumber if self.model else msg.dynamodb.sequence_number
-            failures.append({"itemIdentifier": msg_id})
-        return failures
+    def _process_record(self, record: dict) -> Union[SuccessResponse, FailureResponse]:
+        """
+        Process a record with instance's handler
 
-    @overload
-    def _to_batch_type(self, record: dict, event_type: EventType, model: "BatchTypeModels") -> "BatchTypeModels":
-        ...  # pragma: no cover
+        Parameters
+        ----------
+        record: dict
+            A batch record to be processed.
+        """
+        return self._get_event_loop().run_until_complete(self._async_process_record(record))
 
-    @overload
-    def _to_batch_type(self, record: dict, event_type: EventType) -> EventSourceDataClassTypes:
-        ...  # pragma: no cover
+    async def _async_process_record(
+        self, record: dict, semaphore: Optional[asyncio.Semaphore] = None
+    ) -> Union[SuccessResponse, FailureResponse]:
+        data, exception = self._try_to_batch_type(record)
+        if exception is not None:
+            return self.failure_handler(record=data, exception=exception)
 
-    def _to_batch_type(self, record: dict, event_type: EventType, model: Optional["BatchTypeModels"] = None):
-        if model is not None:
-            return model.parse_obj(record)
-        return self._DATA_CLASS_MAPPING[event_type](record)
+        try:
+            if semaphore is None:
+                result = await self._await_handler(data)
+            else:
+                async with semaphore:
+                    result = await self._await_handler(data)
+            return self.success_handler(record=record, result=result)
+        except Exception:
+            return self.failure_handler(record=data, exception=sys.exc_info())
+
+    async def _await_handler(self, data: BatchEventTypes) -> Any:
+        start = self._handler_timer()
+        try:
+            return await self.handler(record=data)
+        finally:
+            self._record_handler_latency(start)
+
+    def _get_event_loop(self) -> asyncio.AbstractEventLoop:
+        # Reusing the same loop across warm invocations allows loop-bound resources, e.g. client sessions, to be reused
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+        return self._loop
@@ -46,3 +46,15 @@ class BatchProcessingError(BaseBatchProcessingError):
     def __str__(self):
         parent_exception_str = super(BatchProcessingError, self).__str__()
         return self.format_exceptions(parent_exception_str)
+
+
+class SQSFifoCircuitBreakerError(Exception):
+    """When a record was not processed because a previous record from its message group failed processing"""
+
+
+class BatchDeadlineExceededError(Exception):
+    """When a record was not processed because the invocation was about to time out"""
+
+
+class FirehoseResponseSizeExceededError(Exception):
+    """When a transformed record was not returned because the response would exceed the Lambda payload limit"""
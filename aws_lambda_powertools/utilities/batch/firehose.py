@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch processing for Kinesis Data Firehose data transformation
+"""
+import base64
+import json
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from aws_lambda_powertools.utilities.batch.base import BasePartialProcessor, FailureResponse, SuccessResponse
+from aws_lambda_powertools.utilities.batch.exceptions import ExceptionInfo, FirehoseResponseSizeExceededError
+from aws_lambda_powertools.utilities.data_classes.kinesis_firehose_event import KinesisFirehoseRecord
+
+logger = logging.getLogger(__name__)
+
+# Lambda synchronous invocation response payload limit
+FIREHOSE_MAX_RESPONSE_SIZE = 6 * 1024 * 1024
+
+# handler result, base64 encoded transformed data or None when dropped, exception info when record failed
+TransformationOutcome = Tuple[Any, Optional[str], Optional[ExceptionInfo]]
+
+
+class FirehoseTransformationProcessor(BasePartialProcessor):
+    """Process Kinesis Data Firehose data transformation events, and build their response.
+
+    The record handler receives a `KinesisFirehoseRecord`, whose data is only decoded when accessed, and returns
+    the transformed data as bytes, text, or a JSON serializable object. Returning None drops the record,
+    and raising an exception marks it as `ProcessingFailed`, so Firehose delivers it to the error output prefix.
+
+    The encoded size of the response is tracked as records are transformed. Records that would make the response
+    exceed `max_response_size` are marked as `ProcessingFailed`, instead of failing the entire invocation.
+
+    Example
+    -------
+
+    ## Transform records from a Firehose delivery stream
+
+    ```python
+    from aws_lambda_powertools.utilities.batch import FirehoseTransformationProcessor, batch_processor
+    from aws_lambda_powertools.utilities.data_classes.kinesis_firehose_event import KinesisFirehoseRecord
+    from aws_lambda_powertools.utilities.typing import LambdaContext
+
+
+    processor = FirehoseTransformationProcessor()
+
+
+    def record_handler(record: KinesisFirehoseRecord):
+        payload: dict = record.data_as_json()
+        return {"id": payload["id"], "processed": True}
+
+
+    @batch_processor(record_handler=record_handler, processor=processor)
+    def lambda_handler(event, context: LambdaContext):
+        return processor.response()
+    ```
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, max_response_size: int = FIREHOSE_MAX_RESPONSE_SIZE):
+        """Process Firehose records and build the transformation response
+
+        Parameters
+        ----------
+        max_concurrency: Optional[int]
+            Maximum number of records transformed concurrently in a thread pool, by default records are transformed
+            sequentially. The thread pool is kept across warm invocations.
+        max_response_size: int
+            Maximum size of the serialized response in bytes, by default the 6 MB Lambda response payload limit
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer")
+
+        self.max_concurrency = max_concurrency
+        self.max_response_size = max_response_size
+        self._response_records: List[Dict[str, str]] = []
+        self._response_size = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        super().__init__()
+
+    def response(self) -> Dict[str, List[Dict[str, str]]]:
+        """Firehose data transformation response, with one entry per record in record order"""
+        return {"records": self._response_records}
+
+    def process(self) -> List[Union[SuccessResponse, FailureResponse]]:
+        """
+        Call instance's handler for each record, concurrently when max_concurrency is set.
+        """
+        if self.max_concurrency is None or self.max_concurrency == 1:
+            return super().process()
+
+        executor = self._get_executor()
+        futures = [executor.submit(self._transform, record) for record in self.records]
+        # response size is tracked from the calling thread, so records fit in the response in record order
+        return [self._collect_outcome(record, future.result()) for record, future in zip(self.records, futures)]
+
+    def _prepare(self):
+        """
+        Remove results from previous execution.
+        """
+        self.success_messages.clear()
+        self.fail_messages.clear()
+        self.exceptions.clear()
+        self._response_records = []
+        # every record is part of the response, so room for a ProcessingFailed entry per record is reserved upfront
+        separators = len(", ") * max(len(self.records) - 1, 0)
+        failed_entries = sum(_entry_size(record["recordId"], "ProcessingFailed", "") for record in self.records)
+        self._response_size = len(json.dumps(self.response())) + separators + failed_entries
+
+    def _clean(self):
+        """
+        Report records that failed transformation.
+        """
+        if self.fail_messages:
+            logger.debug(f"{len(self.fail_messages)} records failed transformation")
+
+    def _process_record(self, record: dict) -> Union[SuccessResponse, FailureResponse]:
+        """
+        Transform a record with instance's handler
+
+        Parameters
+        ----------
+        record: dict
+            A Firehose record to be transformed.
+        """
+        return self._collect_outcome(record, self._transform(record))
+
+    def _transform(self, record: dict) -> TransformationOutcome:
+        try:
+            result = self.handler(record=KinesisFirehoseRecord(record))
+            return result, None if result is None else _encode(result), None
+        except Exception:
+            return None, None, sys.exc_info()
+
+    def _collect_outcome(self, record: dict, outcome: TransformationOutcome) -> Union[SuccessResponse, FailureResponse]:
+        result, data, exception = outcome
+        if exception is None:
+            status = "Dropped" if data is None else "Ok"
+            if self._add_response_record(record_id=record["recordId"], result=status, data=data or ""):
+                return self.success_handler(record=record, result=result)
+
+            message = f"Transformed record would exceed the {self.max_response_size} bytes response size limit"
+            logger.debug(message)
+            exception = (FirehoseResponseSizeExceededError, FirehoseResponseSizeExceededError(message), None)
+
+        self._response_records.append({"recordId": record["recordId"], "result": "ProcessingFailed", "data": ""})
+        return self.failure_handler(record=KinesisFirehoseRecord(record), exception=exception)
+
+    def _add_response_record(self, record_id: str, result: str, data: str) -> bool:
+        size = _entry_size(record_id, result, data) - _entry_size(record_id, "ProcessingFailed", "")
+        if self._response_size + size > self.max_response_size:
+            return False
+
+        self._response_records.append({"recordId": record_id, "result": result, "data": data})
+        self._response_size += size
+        return True
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="powertools-firehose"
+            )
+        return self._executor
+
+
+def _encode(result: Any) -> str:
+    if isinstance(result, str):
+        result = result.encode("utf-8")
+    elif not isinstance(result, (bytes, bytearray, memoryview)):
+        result = json.dumps(result).encode("utf-8")
+    return base64.b64encode(result).decode("ascii")
+
+
+def _entry_size(record_id: str, result: str, data: str) -> int:
+    # data is base64 encoded, so it can be accounted for without serializing it
+    return len(json.dumps({"recordId": record_id, "result": result, "data": ""})) + len(data)
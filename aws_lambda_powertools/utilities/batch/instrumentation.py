@@ -0,0 +1,88 @@
+"""
+Batch processing instrumentation
+"""
+import logging
+import math
+import time
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    from aws_lambda_powertools.metrics.base import MetricManager
+
+try:
+    from time import perf_counter_ns
+except ImportError:  # pragma: no cover - Python 3.6
+
+    def perf_counter_ns() -> int:
+        return int(time.perf_counter() * 1_000_000_000)
+
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 99)
+
+
+class BatchStats:
+    """Collects record processing timings for a single batch
+
+    Timings are kept in memory, and only aggregated once the batch is processed.
+    Appending to a list is thread-safe, so timings can be added from worker threads.
+    """
+
+    def __init__(self):
+        self.handler_latencies_ns: List[int] = []
+        self.conversion_times_ns: List[int] = []
+
+    def add_handler_latency(self, latency_ns: int):
+        self.handler_latencies_ns.append(latency_ns)
+
+    def add_conversion_time(self, conversion_time_ns: int):
+        self.conversion_times_ns.append(conversion_time_ns)
+
+    def clear(self):
+        self.handler_latencies_ns.clear()
+        self.conversion_times_ns.clear()
+
+    def publish(self, metrics: "MetricManager", successes: int, failures: int):
+        """Add batch aggregates to metrics, which are flushed with the rest of the function metrics
+
+        Parameters
+        ----------
+        metrics: MetricManager
+            Metrics instance, e.g. `aws_lambda_powertools.metrics.Metrics`
+        successes: int
+            Number of records successfully processed
+        failures: int
+            Number of records that failed processing
+        """
+        logger.debug("Adding batch processing metrics")
+        metrics.add_metric(name="BatchRecordSuccesses", unit="Count", value=successes)
+        metrics.add_metric(name="BatchRecordFailures", unit="Count", value=failures)
+        metrics.add_metric(
+            name="BatchRecordConversionTime", unit="Milliseconds", value=_to_ms(sum(self.conversion_times_ns))
+        )
+
+        latencies = sorted(self.handler_latencies_ns)
+        metrics.add_metric(name="BatchRecordHandlerInvocations", unit="Count", value=len(latencies))
+        if not latencies:
+            return
+
+        metrics.add_metric(name="BatchRecordHandlerLatencyMin", unit="Milliseconds", value=_to_ms(latencies[0]))
+        metrics.add_metric(name="BatchRecordHandlerLatencyMax", unit="Milliseconds", value=_to_ms(latencies[-1]))
+        metrics.add_metric(name="BatchRecordHandlerLatencySum", unit="Milliseconds", value=_to_ms(sum(latencies)))
+        for percentile in PERCENTILES:
+            metrics.add_metric(
+                name=f"BatchRecordHandlerLatencyP{percentile}",
+                unit="Milliseconds",
+                value=_to_ms(_percentile(latencies, percentile)),
+            )
+
+
+def _percentile(sorted_values: List[int], percentile: int) -> int:
+    # nearest-rank method
+    rank = math.ceil(percentile / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def _to_ms(value_ns: int) -> float:
+    return value_ns / 1_000_000
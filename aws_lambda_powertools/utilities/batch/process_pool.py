@@ -0,0 +1,231 @@
+"""
+Process pool for CPU bound batch record handlers
+
+Lambda execution environments don't provide /dev/shm, so `multiprocessing.Pool` and
+`concurrent.futures.ProcessPoolExecutor` can't be used as they depend on semaphores.
+This pool only relies on processes and pipes, which are supported.
+"""
+import logging
+import multiprocessing
+import pickle  # nosec - only used to exchange data with our own worker processes
+import time
+import traceback
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+
+from aws_lambda_powertools.utilities.batch.exceptions import BatchDeadlineExceededError, ExceptionInfo
+from aws_lambda_powertools.utilities.batch.instrumentation import perf_counter_ns
+from aws_lambda_powertools.utilities.data_classes.dynamo_db_stream_event import DynamoDBRecord
+from aws_lambda_powertools.utilities.data_classes.kinesis_stream_event import KinesisStreamRecord
+from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
+
+logger = logging.getLogger(__name__)
+
+# Whether the record succeeded, either the handler result or the exception with its formatted traceback,
+# and the record conversion time and handler latency in nanoseconds if the handler was called
+RecordOutcome = Tuple[bool, Any, Optional[Tuple[int, int]]]
+
+
+class WorkerProcessError(Exception):
+    """When a worker process exited while processing a chunk of records"""
+
+
+class RemoteTraceback(Exception):
+    """Traceback of an exception raised within a worker process"""
+
+    def __init__(self, tb: str):
+        super().__init__(tb)
+        self.tb = tb
+
+    def __str__(self):
+        return self.tb
+
+
+def to_exception_info(exception: BaseException, formatted_traceback: str) -> ExceptionInfo:
+    """Rebuild exception information from an exception raised within a worker process"""
+    if formatted_traceback:
+        exception.__cause__ = RemoteTraceback(f'\n"""\n{formatted_traceback}"""')
+    return type(exception), exception, None
+
+
+def process_records(
+    handler: Callable, event_type: Any, model: Optional[Any], deadline: Optional[float], records: List[dict]
+) -> List[Any]:
+    """Process raw records within a worker process
+
+    Records are rebuilt as Event Source Data Classes, or Pydantic models, before calling the record handler.
+
+    Parameters
+    ----------
+    handler: Callable
+        Record handler, it must be importable by the worker process, e.g. a module-level function
+    event_type: EventType
+        Whether this is a SQS, DynamoDB Streams, or Kinesis Data Stream event
+    model: Optional["BatchTypeModels"]
+        Parser's data model using either SqsRecordModel, DynamoDBStreamRecordModel, KinesisDataStreamRecord
+    deadline: Optional[float]
+        Monotonic time after which records are not started anymore, and reported as failed
+    records: List[dict]
+        Raw batch records
+
+    Returns
+    -------
+    List[RecordOutcome]
+        Outcome for each record, in record order
+    """
+    data_classes = {
+        "SQS": SQSRecord,
+        "KinesisDataStreams": KinesisStreamRecord,
+        "DynamoDBStreams": DynamoDBRecord,
+    }
+
+    outcomes: List[RecordOutcome] = []
+    for record in records:
+        timings = None
+        try:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise BatchDeadlineExceededError("Record not processed as the invocation is about to time out")
+
+            start = perf_counter_ns()
+            data = model.parse_obj(record) if model is not None else data_classes[event_type.value](record)
+            converted = perf_counter_ns()
+            try:
+                result = handler(record=data)
+            finally:
+                timings = (converted - start, perf_counter_ns() - converted)
+            outcomes.append((True, result, timings))
+        except Exception as exc:
+            outcomes.append((False, _picklable_exception(exc, traceback.format_exc()), timings))
+
+    return outcomes
+
+
+def _picklable_exception(exception: Exception, formatted_traceback: str) -> Tuple[BaseException, str]:
+    # Exceptions with custom constructors can fail to be unpickled by the parent process
+    try:
+        pickle.loads(pickle.dumps(exception))  # nosec
+        return exception, formatted_traceback
+    except Exception:
+        return RuntimeError(f"{type(exception).__name__}: {exception}"), formatted_traceback
+
+
+def _worker(connection: Connection):
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+
+        if message is None:
+            break
+
+        fn, chunk = message
+        try:
+            connection.send(fn(chunk))
+        except Exception as exc:
+            connection.send(WorkerProcessError(f"Unable to process chunk of records: {exc}"))
+
+
+class ProcessPool:
+    """Pool of long-lived worker processes communicating through pipes
+
+    Worker processes are started on first use, and kept until `shutdown` is called,
+    so that the start up cost isn't paid on every warm invocation.
+
+    Parameters
+    ----------
+    max_workers: int
+        Number of worker processes
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._workers: List[Tuple[Any, Connection]] = []
+        start_methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context("fork" if "fork" in start_methods else None)
+
+    def map_chunks(self, fn: Callable[[List[Any]], Any], chunks: List[List[Any]]) -> List[Any]:
+        """Call `fn` with each chunk in a worker process
+
+        Chunks are dispatched to whichever worker is available first.
+
+        Returns
+        -------
+        List[Any]
+            Result of `fn` for each chunk, in chunk order, or `WorkerProcessError` when the worker process
+            exited, `fn` couldn't be called, or `fn` and the chunk couldn't be pickled
+        """
+        self._start_workers()
+        results: List[Any] = [None] * len(chunks)
+        pending = iter(enumerate(chunks))
+        in_flight: Dict[Connection, Tuple[int, int]] = {}
+
+        def dispatch(worker_index: int):
+            for chunk_index, chunk in pending:
+                connection = self._workers[worker_index][1]
+                try:
+                    connection.send((fn, chunk))
+                except ConnectionError as exc:
+                    results[chunk_index] = WorkerProcessError(f"Worker process is not available: {exc}")
+                    self._restart_worker(worker_index)
+                    continue
+                except (pickle.PicklingError, AttributeError, TypeError) as exc:
+                    # nothing was written to the pipe as pickling happens first, so the worker can be reused
+                    results[chunk_index] = WorkerProcessError(f"Unable to send records to worker process: {exc}")
+                    continue
+
+                in_flight[connection] = (worker_index, chunk_index)
+                return
+
+        for worker_index in range(len(self._workers)):
+            dispatch(worker_index)
+
+        while in_flight:
+            # wait() returns the objects it was given, which are all worker connections here
+            for connection in cast(List[Connection], wait(list(in_flight))):
+                worker_index, chunk_index = in_flight.pop(connection)
+                try:
+                    results[chunk_index] = connection.recv()
+                except (EOFError, ConnectionError) as exc:
+                    logger.debug(f"Worker process {worker_index} exited while processing a chunk, restarting it")
+                    results[chunk_index] = WorkerProcessError(f"Worker process exited: {exc!r}")
+                    self._restart_worker(worker_index)
+                except Exception as exc:
+                    results[chunk_index] = WorkerProcessError(f"Unable to receive results from worker process: {exc}")
+
+                dispatch(worker_index)
+
+        return results
+
+    def shutdown(self):
+        """Stop all worker processes"""
+        for process, connection in self._workers:
+            try:
+                connection.send(None)
+            except ConnectionError:
+                pass
+            connection.close()
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+
+        self._workers.clear()
+
+    def _start_workers(self):
+        while len(self._workers) < self.max_workers:
+            self._workers.append(self._start_worker())
+
+    def _start_worker(self) -> Tuple[Any, Connection]:
+        parent_connection, child_connection = self._context.Pipe()
+        process = self._context.Process(target=_worker, args=(child_connection,), daemon=True)
+        process.start()
+        child_connection.close()
+        return process, parent_connection
+
+    def _restart_worker(self, worker_index: int):
+        process, connection = self._workers[worker_index]
+        connection.close()
+        if process.is_alive():
+            process.terminate()
+        process.join(timeout=1)
+        self._workers[worker_index] = self._start_worker()
@@ -0,0 +1,146 @@
+"""
+Resolution of SQS Extended Client payloads stored in S3
+"""
+import json
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+from aws_lambda_powertools.utilities.batch.exceptions import ExceptionInfo
+
+logger = logging.getLogger(__name__)
+
+S3_POINTER_CLASS = "software.amazon.payloadoffloading.PayloadS3Pointer"
+_S3_POINTER_PREFIX = f'["{S3_POINTER_CLASS}"'
+
+
+def parse_s3_pointer(body: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Extract bucket name and object key from a SQS Extended Client message body
+
+    Parameters
+    ----------
+    body: str
+        SQS message body, e.g.
+        `["software.amazon.payloadoffloading.PayloadS3Pointer", {"s3BucketName": "bucket", "s3Key": "key"}]`
+
+    Returns
+    -------
+    Optional[Tuple[str, str]]
+        Bucket name and object key, or None when body isn't a S3 pointer
+    """
+    # cheap check first, as most message bodies aren't pointers
+    if not body or not body.startswith(_S3_POINTER_PREFIX):
+        return None
+
+    try:
+        pointer_class, pointer = json.loads(body)
+        if pointer_class == S3_POINTER_CLASS:
+            return pointer["s3BucketName"], pointer["s3Key"]
+    except (ValueError, TypeError, KeyError):
+        logger.debug("Message body looks like a S3 pointer but couldn't be parsed, leaving it as is")
+
+    return None
+
+
+class S3PointerResolver:
+    """Fetches SQS Extended Client payloads stored in S3, concurrently
+
+    Messages larger than 256 KB sent with the SQS Extended Client libraries have their payload stored in S3,
+    and a pointer to the S3 object as body. Objects referenced in a batch are fetched concurrently, before
+    any record handler runs, and replace the pointer as message body.
+
+    The S3 client, its connection pool, and the thread pool are kept across warm invocations.
+
+    Parameters
+    ----------
+    max_workers: int
+        Maximum number of objects fetched concurrently, by default 10
+    config: Config, optional
+        botocore config object, its `max_pool_connections` defaults to `max_workers`
+    boto3_session: boto3.session.Session, optional
+        Boto3 session to use for AWS API communication
+
+    Example
+    -------
+    **Process SQS Extended Client messages**
+
+        >>> from aws_lambda_powertools.utilities.batch import BatchProcessor, EventType, S3PointerResolver
+        >>> from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
+        >>>
+        >>> processor = BatchProcessor(event_type=EventType.SQS, s3_pointer_resolver=S3PointerResolver())
+        >>>
+        >>> def record_handler(record: SQSRecord):
+        >>>     return record.body  # S3 object content
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 10,
+        config: Optional[Config] = None,
+        boto3_session: Optional[boto3.session.Session] = None,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be a positive integer")
+
+        self.max_workers = max_workers
+        config = config or Config(max_pool_connections=max_workers)
+        session = boto3_session or boto3.session.Session()
+        self.client = session.client("s3", config=config)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def resolve(self, records: List[dict]) -> List[Tuple[dict, Optional[ExceptionInfo]]]:
+        """Replace S3 pointer bodies with the content of the object they reference
+
+        Parameters
+        ----------
+        records: List[dict]
+            Raw SQS records
+
+        Returns
+        -------
+        List[Tuple[dict, Optional[ExceptionInfo]]]
+            For each record, in record order, either a copy of the record with the resolved body, the record itself
+            when it isn't a S3 pointer, or the record along with the exception raised while fetching its payload
+        """
+        pointers = [(index, parse_s3_pointer(record.get("body"))) for index, record in enumerate(records)]
+        pointers = [(index, pointer) for index, pointer in pointers if pointer is not None]
+
+        resolved: List[Tuple[dict, Optional[ExceptionInfo]]] = [(record, None) for record in records]
+        if not pointers:
+            return resolved
+
+        logger.debug(f"Fetching {len(pointers)} SQS Extended Client payloads from S3")
+        if len(pointers) == 1:
+            payloads = [self._fetch(*pointers[0][1])]  # type: ignore[misc]
+        else:
+            executor = self._get_executor()
+            futures = [executor.submit(self._fetch, *pointer) for _, pointer in pointers]  # type: ignore[misc]
+            payloads = [future.result() for future in futures]
+
+        for (index, _), (payload, exception) in zip(pointers, payloads):
+            record = records[index]
+            resolved[index] = (record, exception) if exception is not None else ({**record, "body": payload}, None)
+
+        return resolved
+
+    def _fetch(self, bucket: str, key: str) -> Tuple[Any, Optional[ExceptionInfo]]:
+        try:
+            response = self.client.get_object(Bucket=bucket, Key=key)
+            return response["Body"].read().decode("utf-8"), None
+        except Exception:
+            logger.debug(f"Unable to fetch SQS Extended Client payload from s3://{bucket}/{key}")
+            return None, sys.exc_info()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="powertools-s3-pointer"
+                )
+            return self._executor
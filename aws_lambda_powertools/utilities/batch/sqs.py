@@ -4,14 +4,17 @@
 Batch SQS utilities
 """
 import logging
-import math
+import random
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 import boto3
 from botocore.config import Config
 
+from aws_lambda_powertools.shared.cache_dict import LRUDict
 from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
 
 from ...middleware_factory import lambda_handler_decorator
@@ -20,6 +23,24 @@ from .exceptions import SQSBatchProcessingError
 
 logger = logging.getLogger(__name__)
 
+# The sqs_batch_processor decorator creates a new processor on every invocation, so SQS clients,
+# their connection pool, and resolved queue URLs are kept at module level to survive warm invocations.
+# Clients are keyed by config and session objects, and queue URLs by client and event source ARN. Objects hash
+# by identity, so only the most recently used entries are kept, as processors may create new ones on every invocation.
+_clients: Dict[Tuple[Optional[Config], Optional[boto3.session.Session]], Any] = LRUDict(max_items=8)
+_queue_urls: Dict[Tuple[Any, str], str] = LRUDict(max_items=8)
+_clients_lock = threading.Lock()
+
+
+def _get_client(config: Optional[Config], boto3_session: Optional[boto3.session.Session]) -> Any:
+    key = (config, boto3_session)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            session = boto3_session or boto3.session.Session()
+            client = _clients[key] = session.client("sqs", config=config or Config())
+        return client
+
 
 class PartialSQSProcessor(BasePartialProcessor):
     """
@@ -38,6 +59,11 @@ class PartialSQSProcessor(BasePartialProcessor):
     boto3_session : boto3.session.Session, optional
             Boto3 session to use for AWS API communication
 
+    SQS clients are reused across processors created with the same `config` and `boto3_session` objects,
+    and deletions run in a thread pool shared by all processors, so both survive warm invocations.
+    Messages that SQS failed to delete due to server errors are retried up to `max_delete_retries` times,
+    after a random delay of up to `delete_retry_backoff` seconds, doubled on every attempt.
+
 
     Example
     -------
@@ -62,6 +88,9 @@ class PartialSQSProcessor(BasePartialProcessor):
 
     """
 
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
     def __init__(
         self,
         config: Optional[Config] = None,
@@ -71,11 +100,11 @@ class PartialSQSProcessor(BasePartialProcessor):
         """
         Initializes sqs client.
         """
-        config = config or Config()
-        session = boto3_session or boto3.session.Session()
-        self.client = session.client("sqs", config=config)
+        self.client = _get_client(config=config, boto3_session=boto3_session)
         self.suppress_exception = suppress_exception
         self.max_message_batch = 10
+        self.max_delete_retries = 2
+        self.delete_retry_backoff = 0.05
 
         super().__init__()
 
@@ -86,8 +115,14 @@ class PartialSQSProcessor(BasePartialProcessor):
         if not getattr(self, "records", None):
             return None
 
-        *_, account_id, queue_name = self.records[0]["eventSourceARN"].split(":")
-        return f"{self.client._endpoint.host}/{account_id}/{queue_name}"
+        event_source_arn = self.records[0]["eventSourceARN"]
+        key = (self.client, event_source_arn)
+        with _clients_lock:
+            queue_url = _queue_urls.get(key)
+            if queue_url is None:
+                *_, account_id, queue_name = event_source_arn.split(":")
+                queue_url = _queue_urls[key] = f"{self.client.meta.endpoint_url}/{account_id}/{queue_name}"
+            return queue_url
 
     def _get_entries_to_clean(self) -> List[Dict[str, str]]:
         """
@@ -122,6 +157,7 @@ class PartialSQSProcessor(BasePartialProcessor):
         """
         self.success_messages.clear()
         self.fail_messages.clear()
+        self.exceptions.clear()
 
     def _clean(self) -> Optional[List]:
         """
@@ -141,25 +177,24 @@ class PartialSQSProcessor(BasePartialProcessor):
 
         entries_to_remove = self._get_entries_to_clean()
         # Batch delete up to 10 messages at a time (SQS limit)
-        max_workers = math.ceil(len(entries_to_remove) / self.max_message_batch)
-
-        if entries_to_remove:
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures, results = [], []
-                while entries_to_remove:
-                    futures.append(
-                        executor.submit(
-                            self._delete_messages, queue_url, entries_to_remove[: self.max_message_batch], self.client
-                        )
-                    )
-                    entries_to_remove = entries_to_remove[self.max_message_batch :]
-                for future in as_completed(futures):
-                    try:
-                        logger.debug("Deleted batch of processed messages from SQS")
-                        results.append(future.result())
-                    except Exception:
-                        logger.exception("Couldn't remove batch of processed messages from SQS")
-                        raise
+        chunks = [
+            entries_to_remove[index : index + self.max_message_batch]
+            for index in range(0, len(entries_to_remove), self.max_message_batch)
+        ]
+
+        results: List[Any] = []
+        if len(chunks) == 1:
+            results.extend(self._delete_entries(queue_url, chunks[0]))
+        elif chunks:
+            executor = self._get_executor()
+            futures = [executor.submit(self._delete_entries, queue_url, chunk) for chunk in chunks]
+            for future in futures:
+                try:
+                    results.extend(future.result())
+                except Exception:
+                    logger.exception("Couldn't remove batch of processed messages from SQS")
+                    raise
+
         if self.suppress_exception:
             logger.debug(f"{len(self.fail_messages)} records failed processing, but exceptions are suppressed")
         else:
@@ -172,6 +207,39 @@ class PartialSQSProcessor(BasePartialProcessor):
 
         return results
 
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(thread_name_prefix="powertools-sqs-delete")
+            return cls._executor
+
+    def _delete_entries(self, queue_url: str, entries: List[Dict[str, str]]) -> List[Any]:
+        """
+        Delete a batch of messages, retrying only entries that failed due to server errors
+        """
+        responses = [self._delete_messages(queue_url, entries, self.client)]
+        logger.debug("Deleted batch of processed messages from SQS")
+
+        for attempt in range(self.max_delete_retries):
+            failed_ids = {entry["Id"] for entry in responses[-1].get("Failed", []) if not entry.get("SenderFault")}
+            if not failed_ids:
+                break
+
+            entries = [entry for entry in entries if entry["Id"] in failed_ids]
+
+            # full jitter, so concurrent deletes throttled together don't retry in lockstep
+            delay = random.uniform(0, self.delete_retry_backoff * 2**attempt)  # nosec - not used for security
+            logger.debug(f"Retrying deletion of {len(entries)} messages that SQS failed to delete in {delay:.3f}s")
+            time.sleep(delay)
+            responses.append(self._delete_messages(queue_url, entries, self.client))
+
+        failed = responses[-1].get("Failed", [])
+        if failed:
+            logger.warning(f"Couldn't delete {len(failed)} processed messages from SQS, they'll be processed again")
+
+        return responses
+
     def _delete_messages(self, queue_url: str, entries_to_remove: List, sqs_client: Any):
         delete_message_response = sqs_client.delete_message_batch(
             QueueUrl=queue_url,
@@ -228,10 +296,7 @@ def sqs_batch_processor(
     * Async batch processors
 
     """
-    config = config or Config()
-    session = boto3_session or boto3.session.Session()
-
-    processor = PartialSQSProcessor(config=config, suppress_exception=suppress_exception, boto3_session=session)
+    processor = PartialSQSProcessor(config=config, suppress_exception=suppress_exception, boto3_session=boto3_session)
 
     records = event["Records"]
 
@@ -0,0 +1,169 @@
+"""
+Batch processing for SQS FIFO queues
+"""
+import logging
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from aws_lambda_powertools.utilities.batch.base import (
+    BatchEventTypes,
+    BatchProcessor,
+    EventType,
+    FailureResponse,
+    SuccessResponse,
+)
+from aws_lambda_powertools.utilities.batch.exceptions import ExceptionInfo, SQSFifoCircuitBreakerError
+from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
+
+if TYPE_CHECKING:
+    from aws_lambda_powertools.metrics.base import MetricManager
+    from aws_lambda_powertools.utilities.batch.base import BatchTypeModels
+
+logger = logging.getLogger(__name__)
+
+# converted record, handler result, exception info when record failed
+RecordOutcome = Tuple[BatchEventTypes, Any, Optional[ExceptionInfo]]
+
+
+class SqsFifoPartialProcessor(BatchProcessor):
+    """Process native partial responses from SQS FIFO queues.
+
+    Records are partitioned by their message group ID. Within a message group, records are processed
+    in order and, once a record fails, the remaining records of that group are marked as failed without
+    calling the record handler. This preserves ordering as they are all redelivered by SQS.
+
+    Different message groups are processed concurrently when `max_concurrency` is set.
+
+    Example
+    -------
+
+    ## Process batch triggered by a SQS FIFO queue
+
+    ```python
+    import json
+
+    from aws_lambda_powertools.utilities.batch import SqsFifoPartialProcessor, batch_processor
+    from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
+    from aws_lambda_powertools.utilities.typing import LambdaContext
+
+
+    processor = SqsFifoPartialProcessor(max_concurrency=10)
+
+
+    def record_handler(record: SQSRecord):
+        payload: dict = json.loads(record.body)
+        ...
+
+    @batch_processor(record_handler=record_handler, processor=processor)
+    def lambda_handler(event, context: LambdaContext):
+        return processor.response()
+    ```
+
+    Raises
+    ------
+    BatchProcessingError
+        When all batch records fail processing
+    """
+
+    def __init__(
+        self,
+        model: Optional["BatchTypeModels"] = None,
+        max_concurrency: Optional[int] = None,
+        timeout_margin_ms: Optional[int] = None,
+        metrics: Optional["MetricManager"] = None,
+    ):
+        """Process SQS FIFO batch and partially report failed items
+
+        Parameters
+        ----------
+        model: Optional["BatchTypeModels"]
+            Parser's data model using SqsRecordModel
+        max_concurrency: Optional[int]
+            Maximum number of message groups processed concurrently in a thread pool, by default message groups
+            are processed sequentially. The thread pool is kept across warm invocations.
+        timeout_margin_ms: Optional[int]
+            Stop starting new records once the invocation remaining time drops below this margin, in milliseconds.
+            Records not started are reported as failures. Requires the Lambda context.
+        metrics: Optional[MetricManager]
+            Metrics instance to add record handler latency, record conversion time, and success and failure counts
+            to once per batch, e.g. `aws_lambda_powertools.metrics.Metrics`
+
+        Exceptions
+        ----------
+        BatchProcessingError
+            Raised when the entire batch has failed processing
+        """
+        super().__init__(
+            event_type=EventType.SQS,
+            model=model,
+            max_concurrency=max_concurrency,
+            timeout_margin_ms=timeout_margin_ms,
+            metrics=metrics,
+        )
+
+    def process(self) -> List[Union[SuccessResponse, FailureResponse]]:
+        """
+        Call instance's handler for each record, one message group at a time.
+        """
+        self._deadline = self._get_deadline()
+
+        groups: Dict[Optional[str], List[int]] = {}
+        for index, record in enumerate(self.records):
+            group_id = SQSRecord(record).attributes.message_group_id
+            groups.setdefault(group_id, []).append(index)
+
+        batch = self._to_batch_types(self.records)
+        outcomes: List[Optional[RecordOutcome]] = [None] * len(self.records)
+        if self.max_concurrency is None or self.max_concurrency == 1:
+            group_outcomes = [self._process_group(group_id, indexes, batch) for group_id, indexes in groups.items()]
+        else:
+            executor = self._get_executor()
+            futures = [
+                executor.submit(self._process_group, group_id, indexes, batch) for group_id, indexes in groups.items()
+            ]
+            group_outcomes = [future.result() for future in futures]
+
+        for indexes, group_outcome in zip(groups.values(), group_outcomes):
+            for index, outcome in zip(indexes, group_outcome):
+                outcomes[index] = outcome
+
+        # success and failure handlers are called in record order from the calling thread
+        return [self._collect_outcome(record, outcome) for record, outcome in zip(self.records, outcomes)]
+
+    def _process_group(
+        self, group_id: Optional[str], indexes: List[int], batch: List[Tuple[Any, Optional[ExceptionInfo]]]
+    ) -> List[RecordOutcome]:
+        outcomes: List[RecordOutcome] = []
+        group_failed = False
+
+        for index in indexes:
+            data, conversion_exception = batch[index]
+            if conversion_exception is not None and not group_failed:
+                outcomes.append((data, None, conversion_exception))
+                group_failed = True
+                logger.debug(f"Record failed conversion, short-circuiting message group '{group_id}'")
+                continue
+
+            if group_failed:
+                exception = SQSFifoCircuitBreakerError(
+                    f"A previous record from message group '{group_id}' failed processing"
+                )
+                outcomes.append((data, None, (SQSFifoCircuitBreakerError, exception, None)))
+                continue
+
+            try:
+                outcomes.append((data, self._call_handler(data), None))
+            except Exception:
+                outcomes.append((data, None, sys.exc_info()))
+                group_failed = True
+                logger.debug(f"Record failed processing, short-circuiting message group '{group_id}'")
+
+        return outcomes
+
+    def _collect_outcome(
+        self, record: dict, outcome: Optional[RecordOutcome]
+    ) -> Union[SuccessResponse, FailureResponse]:
+        data, result, exception = outcome  # type: ignore[misc] # every record belongs to a group
+        if exception is None:
+            return self.success_handler(record=record, result=result)
+        return self.failure_handler(record=data, exception=exception)
@@ -1,9 +1,56 @@
 import base64
+import hashlib
 import json
-from typing import Iterator
+from typing import Iterator, List, Optional, Tuple, Union
 
 from aws_lambda_powertools.utilities.data_classes.common import DictWrapper
 
+# Kinesis Producer Library aggregated records format
+# https://github.com/awslabs/amazon-kinesis-producer/blob/master/aggregation-format.md
+KPL_AGGREGATED_RECORD_MAGIC = b"\xf3\x89\x9a\xc2"
+KPL_DIGEST_SIZE = 16  # MD5
+
+# protobuf wire types
+_VARINT = 0
+_FIXED64 = 1
+_LENGTH_DELIMITED = 2
+_FIXED32 = 5
+
+
+class KinesisUserRecord:
+    """User record de-aggregated from a Kinesis Producer Library (KPL) aggregated record
+
+    `data` is a memoryview over the decoded parent record data, so no data is copied until you read it.
+    """
+
+    __slots__ = ("partition_key", "explicit_hash_key", "data", "sequence_number", "sub_sequence_number")
+
+    def __init__(
+        self,
+        partition_key: str,
+        explicit_hash_key: Optional[str],
+        data: memoryview,
+        sequence_number: str,
+        sub_sequence_number: int,
+    ):
+        self.partition_key = partition_key
+        self.explicit_hash_key = explicit_hash_key
+        self.data = data
+        self.sequence_number = sequence_number
+        self.sub_sequence_number = sub_sequence_number
+
+    def data_as_bytes(self) -> bytes:
+        """User record data as bytes"""
+        return bytes(self.data)
+
+    def data_as_text(self) -> str:
+        """Decode user record data as text"""
+        return str(self.data, "utf-8")
+
+    def data_as_json(self) -> dict:
+        """Decode user record data as json"""
+        return json.loads(self.data_as_text())
+
 
 class KinesisStreamRecordPayload(DictWrapper):
     @property
@@ -43,6 +90,42 @@ class KinesisStreamRecordPayload(DictWrapper):
         """Decode binary encoded data as json"""
         return json.loads(self.data_as_text())
 
+    def is_aggregated(self) -> bool:
+        """Whether data is a Kinesis Producer Library (KPL) aggregated record, with a valid MD5 digest"""
+        return _is_aggregated(memoryview(self.data_as_bytes()))
+
+    def user_records(self) -> Iterator[KinesisUserRecord]:
+        """De-aggregate Kinesis Producer Library (KPL) aggregated records
+
+        User records are yielded one at a time, and their data is sliced from the decoded data without copying.
+        Data that isn't a KPL aggregated record, or whose MD5 digest doesn't match, is yielded as a single user
+        record, as the Kinesis Client Library does.
+
+        Raises
+        ------
+        ValueError
+            When an aggregated record with a valid digest can't be decoded
+        """
+        data = memoryview(self.data_as_bytes())
+        if not _is_aggregated(data):
+            yield KinesisUserRecord(self.partition_key, None, data, self.sequence_number, 0)
+            return
+
+        partition_keys: List[str] = []
+        explicit_hash_keys: List[str] = []
+        records: List[memoryview] = []
+        # user records reference partition and explicit hash keys by index, so tables are read first
+        for field_number, value in _iter_fields(data[len(KPL_AGGREGATED_RECORD_MAGIC) : -KPL_DIGEST_SIZE]):
+            if field_number == 1:
+                partition_keys.append(str(value, "utf-8"))  # type: ignore[arg-type]
+            elif field_number == 2:
+                explicit_hash_keys.append(str(value, "utf-8"))  # type: ignore[arg-type]
+            elif field_number == 3:
+                records.append(value)  # type: ignore[arg-type]
+
+        for sub_sequence_number, record in enumerate(records):
+            yield _to_user_record(record, partition_keys, explicit_hash_keys, self.sequence_number, sub_sequence_number)
+
 
 class KinesisStreamRecord(DictWrapper):
     @property
@@ -98,3 +181,82 @@ class KinesisStreamEvent(DictWrapper):
     def records(self) -> Iterator[KinesisStreamRecord]:
         for record in self["Records"]:
             yield KinesisStreamRecord(record)
+
+
+def _is_aggregated(data: memoryview) -> bool:
+    if len(data) <= len(KPL_AGGREGATED_RECORD_MAGIC) + KPL_DIGEST_SIZE:
+        return False
+    if data[: len(KPL_AGGREGATED_RECORD_MAGIC)] != KPL_AGGREGATED_RECORD_MAGIC:
+        return False
+
+    message = data[len(KPL_AGGREGATED_RECORD_MAGIC) : -KPL_DIGEST_SIZE]
+    return hashlib.md5(message).digest() == data[-KPL_DIGEST_SIZE:]  # nosec - checksum, as per KPL format
+
+
+def _to_user_record(
+    record: memoryview,
+    partition_keys: List[str],
+    explicit_hash_keys: List[str],
+    sequence_number: str,
+    sub_sequence_number: int,
+) -> KinesisUserRecord:
+    partition_key_index: Optional[int] = None
+    explicit_hash_key_index: Optional[int] = None
+    data: Optional[memoryview] = None
+    for field_number, value in _iter_fields(record):
+        if field_number == 1:
+            partition_key_index = value  # type: ignore[assignment]
+        elif field_number == 2:
+            explicit_hash_key_index = value  # type: ignore[assignment]
+        elif field_number == 3:
+            data = value  # type: ignore[assignment]
+
+    if partition_key_index is None or data is None:
+        raise ValueError(f"Aggregated user record {sub_sequence_number} is missing its partition key or data")
+
+    try:
+        partition_key = partition_keys[partition_key_index]
+        explicit_hash_key = None if explicit_hash_key_index is None else explicit_hash_keys[explicit_hash_key_index]
+    except IndexError:
+        raise ValueError(f"Aggregated user record {sub_sequence_number} references an unknown key")
+
+    return KinesisUserRecord(partition_key, explicit_hash_key, data, sequence_number, sub_sequence_number)
+
+
+def _iter_fields(message: memoryview) -> Iterator[Tuple[int, Union[int, memoryview]]]:
+    """Iterate over protobuf fields, length-delimited values are sliced without copying"""
+    position = 0
+    end = len(message)
+    while position < end:
+        key, position = _read_varint(message, position)
+        field_number, wire_type = key >> 3, key & 0x7
+        if wire_type == _VARINT:
+            value, position = _read_varint(message, position)
+            yield field_number, value
+        elif wire_type == _LENGTH_DELIMITED:
+            length, position = _read_varint(message, position)
+            if position + length > end:
+                raise ValueError("Truncated aggregated record")
+            yield field_number, message[position : position + length]
+            position += length
+        elif wire_type == _FIXED64:
+            position += 8
+        elif wire_type == _FIXED32:
+            position += 4
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type} in aggregated record")
+
+
+def _read_varint(message: memoryview, position: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    try:
+        while True:
+            byte = message[position]
+            position += 1
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result, position
+            shift += 7
+    except IndexError:
+        raise ValueError("Truncated aggregated record")
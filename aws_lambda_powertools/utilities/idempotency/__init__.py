@@ -2,9 +2,30 @@
 Utility for adding idempotency to lambda functions
 """
 
-from aws_lambda_powertools.utilities.idempotency.persistence.base import BasePersistenceLayer
-from aws_lambda_powertools.utilities.idempotency.persistence.dynamodb import DynamoDBPersistenceLayer
+from aws_lambda_powertools.utilities.idempotency.batch import BatchIdempotency
+from aws_lambda_powertools.utilities.idempotency.persistence.base import AsyncBasePersistenceLayer, BasePersistenceLayer
+from aws_lambda_powertools.utilities.idempotency.persistence.dynamodb import (
+    AsyncDynamoDBPersistenceLayer,
+    DynamoDBClientPersistenceLayer,
+    DynamoDBPersistenceLayer,
+)
+from aws_lambda_powertools.utilities.idempotency.persistence.in_memory import InMemoryPersistenceLayer
+from aws_lambda_powertools.utilities.idempotency.persistence.redis import RedisPersistenceLayer
+from aws_lambda_powertools.utilities.idempotency.persistence.sqlite import SQLitePersistenceLayer
 
 from .idempotency import IdempotencyConfig, idempotent, idempotent_function
 
-__all__ = ("DynamoDBPersistenceLayer", "BasePersistenceLayer", "idempotent", "idempotent_function", "IdempotencyConfig")
+__all__ = (
+    "DynamoDBPersistenceLayer",
+    "DynamoDBClientPersistenceLayer",
+    "InMemoryPersistenceLayer",
+    "SQLitePersistenceLayer",
+    "RedisPersistenceLayer",
+    "AsyncDynamoDBPersistenceLayer",
+    "BasePersistenceLayer",
+    "AsyncBasePersistenceLayer",
+    "BatchIdempotency",
+    "idempotent",
+    "idempotent_function",
+    "IdempotencyConfig",
+)
@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import logging
 from copy import deepcopy
 from typing import Any, Callable, Dict, Optional, Tuple
@@ -14,8 +16,10 @@ from aws_lambda_powertools.utilities.idempotency.exceptions import (
 )
 from aws_lambda_powertools.utilities.idempotency.persistence.base import (
     STATUS_CONSTANTS,
+    AsyncBasePersistenceLayer,
     BasePersistenceLayer,
     DataRecord,
+    IdempotencyKeyContext,
 )
 
 MAX_RETRIES = 2
@@ -76,6 +80,7 @@ class IdempotencyHandler:
 
         persistence_store.configure(config, self.function.__name__)
         self.persistence_store = persistence_store
+        self._key_context: Optional[IdempotencyKeyContext] = None
 
     def handle(self) -> Any:
         """
@@ -101,29 +106,44 @@ class IdempotencyHandler:
         try:
             # We call save_inprogress first as an optimization for the most common case where no idempotent record
             # already exists. If it succeeds, there's no need to call get_record.
-            self.persistence_store.save_inprogress(data=self.data)
+            self.persistence_store.save_inprogress(data=self.data, key_context=self._get_key_context())
         except IdempotencyKeyError:
             raise
-        except IdempotencyItemAlreadyExistsError:
-            # Now we know the item already exists, we can retrieve it
-            record = self._get_idempotency_record()
+        except IdempotencyItemAlreadyExistsError as exc:
+            # Now we know the item already exists, we can retrieve it, unless it was returned along with the error
+            record = self._get_idempotency_record(existing_record=exc.old_data_record)
             return self._handle_for_status(record)
         except Exception as exc:
             raise IdempotencyPersistenceLayerError("Failed to save in progress record to idempotency store") from exc
 
         return self._get_function_response()
 
-    def _get_idempotency_record(self) -> DataRecord:
+    def _get_key_context(self) -> IdempotencyKeyContext:
+        """
+        Hash idempotency key and payload once per invocation, as it's needed by every persistence layer call.
+        """
+        if self._key_context is None:
+            self._key_context = self.persistence_store.get_key_context(data=self.data)
+        return self._key_context
+
+    def _get_idempotency_record(self, existing_record: Optional[DataRecord] = None) -> DataRecord:
         """
         Retrieve the idempotency record from the persistence layer.
 
+        Parameters
+        ----------
+        existing_record: DataRecord, optional
+            Record returned by the persistence layer when saving the in progress record failed
+
         Raises
         ----------
         IdempotencyInconsistentStateError
 
         """
         try:
-            data_record = self.persistence_store.get_record(data=self.data)
+            data_record = self.persistence_store.get_record(
+                data=self.data, key_context=self._get_key_context(), existing_record=existing_record
+            )
         except IdempotencyItemNotFoundError:
             # This code path will only be triggered if the record is removed between save_inprogress and get_record.
             logger.debug(
@@ -181,7 +201,97 @@ class IdempotencyHandler:
             # We need these nested blocks to preserve function's exception in case the persistence store operation
             # also raises an exception
             try:
-                self.persistence_store.delete_record(data=self.data, exception=handler_exception)
+                self.persistence_store.delete_record(
+                    data=self.data, exception=handler_exception, key_context=self._get_key_context()
+                )
+            except Exception as delete_exception:
+                raise IdempotencyPersistenceLayerError(
+                    "Failed to delete record from idempotency store"
+                ) from delete_exception
+            raise
+
+        else:
+            try:
+                self.persistence_store.save_success(
+                    data=self.data, result=response, key_context=self._get_key_context()
+                )
+            except Exception as save_exception:
+                raise IdempotencyPersistenceLayerError(
+                    "Failed to update record state to success in idempotency store"
+                ) from save_exception
+
+        return response
+
+
+class AsyncIdempotencyHandler(IdempotencyHandler):
+    """
+    Orchestrate calls to persistence layer for coroutine functions, without blocking the event loop.
+
+    Asynchronous persistence layers are awaited, synchronous ones are called in the event loop default executor.
+    """
+
+    async def handle(self) -> Any:
+        """
+        Main entry point for handling idempotent execution of a coroutine function.
+
+        Returns
+        -------
+        Any
+            Function response
+
+        """
+        for i in range(MAX_RETRIES + 1):  # pragma: no cover
+            try:
+                return await self._process_idempotency_async()
+            except IdempotencyInconsistentStateError:
+                if i == MAX_RETRIES:
+                    raise  # Bubble up when exceeded max tries
+
+    async def _call_persistence_store(self, method: str, **kwargs) -> Any:
+        if isinstance(self.persistence_store, AsyncBasePersistenceLayer):
+            return await getattr(self.persistence_store, f"{method}_async")(**kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(getattr(self.persistence_store, method), **kwargs))
+
+    async def _process_idempotency_async(self):
+        try:
+            await self._call_persistence_store("save_inprogress", data=self.data, key_context=self._get_key_context())
+        except IdempotencyKeyError:
+            raise
+        except IdempotencyItemAlreadyExistsError as exc:
+            record = await self._get_idempotency_record_async(existing_record=exc.old_data_record)
+            return self._handle_for_status(record)
+        except Exception as exc:
+            raise IdempotencyPersistenceLayerError("Failed to save in progress record to idempotency store") from exc
+
+        return await self._get_function_response_async()
+
+    async def _get_idempotency_record_async(self, existing_record: Optional[DataRecord] = None) -> DataRecord:
+        try:
+            data_record = await self._call_persistence_store(
+                "get_record", data=self.data, key_context=self._get_key_context(), existing_record=existing_record
+            )
+        except IdempotencyItemNotFoundError:
+            logger.debug(
+                f"An existing idempotency record was deleted before we could fetch it. Proceeding with {self.function}"
+            )
+            raise IdempotencyInconsistentStateError("save_inprogress and get_record return inconsistent results.")
+        except IdempotencyValidationError:
+            raise
+        except Exception as exc:
+            raise IdempotencyPersistenceLayerError("Failed to get record from idempotency store") from exc
+
+        return data_record
+
+    async def _get_function_response_async(self):
+        try:
+            response = await self.function(*self.fn_args, **self.fn_kwargs)
+        except Exception as handler_exception:
+            try:
+                await self._call_persistence_store(
+                    "delete_record", data=self.data, exception=handler_exception, key_context=self._get_key_context()
+                )
             except Exception as delete_exception:
                 raise IdempotencyPersistenceLayerError(
                     "Failed to delete record from idempotency store"
@@ -190,7 +300,9 @@ class IdempotencyHandler:
 
         else:
             try:
-                self.persistence_store.save_success(data=self.data, result=response)
+                await self._call_persistence_store(
+                    "save_success", data=self.data, result=response, key_context=self._get_key_context()
+                )
             except Exception as save_exception:
                 raise IdempotencyPersistenceLayerError(
                     "Failed to update record state to success in idempotency store"
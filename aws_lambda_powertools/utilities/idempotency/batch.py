@@ -0,0 +1,275 @@
+"""
+Idempotency for records processed in batches, e.g. SQS, Kinesis, or DynamoDB Streams batches
+"""
+import functools
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from aws_lambda_powertools.shared import constants
+from aws_lambda_powertools.utilities.idempotency.base import IdempotencyHandler, _prepare_data
+from aws_lambda_powertools.utilities.idempotency.config import IdempotencyConfig
+from aws_lambda_powertools.utilities.idempotency.exceptions import (
+    IdempotencyAlreadyInProgressError,
+    IdempotencyPersistenceLayerError,
+)
+from aws_lambda_powertools.utilities.idempotency.persistence.base import (
+    STATUS_CONSTANTS,
+    AsyncBasePersistenceLayer,
+    BasePersistenceLayer,
+    DataRecord,
+    IdempotencyKeyContext,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _RecordState:
+    """
+    Idempotency state shared by records of a batch with the same idempotency key
+    """
+
+    __slots__ = ("key_context", "data_record", "claimed", "started", "completed", "response")
+
+    def __init__(self, key_context: IdempotencyKeyContext):
+        self.key_context = key_context
+        self.data_record: Optional[DataRecord] = None
+        self.claimed = False
+        self.started = False
+        self.completed = False
+        self.response: Any = None
+
+
+class BatchIdempotency:
+    """Idempotent record handler, saving idempotency records for a whole batch in bulk
+
+    Wrapping a record handler with `idempotent_function` costs at least two round trips to the persistence store per
+    record. Instead, `batch` computes the idempotency key of every record upfront, fetches existing records at once,
+    and claims in progress records for all the others at once, before any record handler runs. Records already
+    completed return their stored response without calling the record handler. Completed and failed records are
+    saved, or deleted, at once when the batch ends.
+
+    Persistence layers without batch operations fall back to one call per record. Records the handler receives that
+    weren't part of `batch`, e.g. when the processor transforms them, are handled one by one like `idempotent_function`.
+
+    Idempotency keys are the same as `idempotent_function` ones for the same record handler and payload.
+
+    Example
+    -------
+    **Processes a SQS batch in an idempotent manner**
+
+        >>> from aws_lambda_powertools.utilities.batch import BatchProcessor, EventType
+        >>> from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
+        >>> from aws_lambda_powertools.utilities.idempotency import (
+        >>>    BatchIdempotency, DynamoDBPersistenceLayer, IdempotencyConfig
+        >>> )
+        >>>
+        >>> processor = BatchProcessor(event_type=EventType.SQS)
+        >>> persistence_layer = DynamoDBPersistenceLayer(table_name="idempotency_store")
+        >>> config = IdempotencyConfig(event_key_jmespath="messageId")
+        >>>
+        >>> def record_handler(record: SQSRecord):
+        >>>     return {"message": record.body}
+        >>>
+        >>> idempotent_handler = BatchIdempotency(record_handler, persistence_store=persistence_layer, config=config)
+        >>>
+        >>> def lambda_handler(event, context):
+        >>>     batch = event["Records"]
+        >>>     with idempotent_handler.batch(batch), processor(records=batch, handler=idempotent_handler):
+        >>>         processor.process()
+        >>>     return processor.response()
+    """
+
+    def __init__(
+        self,
+        record_handler: Callable,
+        persistence_store: BasePersistenceLayer,
+        config: Optional[IdempotencyConfig] = None,
+    ):
+        """
+        Parameters
+        ----------
+        record_handler: Callable
+            Record handler, called with the `record` keyword argument
+        persistence_store: BasePersistenceLayer
+            Instance of BasePersistenceLayer to store data
+        config: IdempotencyConfig, optional
+            Configuration
+        """
+        if isinstance(persistence_store, AsyncBasePersistenceLayer):
+            raise persistence_store._synchronous_call_error()
+
+        functools.update_wrapper(self, record_handler)
+        self.record_handler = record_handler
+        self.config = config or IdempotencyConfig()
+        self.persistence_store = persistence_store
+        self.persistence_store.configure(self.config, record_handler.__name__)
+
+        self._lock = threading.Lock()
+        self._states: Dict[str, _RecordState] = {}
+        # payloads are looked up by identity first, so keys aren't hashed twice for records passed as is
+        self._payloads: Dict[int, Tuple[Any, IdempotencyKeyContext]] = {}
+        self._completed: List[_RecordState] = []
+
+    def __call__(self, record: Any, **kwargs) -> Any:
+        """
+        Call record handler, or return the stored response for records that were already completed
+
+        Raises
+        ------
+        IdempotencyAlreadyInProgressError
+            Record is being processed by another execution, or by another record of this batch with the same key
+        IdempotencyValidationError
+            Payload doesn't match the stored record for the given idempotency key
+        """
+        if os.getenv(constants.IDEMPOTENCY_DISABLED_ENV):
+            return self.record_handler(record=record, **kwargs)
+
+        state = self._get_state(record)
+        if state is None:
+            return IdempotencyHandler(
+                function=self.record_handler,
+                function_payload=record,
+                config=self.config,
+                persistence_store=self.persistence_store,
+                function_args=(),
+                function_kwargs={"record": record, **kwargs},
+            ).handle()
+
+        with self._lock:
+            if state.completed:
+                return state.response
+            if state.data_record is not None and not state.claimed:
+                return self._handle_for_status(state.data_record)
+            if state.started:
+                raise IdempotencyAlreadyInProgressError(
+                    f"Execution already in progress with idempotency key: "
+                    f"{self.persistence_store.event_key_jmespath}={state.key_context.idempotency_key}"
+                )
+            state.started = True
+
+        # in progress records whose handler failed are deleted when the batch ends
+        response = self.record_handler(record=record, **kwargs)
+
+        with self._lock:
+            state.completed = True
+            state.response = response
+            self._completed.append(state)
+        return response
+
+    def batch(self, records: Sequence[Any]) -> "BatchIdempotency":
+        """
+        Save in progress records for a batch, to be used as a context manager around its processing
+
+        Parameters
+        ----------
+        records: Sequence[Any]
+            Records of the batch, as they're passed to the record handler or as raw records
+
+        Raises
+        ------
+        IdempotencyKeyError
+            A record doesn't contain an idempotency key, and `raise_on_no_idempotency_key` is set
+        IdempotencyPersistenceLayerError
+            Persistence store failed to get or save records
+        """
+        self._reset()
+        if os.getenv(constants.IDEMPOTENCY_DISABLED_ENV):
+            return self
+
+        for record in records:
+            data = _prepare_data(record)
+            key_context = self.persistence_store.get_key_context(data=data)
+            self._states.setdefault(key_context.idempotency_key, _RecordState(key_context))
+            self._payloads[id(data)] = (data, key_context)
+
+        key_contexts = [state.key_context for state in self._states.values()]
+        try:
+            existing = self.persistence_store.get_records(key_contexts=key_contexts)
+            for idempotency_key, data_record in existing.items():
+                if data_record.status != STATUS_CONSTANTS["EXPIRED"]:
+                    self._states[idempotency_key].data_record = data_record
+
+            unclaimed = [state.key_context for state in self._states.values() if state.data_record is None]
+            claimed = self.persistence_store.save_inprogress_records(key_contexts=unclaimed)
+        except Exception as exc:
+            self._reset()
+            raise IdempotencyPersistenceLayerError("Failed to save in progress records to idempotency store") from exc
+
+        for idempotency_key in claimed:
+            self._states[idempotency_key].claimed = True
+
+        # keys that couldn't be claimed were saved by another execution since they were fetched
+        for state in self._states.values():
+            if state.data_record is None and not state.claimed:
+                state.data_record = DataRecord(
+                    idempotency_key=state.key_context.idempotency_key, status=STATUS_CONSTANTS["INPROGRESS"]
+                )
+
+        logger.debug(f"Claimed {len(claimed)} of {len(self._states)} idempotency keys for batch")
+        return self
+
+    def __enter__(self) -> "BatchIdempotency":
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.save()
+
+    def save(self) -> None:
+        """
+        Save completed records, and delete in progress records whose record handler failed or never ran
+
+        Raises
+        ------
+        IdempotencyPersistenceLayerError
+            Persistence store failed to save or delete records
+        """
+        with self._lock:
+            completed = [(state.key_context, state.response) for state in self._completed]
+            not_completed = [
+                state.key_context for state in self._states.values() if state.claimed and not state.completed
+            ]
+            self._reset()
+
+        try:
+            self.persistence_store.delete_records(key_contexts=not_completed)
+        except Exception as exc:
+            raise IdempotencyPersistenceLayerError("Failed to delete records from idempotency store") from exc
+
+        try:
+            self.persistence_store.save_success_records(results=completed)
+        except Exception as exc:
+            raise IdempotencyPersistenceLayerError(
+                "Failed to update records state to success in idempotency store"
+            ) from exc
+
+    def _get_state(self, record: Any) -> Optional[_RecordState]:
+        if not self._states:
+            return None
+
+        data = _prepare_data(record)
+        payload, key_context = self._payloads.get(id(data), (None, None))
+        if payload is not data or key_context is None:
+            key_context = self.persistence_store.get_key_context(data=data)
+
+        state = self._states.get(key_context.idempotency_key)
+        if state is not None and state.data_record is not None and not state.claimed:
+            self.persistence_store._validate_payload(
+                data=data, data_record=state.data_record, payload_hash=key_context.payload_hash
+            )
+        return state
+
+    def _handle_for_status(self, data_record: DataRecord) -> Any:
+        if data_record.status == STATUS_CONSTANTS["INPROGRESS"]:
+            raise IdempotencyAlreadyInProgressError(
+                f"Execution already in progress with idempotency key: "
+                f"{self.persistence_store.event_key_jmespath}={data_record.idempotency_key}"
+            )
+
+        return data_record.response_json_as_dict()
+
+    def _reset(self) -> None:
+        self._states = {}
+        self._payloads = {}
+        self._completed = []
@@ -0,0 +1,154 @@
+"""
+Local cache of idempotency records
+"""
+import datetime
+import heapq
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    from aws_lambda_powertools.utilities.idempotency.persistence.base import DataRecord
+
+
+class LocalCacheStats(NamedTuple):
+    """
+    Counters of the local cache since it was created, e.g. to be published as metrics
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    items: int
+    size_bytes: int
+
+
+class IdempotencyRecordCache:
+    """
+    Cache of idempotency records bounded by number of items and total size of their response data.
+
+    Least recently used records are evicted first when either bound is exceeded. Records are also removed as soon
+    as they expire, in expiry order, without having to be read first.
+    """
+
+    def __init__(self, max_items: int = 256, max_bytes: Optional[int] = None):
+        """
+
+        Parameters
+        ----------
+        max_items: int, optional
+            Maximum number of records, by default 256
+        max_bytes: int, optional
+            Maximum total size of records response data, by default unbounded
+        """
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._records: "OrderedDict[str, DataRecord]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        # entries are (expiry timestamp, sequence, key), entries whose sequence isn't the key's current one are stale
+        self._expiry_heap: List[Tuple[int, int, str]] = []
+        self._sequences: Dict[str, int] = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional["DataRecord"]:
+        """
+        Get record by idempotency key, and mark it as most recently used
+
+        Parameters
+        ----------
+        key: str
+            Idempotency key
+
+        Returns
+        -------
+        Optional[DataRecord]
+            Cached record, None when missing or expired
+        """
+        with self._lock:
+            self._remove_expired()
+            record = self._records.get(key)
+            if record is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._records.move_to_end(key)
+            return record
+
+    def __setitem__(self, key: str, record: "DataRecord") -> None:
+        size = len(record.response_data or "")
+        with self._lock:
+            self._remove_expired()
+            self._pop(key)
+            if (self.max_bytes is not None and size > self.max_bytes) or record.is_expired:
+                return
+
+            self._records[key] = record
+            self._sizes[key] = size
+            self.size_bytes += size
+            if record.expiry_timestamp:
+                self._sequence += 1
+                self._sequences[key] = self._sequence
+                heapq.heappush(self._expiry_heap, (int(record.expiry_timestamp), self._sequence, key))
+
+            while len(self._records) > self.max_items or (
+                self.max_bytes is not None and self.size_bytes > self.max_bytes
+            ):
+                self._pop(next(iter(self._records)))
+                self.evictions += 1
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            if self._pop(key) is None:
+                raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def stats(self) -> LocalCacheStats:
+        """
+        Snapshot of cache counters
+        """
+        with self._lock:
+            self._remove_expired()
+            return LocalCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                expirations=self.expirations,
+                items=len(self._records),
+                size_bytes=self.size_bytes,
+            )
+
+    def _pop(self, key: str) -> Optional["DataRecord"]:
+        record = self._records.pop(key, None)
+        if record is not None:
+            self.size_bytes -= self._sizes.pop(key)
+            self._sequences.pop(key, None)
+        return record
+
+    def _remove_expired(self) -> None:
+        now = int(datetime.datetime.now().timestamp())
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, sequence, key = heapq.heappop(heap)
+            if self._sequences.get(key) == sequence:
+                self._pop(key)
+                self.expirations += 1
+
+        # stale entries of replaced or deleted records are dropped once they outnumber live ones
+        if len(heap) > 2 * len(self._sequences) + 64:
+            self._expiry_heap = [entry for entry in heap if self._sequences.get(entry[2]) == entry[1]]
+            heapq.heapify(self._expiry_heap)
@@ -0,0 +1,141 @@
+"""
+Compression of responses stored in idempotency records
+"""
+import base64
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, Union
+
+from aws_lambda_powertools.utilities.idempotency.exceptions import IdempotencyPersistenceLayerError
+
+# JSON text never starts with it, so responses stored before compression was enabled remain readable as is
+COMPRESSION_MARKER = "~"
+
+
+class BaseCompressionCodec(ABC):
+    """
+    Abstract Base Class for codecs compressing idempotency record responses.
+
+    Compressed responses are stored as `~<name>:<base64 compressed JSON>`, so `name` identifies the codec needed
+    to read them back, and must not contain a colon.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compress serialized response
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        """
+        Decompress data previously compressed by this codec
+        """
+        raise NotImplementedError
+
+
+class ZlibCodec(BaseCompressionCodec):
+    """
+    Codec compressing responses with zlib, from the standard library
+    """
+
+    name = "zlib"
+
+    def __init__(self, level: int = 6):
+        """
+
+        Parameters
+        ----------
+        level: int, optional
+            Compression level from 0 to 9, by default 6
+        """
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+_codecs: Dict[str, BaseCompressionCodec] = {ZlibCodec.name: ZlibCodec()}
+
+
+def get_codec(codec: Union[str, BaseCompressionCodec]) -> BaseCompressionCodec:
+    """
+    Look up a codec by name, or register a codec instance so responses it compressed can be read back
+
+    Parameters
+    ----------
+    codec: Union[str, BaseCompressionCodec]
+        Codec name, e.g. "zlib", or codec instance
+
+    Returns
+    -------
+    BaseCompressionCodec
+        Codec instance
+    """
+    if isinstance(codec, BaseCompressionCodec):
+        if not codec.name or ":" in codec.name:
+            raise ValueError(f"Invalid compression codec name: {codec.name!r}")
+        _codecs[codec.name] = codec
+        return codec
+
+    try:
+        return _codecs[codec]
+    except KeyError:
+        raise ValueError(f"Unknown compression codec: {codec!r}")
+
+
+def compress_response(response_data: str, codec: BaseCompressionCodec) -> str:
+    """
+    Compress serialized response, keeping it as is when compression doesn't make it smaller
+
+    Parameters
+    ----------
+    response_data: str
+        JSON serialized response
+    codec: BaseCompressionCodec
+        Codec to compress response with
+
+    Returns
+    -------
+    str
+        Compressed response with its format marker, or the original response
+    """
+    compressed = base64.b64encode(codec.compress(response_data.encode("utf-8"))).decode("ascii")
+    compressed = f"{COMPRESSION_MARKER}{codec.name}:{compressed}"
+    return compressed if len(compressed) < len(response_data) else response_data
+
+
+def is_compressed(response_data: str) -> bool:
+    return response_data.startswith(COMPRESSION_MARKER)
+
+
+def decompress_response(response_data: str) -> str:
+    """
+    Decompress response previously compressed with `compress_response`
+
+    Parameters
+    ----------
+    response_data: str
+        Compressed response with its format marker
+
+    Returns
+    -------
+    str
+        JSON serialized response
+
+    Raises
+    ------
+    IdempotencyPersistenceLayerError
+        Codec used to compress response isn't known in this environment
+    """
+    name, _, compressed = response_data[len(COMPRESSION_MARKER) :].partition(":")
+    codec = _codecs.get(name)
+    if codec is None:
+        raise IdempotencyPersistenceLayerError(f"Unable to decompress response stored with unknown codec: {name}")
+    return codec.decompress(base64.b64decode(compressed)).decode("utf-8")
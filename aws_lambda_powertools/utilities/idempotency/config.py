@@ -1,4 +1,7 @@
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Union
+
+if TYPE_CHECKING:
+    from aws_lambda_powertools.utilities.idempotency.compression import BaseCompressionCodec
 
 
 class IdempotencyConfig:
@@ -11,7 +14,10 @@ class IdempotencyConfig:
         expires_after_seconds: int = 60 * 60,  # 1 hour default
         use_local_cache: bool = False,
         local_cache_max_items: int = 256,
-        hash_function: str = "md5",
+        local_cache_max_bytes: Optional[int] = 16 * 1024 * 1024,
+        hash_function: Union[str, Callable[[], Any]] = "md5",
+        response_compression: Optional[Union[str, "BaseCompressionCodec"]] = None,
+        compression_threshold_bytes: int = 1024,
     ):
         """
         Initialize the base persistence layer
@@ -29,9 +35,16 @@ class IdempotencyConfig:
         use_local_cache: bool, optional
             Whether to locally cache idempotency results, by default False
         local_cache_max_items: int, optional
-            Max number of items to store in local cache, by default 1024
-        hash_function: str, optional
-            Function to use for calculating hashes, by default md5.
+            Max number of items to store in local cache, by default 256
+        local_cache_max_bytes: int, optional
+            Max total size of responses to store in local cache, by default 16 MiB, None for no limit
+        hash_function: Union[str, Callable], optional
+            Function to use for calculating hashes, by default md5. Either a hashlib algorithm name such as
+            "blake2b", a xxhash algorithm name such as "xxh3_64" when xxhash is installed, or a hash object constructor
+        response_compression: Union[str, BaseCompressionCodec], optional
+            Codec to compress stored responses with, e.g. "zlib", by default responses aren't compressed
+        compression_threshold_bytes: int, optional
+            Minimum size of a serialized response to compress it, by default 1024
         """
         self.event_key_jmespath = event_key_jmespath
         self.payload_validation_jmespath = payload_validation_jmespath
@@ -40,4 +53,7 @@ class IdempotencyConfig:
         self.expires_after_seconds = expires_after_seconds
         self.use_local_cache = use_local_cache
         self.local_cache_max_items = local_cache_max_items
+        self.local_cache_max_bytes = local_cache_max_bytes
         self.hash_function = hash_function
+        self.response_compression = response_compression
+        self.compression_threshold_bytes = compression_threshold_bytes
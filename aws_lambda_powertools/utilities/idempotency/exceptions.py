@@ -1,6 +1,10 @@
 """
 Idempotency errors
 """
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from aws_lambda_powertools.utilities.idempotency.persistence.base import DataRecord
 
 
 class IdempotencyItemAlreadyExistsError(Exception):
@@ -8,6 +12,16 @@ class IdempotencyItemAlreadyExistsError(Exception):
     Item attempting to be inserted into persistence store already exists and is not expired
     """
 
+    def __init__(self, *args, old_data_record: Optional["DataRecord"] = None):
+        """
+        Parameters
+        ----------
+        old_data_record: DataRecord, optional
+            Existing record, when the persistence store returned it along with the failed write
+        """
+        super().__init__(*args)
+        self.old_data_record = old_data_record
+
 
 class IdempotencyItemNotFoundError(Exception):
     """
@@ -0,0 +1,199 @@
+"""
+Hashing of idempotency keys and payloads
+"""
+import hashlib
+import json
+from typing import Any, Callable, Iterable, List, Set, Union
+
+from aws_lambda_powertools.shared.json_encoder import Encoder
+
+# hashing buffers canonical JSON chunks up to this size, so large payloads never get serialized as a whole.
+# Values estimated to be smaller are serialized along with their siblings, larger containers are walked.
+HASH_BUFFER_SIZE = 64 * 1024
+
+
+def get_hash_function(hash_function: Union[str, Callable[[], Any]]) -> Callable[[], Any]:
+    """
+    Resolve a hash function name to a constructor of hash objects
+
+    Parameters
+    ----------
+    hash_function: Union[str, Callable]
+        Name of a hashlib algorithm, e.g. "md5" or "blake2b", name of a xxhash algorithm, e.g. "xxh3_64",
+        or a callable returning an object with `update` and `hexdigest` methods
+
+    Returns
+    -------
+    Callable
+        Constructor of hash objects
+
+    Raises
+    ------
+    ValueError
+        Hash function isn't available
+    """
+    if callable(hash_function):
+        return hash_function
+
+    if hash_function.startswith("xxh"):
+        try:
+            import xxhash
+        except ImportError:
+            raise ValueError(f"Hash function {hash_function} requires the xxhash package to be installed")
+        constructor = getattr(xxhash, hash_function, None)
+    else:
+        constructor = getattr(hashlib, hash_function, None)
+
+    if constructor is None:
+        raise ValueError(f"Unknown hash function: {hash_function}")
+    return constructor
+
+
+def hash_canonical_json(data: Any, hash_function: Callable[[], Any]) -> str:
+    """
+    Hash the canonical JSON representation of data, without building it as a whole
+
+    Digests are the same as hashing `json.dumps(data, cls=Encoder, sort_keys=True)`. Containers estimated to be
+    larger than the hash buffer are walked, at any depth, and their items are hashed in chunks serialized by the json
+    module, so memory stays bounded by the buffer size instead of the payload size, at close to the json module speed.
+
+    Parameters
+    ----------
+    data: Any
+        JSON serializable data, Decimals included
+    hash_function: Callable
+        Constructor of hash objects
+
+    Returns
+    -------
+    str
+        Hexadecimal digest
+    """
+    hash_object = hash_function()
+    if _is_large(data):
+        _CanonicalJsonHasher(hash_object).feed(data)
+    else:
+        hash_object.update(_dumps(data).encode())
+    return hash_object.hexdigest()
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, cls=Encoder, sort_keys=True)
+
+
+def _is_large(data: Any) -> bool:
+    return isinstance(data, (dict, list, tuple)) and _estimate_size(data) > HASH_BUFFER_SIZE
+
+
+def _estimate_size(data: Any) -> int:
+    """
+    Approximate size of data serialized as JSON, only walked until it exceeds the hash buffer size
+
+    Escaped characters aren't accounted for, so the size of mostly non-ASCII strings is underestimated.
+    """
+    size = 0
+    stack = [data]
+    while stack and size <= HASH_BUFFER_SIZE:
+        value = stack.pop()
+        if isinstance(value, str):
+            size += len(value) + 4
+        elif isinstance(value, dict):
+            size += 2
+            stack.extend(value)
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            size += 2
+            stack.extend(value)
+        else:
+            size += 8
+    return size
+
+
+class _CanonicalJsonHasher:
+    def __init__(self, hash_object: Any):
+        self.hash_object = hash_object
+        self.chunks: List[str] = []
+        self.size = 0
+        self.markers: Set[int] = set()
+
+    def feed(self, data: Union[dict, list, tuple]) -> None:
+        self._walk(data)
+        self._flush()
+
+    def _write(self, chunk: str) -> None:
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        if self.size >= HASH_BUFFER_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.chunks:
+            self.hash_object.update("".join(self.chunks).encode())
+            self.chunks = []
+            self.size = 0
+
+    def _walk(self, data: Union[dict, list, tuple]) -> None:
+        marker = id(data)
+        if marker in self.markers:
+            raise ValueError("Circular reference detected")
+        self.markers.add(marker)
+
+        if isinstance(data, dict):
+            self._write("{")
+            # items are sorted as a whole, so chunks serialized with sort_keys keep the same order
+            self._walk_items(sorted(data.items(), key=lambda item: item[0]), is_dict=True)
+            self._write("}")
+        else:
+            self._write("[")
+            self._walk_items(data, is_dict=False)
+            self._write("]")
+
+        self.markers.remove(marker)
+
+    def _walk_items(self, items: Iterable[Any], is_dict: bool) -> None:
+        separator = ""
+        chunk: List[Any] = []
+        chunk_size = 0
+        for item in items:
+            value = item[1] if is_dict else item
+            if isinstance(value, (dict, list, tuple)):
+                value_size = _estimate_size(value)
+            else:
+                value_size = len(value) if isinstance(value, str) else 8
+
+            if value_size <= HASH_BUFFER_SIZE or not isinstance(value, (dict, list, tuple)):
+                chunk.append(item)
+                chunk_size += value_size
+                if chunk_size >= HASH_BUFFER_SIZE:
+                    separator = self._write_chunk(chunk, separator=separator, is_dict=is_dict)
+                    chunk = []
+                    chunk_size = 0
+                continue
+
+            if chunk:
+                separator = self._write_chunk(chunk, separator=separator, is_dict=is_dict)
+                chunk = []
+                chunk_size = 0
+
+            self._write(separator)
+            separator = ", "
+            if is_dict:
+                self._write(f"{_encode_key(item[0])}: ")
+            self._walk(value)
+
+        if chunk:
+            self._write_chunk(chunk, separator=separator, is_dict=is_dict)
+
+    def _write_chunk(self, chunk: List[Any], separator: str, is_dict: bool) -> str:
+        # serialized chunks are stripped of their brackets to be spliced in
+        self._write(separator + _dumps(dict(chunk) if is_dict else chunk)[1:-1])
+        return ", "
+
+
+def _encode_key(key: Any) -> str:
+    # same conversion as the json module for keys that aren't strings
+    if isinstance(key, float) or key is True or key is False or key is None or isinstance(key, int):
+        key = _dumps(key)
+    elif not isinstance(key, str):
+        raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
+    return _dumps(key)
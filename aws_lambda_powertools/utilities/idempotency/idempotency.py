@@ -2,6 +2,7 @@
 Primary interface for idempotent Lambda functions utility
 """
 import functools
+import inspect
 import logging
 import os
 from typing import Any, Callable, Dict, Optional, cast
@@ -9,9 +10,9 @@ from typing import Any, Callable, Dict, Optional, cast
 from aws_lambda_powertools.middleware_factory import lambda_handler_decorator
 from aws_lambda_powertools.shared import constants
 from aws_lambda_powertools.shared.types import AnyCallableT
-from aws_lambda_powertools.utilities.idempotency.base import IdempotencyHandler
+from aws_lambda_powertools.utilities.idempotency.base import AsyncIdempotencyHandler, IdempotencyHandler
 from aws_lambda_powertools.utilities.idempotency.config import IdempotencyConfig
-from aws_lambda_powertools.utilities.idempotency.persistence.base import BasePersistenceLayer
+from aws_lambda_powertools.utilities.idempotency.persistence.base import AsyncBasePersistenceLayer, BasePersistenceLayer
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
 logger = logging.getLogger(__name__)
@@ -29,6 +30,10 @@ def idempotent(
     """
     Decorator to handle idempotency
 
+    Coroutine handlers are supported, and must be used with an asynchronous persistence layer, e.g.
+    AsyncDynamoDBPersistenceLayer, to avoid blocking the event loop. Synchronous persistence layers are called in the
+    event loop default executor instead.
+
     Parameters
     ----------
     handler: Callable
@@ -61,9 +66,13 @@ def idempotent(
     if os.getenv(constants.IDEMPOTENCY_DISABLED_ENV):
         return handler(event, context)
 
+    is_coroutine = inspect.iscoroutinefunction(handler)
+    _validate_persistence_store(persistence_store, is_coroutine=is_coroutine)
     config = config or IdempotencyConfig()
     args = event, context
-    idempotency_handler = IdempotencyHandler(
+    # coroutine handlers get a coroutine back, to be awaited by their caller
+    handler_class = AsyncIdempotencyHandler if is_coroutine else IdempotencyHandler
+    idempotency_handler = handler_class(
         function=handler,
         function_payload=event,
         config=config,
@@ -85,6 +94,8 @@ def idempotent_function(
     """
     Decorator to handle idempotency of any function
 
+    Coroutine functions are supported, see `idempotent` for persistence layers to use with them.
+
     Parameters
     ----------
     function: Callable
@@ -124,23 +135,37 @@ def idempotent_function(
         )
 
     config = config or IdempotencyConfig()
+    is_coroutine = inspect.iscoroutinefunction(function)
+    _validate_persistence_store(persistence_store, is_coroutine=is_coroutine)
+
+    if is_coroutine:
+
+        @functools.wraps(function)
+        async def async_decorate(*args, **kwargs):
+            if os.getenv(constants.IDEMPOTENCY_DISABLED_ENV):
+                return await function(*args, **kwargs)
+
+            idempotency_handler = AsyncIdempotencyHandler(
+                function=function,
+                function_payload=_get_payload(kwargs, data_keyword_argument),
+                config=config,
+                persistence_store=persistence_store,
+                function_args=args,
+                function_kwargs=kwargs,
+            )
+
+            return await idempotency_handler.handle()
+
+        return cast(AnyCallableT, async_decorate)
 
     @functools.wraps(function)
     def decorate(*args, **kwargs):
         if os.getenv(constants.IDEMPOTENCY_DISABLED_ENV):
             return function(*args, **kwargs)
 
-        payload = kwargs.get(data_keyword_argument)
-
-        if not payload:
-            raise RuntimeError(
-                f"Unable to extract '{data_keyword_argument}' from keyword arguments."
-                f" Ensure this exists in your function's signature as well as the caller used it as a keyword argument"
-            )
-
         idempotency_handler = IdempotencyHandler(
             function=function,
-            function_payload=payload,
+            function_payload=_get_payload(kwargs, data_keyword_argument),
             config=config,
             persistence_store=persistence_store,
             function_args=args,
@@ -150,3 +175,19 @@ def idempotent_function(
         return idempotency_handler.handle()
 
     return cast(AnyCallableT, decorate)
+
+
+def _get_payload(kwargs: Dict[str, Any], data_keyword_argument: str) -> Any:
+    payload = kwargs.get(data_keyword_argument)
+
+    if not payload:
+        raise RuntimeError(
+            f"Unable to extract '{data_keyword_argument}' from keyword arguments."
+            f" Ensure this exists in your function's signature as well as the caller used it as a keyword argument"
+        )
+    return payload
+
+
+def _validate_persistence_store(persistence_store: BasePersistenceLayer, is_coroutine: bool) -> None:
+    if not is_coroutine and isinstance(persistence_store, AsyncBasePersistenceLayer):
+        raise persistence_store._synchronous_call_error()
@@ -2,27 +2,35 @@
 Persistence layers supporting idempotency
 """
 import datetime
-import hashlib
 import json
 import logging
 import os
 import warnings
 from abc import ABC, abstractmethod
 from types import MappingProxyType
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 import jmespath
 
 from aws_lambda_powertools.shared import constants
-from aws_lambda_powertools.shared.cache_dict import LRUDict
 from aws_lambda_powertools.shared.json_encoder import Encoder
+from aws_lambda_powertools.utilities.idempotency.cache import IdempotencyRecordCache, LocalCacheStats
+from aws_lambda_powertools.utilities.idempotency.compression import (
+    BaseCompressionCodec,
+    compress_response,
+    decompress_response,
+    get_codec,
+    is_compressed,
+)
 from aws_lambda_powertools.utilities.idempotency.config import IdempotencyConfig
 from aws_lambda_powertools.utilities.idempotency.exceptions import (
     IdempotencyInvalidStatusError,
     IdempotencyItemAlreadyExistsError,
+    IdempotencyItemNotFoundError,
     IdempotencyKeyError,
     IdempotencyValidationError,
 )
+from aws_lambda_powertools.utilities.idempotency.hashing import get_hash_function, hash_canonical_json
 from aws_lambda_powertools.utilities.jmespath_utils import PowertoolsFunctions
 
 logger = logging.getLogger(__name__)
@@ -56,13 +64,14 @@ class DataRecord:
         payload_hash: str, optional
             hashed representation of payload
         response_data: str, optional
-            response data from previous executions using the record
+            response data from previous executions using the record, either JSON or compressed JSON
         """
         self.idempotency_key = idempotency_key
         self.payload_hash = payload_hash
         self.expiry_timestamp = expiry_timestamp
         self._status = status
         self.response_data = response_data
+        self._response_json: Optional[str] = None
 
     @property
     def is_expired(self) -> bool:
@@ -101,7 +110,36 @@ class DataRecord:
         Optional[dict]
             previous response data deserialized
         """
-        return json.loads(self.response_data) if self.response_data else None
+        if not self.response_data:
+            return None
+
+        # compressed responses are only decompressed when they're needed, and once per record
+        if self._response_json is None:
+            response_data = self.response_data
+            self._response_json = decompress_response(response_data) if is_compressed(response_data) else response_data
+        return json.loads(self._response_json)
+
+
+class IdempotencyKeyContext:
+    """
+    Hashed idempotency key and payload of a single invocation.
+
+    The idempotency handler computes it once, and passes it to every persistence layer call for that invocation,
+    so the payload is only searched and hashed once.
+    """
+
+    def __init__(self, idempotency_key: str, payload_hash: str = "") -> None:
+        """
+
+        Parameters
+        ----------
+        idempotency_key: str
+            hashed representation of the idempotent data
+        payload_hash: str, optional
+            hashed representation of payload, empty when payload validation is disabled
+        """
+        self.idempotency_key = idempotency_key
+        self.payload_hash = payload_hash
 
 
 class BasePersistenceLayer(ABC):
@@ -122,6 +160,8 @@ class BasePersistenceLayer(ABC):
         self.expires_after_seconds: int = 60 * 60  # 1 hour default
         self.use_local_cache = False
         self.hash_function = None
+        self.compression_codec: Optional[BaseCompressionCodec] = None
+        self.compression_threshold_bytes = 1024
 
     def configure(self, config: IdempotencyConfig, function_name: Optional[str] = None) -> None:
         """
@@ -154,8 +194,41 @@ class BasePersistenceLayer(ABC):
         self.expires_after_seconds = config.expires_after_seconds
         self.use_local_cache = config.use_local_cache
         if self.use_local_cache:
-            self._cache = LRUDict(max_items=config.local_cache_max_items)
-        self.hash_function = getattr(hashlib, config.hash_function)
+            self._cache = IdempotencyRecordCache(
+                max_items=config.local_cache_max_items, max_bytes=config.local_cache_max_bytes
+            )
+        self.hash_function = get_hash_function(config.hash_function)
+        if config.response_compression:
+            self.compression_codec = get_codec(config.response_compression)
+        self.compression_threshold_bytes = config.compression_threshold_bytes
+
+    @property
+    def local_cache_stats(self) -> Optional[LocalCacheStats]:
+        """
+        Hit, miss, and eviction counters of the local cache since it was created, None when it's disabled
+        """
+        if not self.use_local_cache:
+            return None
+        return self._cache.stats
+
+    def get_key_context(self, data: Dict[str, Any]) -> IdempotencyKeyContext:
+        """
+        Extract and hash the idempotency key and payload, to be reused by every call for the same invocation
+
+        Parameters
+        ----------
+        data: Dict[str, Any]
+            Payload
+
+        Returns
+        -------
+        IdempotencyKeyContext
+            Hashed idempotency key and payload
+        """
+        return IdempotencyKeyContext(
+            idempotency_key=self._get_hashed_idempotency_key(data=data),
+            payload_hash=self._get_hashed_payload(data=data),
+        )
 
     def _get_hashed_idempotency_key(self, data: Dict[str, Any]) -> str:
         """
@@ -224,10 +297,11 @@ class BasePersistenceLayer(ABC):
             Hashed representation of the provided data
 
         """
-        hashed_data = self.hash_function(json.dumps(data, cls=Encoder, sort_keys=True).encode())
-        return hashed_data.hexdigest()
+        return hash_canonical_json(data, hash_function=self.hash_function)
 
-    def _validate_payload(self, data: Dict[str, Any], data_record: DataRecord) -> None:
+    def _validate_payload(
+        self, data: Dict[str, Any], data_record: DataRecord, payload_hash: Optional[str] = None
+    ) -> None:
         """
         Validate that the hashed payload matches data provided and stored data record
 
@@ -237,6 +311,8 @@ class BasePersistenceLayer(ABC):
             Payload
         data_record: DataRecord
             DataRecord instance
+        payload_hash: str, optional
+            Hashed payload when already computed for this invocation
 
         Raises
         ----------
@@ -245,10 +321,29 @@ class BasePersistenceLayer(ABC):
 
         """
         if self.payload_validation_enabled:
-            data_hash = self._get_hashed_payload(data=data)
+            data_hash = payload_hash if payload_hash is not None else self._get_hashed_payload(data=data)
             if data_record.payload_hash != data_hash:
                 raise IdempotencyValidationError("Payload does not match stored record for this event key")
 
+    def _serialize_response(self, result: Any) -> str:
+        """
+        Serialize function response to JSON, compressed when a codec is configured and it's large enough
+
+        Parameters
+        ----------
+        result: Any
+            The response from function
+
+        Returns
+        -------
+        str
+            Serialized response
+        """
+        response_data = json.dumps(result, cls=Encoder, sort_keys=True)
+        if self.compression_codec is None or len(response_data) < self.compression_threshold_bytes:
+            return response_data
+        return compress_response(response_data, codec=self.compression_codec)
+
     def _get_expiry_timestamp(self) -> int:
         """
 
@@ -287,12 +382,8 @@ class BasePersistenceLayer(ABC):
     def _retrieve_from_cache(self, idempotency_key: str):
         if not self.use_local_cache:
             return
-        cached_record = self._cache.get(key=idempotency_key)
-        if cached_record:
-            if not cached_record.is_expired:
-                return cached_record
-            logger.debug(f"Removing expired local cache record for idempotency key: {idempotency_key}")
-            self._delete_from_cache(idempotency_key=idempotency_key)
+        # expired records are removed by the cache itself
+        return self._cache.get(key=idempotency_key)
 
     def _delete_from_cache(self, idempotency_key: str):
         if not self.use_local_cache:
@@ -300,7 +391,9 @@ class BasePersistenceLayer(ABC):
         if idempotency_key in self._cache:
             del self._cache[idempotency_key]
 
-    def save_success(self, data: Dict[str, Any], result: dict) -> None:
+    def save_success(
+        self, data: Dict[str, Any], result: dict, key_context: Optional[IdempotencyKeyContext] = None
+    ) -> None:
         """
         Save record of function's execution completing successfully
 
@@ -310,25 +403,15 @@ class BasePersistenceLayer(ABC):
             Payload
         result: dict
             The response from function
+        key_context: IdempotencyKeyContext, optional
+            Hashed idempotency key and payload, computed from data when not provided
         """
-        response_data = json.dumps(result, cls=Encoder, sort_keys=True)
-
-        data_record = DataRecord(
-            idempotency_key=self._get_hashed_idempotency_key(data=data),
-            status=STATUS_CONSTANTS["COMPLETED"],
-            expiry_timestamp=self._get_expiry_timestamp(),
-            response_data=response_data,
-            payload_hash=self._get_hashed_payload(data=data),
-        )
-        logger.debug(
-            f"Function successfully executed. Saving record to persistence store with "
-            f"idempotency key: {data_record.idempotency_key}"
-        )
+        data_record = self._get_success_record(data=data, result=result, key_context=key_context)
         self._update_record(data_record=data_record)
 
         self._save_to_cache(data_record=data_record)
 
-    def save_inprogress(self, data: Dict[str, Any]) -> None:
+    def save_inprogress(self, data: Dict[str, Any], key_context: Optional[IdempotencyKeyContext] = None) -> None:
         """
         Save record of function's execution being in progress
 
@@ -336,22 +419,15 @@ class BasePersistenceLayer(ABC):
         ----------
         data: Dict[str, Any]
             Payload
+        key_context: IdempotencyKeyContext, optional
+            Hashed idempotency key and payload, computed from data when not provided
         """
-        data_record = DataRecord(
-            idempotency_key=self._get_hashed_idempotency_key(data=data),
-            status=STATUS_CONSTANTS["INPROGRESS"],
-            expiry_timestamp=self._get_expiry_timestamp(),
-            payload_hash=self._get_hashed_payload(data=data),
-        )
-
-        logger.debug(f"Saving in progress record for idempotency key: {data_record.idempotency_key}")
-
-        if self._retrieve_from_cache(idempotency_key=data_record.idempotency_key):
-            raise IdempotencyItemAlreadyExistsError
-
+        data_record = self._get_inprogress_record(data=data, key_context=key_context)
         self._put_record(data_record=data_record)
 
-    def delete_record(self, data: Dict[str, Any], exception: Exception):
+    def delete_record(
+        self, data: Dict[str, Any], exception: Exception, key_context: Optional[IdempotencyKeyContext] = None
+    ):
         """
         Delete record from the persistence store
 
@@ -361,18 +437,20 @@ class BasePersistenceLayer(ABC):
             Payload
         exception
             The exception raised by the function
+        key_context: IdempotencyKeyContext, optional
+            Hashed idempotency key and payload, computed from data when not provided
         """
-        data_record = DataRecord(idempotency_key=self._get_hashed_idempotency_key(data=data))
-
-        logger.debug(
-            f"Function raised an exception ({type(exception).__name__}). Clearing in progress record in persistence "
-            f"store for idempotency key: {data_record.idempotency_key}"
-        )
+        data_record = self._get_deleted_record(data=data, exception=exception, key_context=key_context)
         self._delete_record(data_record=data_record)
 
         self._delete_from_cache(idempotency_key=data_record.idempotency_key)
 
-    def get_record(self, data: Dict[str, Any]) -> DataRecord:
+    def get_record(
+        self,
+        data: Dict[str, Any],
+        key_context: Optional[IdempotencyKeyContext] = None,
+        existing_record: Optional[DataRecord] = None,
+    ) -> DataRecord:
         """
         Retrieve idempotency key for data provided, fetch from persistence store, and convert to DataRecord.
 
@@ -380,6 +458,11 @@ class BasePersistenceLayer(ABC):
         ----------
         data: Dict[str, Any]
             Payload
+        key_context: IdempotencyKeyContext, optional
+            Hashed idempotency key and payload, computed from data when not provided
+        existing_record: DataRecord, optional
+            Record already returned by the persistence store, e.g. along with a failed conditional write, so it
+            isn't fetched again
 
         Returns
         -------
@@ -393,21 +476,284 @@ class BasePersistenceLayer(ABC):
         IdempotencyValidationError
             Payload doesn't match the stored record for the given idempotency key
         """
+        idempotency_key, payload_hash = self._get_record_lookup(data=data, key_context=key_context)
+
+        if existing_record is None:
+            cached_record = self._get_validated_cached_record(
+                data=data, idempotency_key=idempotency_key, payload_hash=payload_hash
+            )
+            if cached_record:
+                return cached_record
+            existing_record = self._get_record(idempotency_key=idempotency_key)
+        else:
+            logger.debug(f"Reusing idempotency record returned by persistence store for key: {idempotency_key}")
+
+        return self._accept_record(data=data, data_record=existing_record, payload_hash=payload_hash)
+
+    def _get_success_record(
+        self, data: Dict[str, Any], result: Any, key_context: Optional[IdempotencyKeyContext]
+    ) -> DataRecord:
+        response_data = self._serialize_response(result=result)
+        key_context = key_context or self.get_key_context(data=data)
+
+        data_record = DataRecord(
+            idempotency_key=key_context.idempotency_key,
+            status=STATUS_CONSTANTS["COMPLETED"],
+            expiry_timestamp=self._get_expiry_timestamp(),
+            response_data=response_data,
+            payload_hash=key_context.payload_hash,
+        )
+        logger.debug(
+            f"Function successfully executed. Saving record to persistence store with "
+            f"idempotency key: {data_record.idempotency_key}"
+        )
+        return data_record
+
+    def _get_inprogress_record(self, data: Dict[str, Any], key_context: Optional[IdempotencyKeyContext]) -> DataRecord:
+        """
+        Build the in progress record to put, raising ItemAlreadyExists when a completed record is cached already
+        """
+        key_context = key_context or self.get_key_context(data=data)
+        data_record = DataRecord(
+            idempotency_key=key_context.idempotency_key,
+            status=STATUS_CONSTANTS["INPROGRESS"],
+            expiry_timestamp=self._get_expiry_timestamp(),
+            payload_hash=key_context.payload_hash,
+        )
 
-        idempotency_key = self._get_hashed_idempotency_key(data=data)
+        logger.debug(f"Saving in progress record for idempotency key: {data_record.idempotency_key}")
+
+        cached_record = self._retrieve_from_cache(idempotency_key=data_record.idempotency_key)
+        if cached_record:
+            raise IdempotencyItemAlreadyExistsError(old_data_record=cached_record)
+
+        return data_record
 
+    def _get_deleted_record(
+        self, data: Dict[str, Any], exception: Exception, key_context: Optional[IdempotencyKeyContext]
+    ) -> DataRecord:
+        idempotency_key = key_context.idempotency_key if key_context else self._get_hashed_idempotency_key(data=data)
+        data_record = DataRecord(idempotency_key=idempotency_key)
+
+        logger.debug(
+            f"Function raised an exception ({type(exception).__name__}). Clearing in progress record in persistence "
+            f"store for idempotency key: {data_record.idempotency_key}"
+        )
+        return data_record
+
+    def _get_record_lookup(
+        self, data: Dict[str, Any], key_context: Optional[IdempotencyKeyContext]
+    ) -> Tuple[str, Optional[str]]:
+        idempotency_key = key_context.idempotency_key if key_context else self._get_hashed_idempotency_key(data=data)
+        payload_hash = key_context.payload_hash if key_context else None
+        return idempotency_key, payload_hash
+
+    def _get_validated_cached_record(
+        self, data: Dict[str, Any], idempotency_key: str, payload_hash: Optional[str]
+    ) -> Optional[DataRecord]:
         cached_record = self._retrieve_from_cache(idempotency_key=idempotency_key)
         if cached_record:
             logger.debug(f"Idempotency record found in cache with idempotency key: {idempotency_key}")
-            self._validate_payload(data=data, data_record=cached_record)
-            return cached_record
+            self._validate_payload(data=data, data_record=cached_record, payload_hash=payload_hash)
+        return cached_record
+
+    def _accept_record(self, data: Dict[str, Any], data_record: DataRecord, payload_hash: Optional[str]) -> DataRecord:
+        """
+        Cache record returned by the persistence store, and validate it against the payload
+        """
+        self._save_to_cache(data_record=data_record)
+
+        self._validate_payload(data=data, data_record=data_record, payload_hash=payload_hash)
+        return data_record
+
+    def get_records(self, key_contexts: Sequence[IdempotencyKeyContext]) -> Dict[str, DataRecord]:
+        """
+        Retrieve existing records for many idempotency keys at once, from local cache first.
 
-        record = self._get_record(idempotency_key=idempotency_key)
+        Payload validation is left to the caller, as each record is validated against its own payload.
 
-        self._save_to_cache(data_record=record)
+        Parameters
+        ----------
+        key_contexts: Sequence[IdempotencyKeyContext]
+            Hashed idempotency keys and payloads
+
+        Returns
+        -------
+        Dict[str, DataRecord]
+            DataRecord found in persistence store by idempotency key, keys without a record are left out
+        """
+        records: Dict[str, DataRecord] = {}
+        missing: List[str] = []
+        for key_context in key_contexts:
+            cached_record = self._retrieve_from_cache(idempotency_key=key_context.idempotency_key)
+            if cached_record:
+                records[key_context.idempotency_key] = cached_record
+            else:
+                missing.append(key_context.idempotency_key)
 
-        self._validate_payload(data=data, data_record=record)
-        return record
+        if missing:
+            logger.debug(f"Fetching {len(missing)} idempotency records from persistence store")
+            for idempotency_key, record in self._get_records(idempotency_keys=missing).items():
+                self._save_to_cache(data_record=record)
+                records[idempotency_key] = record
+
+        return records
+
+    def save_inprogress_records(self, key_contexts: Sequence[IdempotencyKeyContext]) -> Set[str]:
+        """
+        Save records of many function executions being in progress at once
+
+        Parameters
+        ----------
+        key_contexts: Sequence[IdempotencyKeyContext]
+            Hashed idempotency keys and payloads, keys must be unique
+
+        Returns
+        -------
+        Set[str]
+            Idempotency keys claimed, keys with an existing non-expired record are left out
+        """
+        expiry_timestamp = self._get_expiry_timestamp()
+        data_records = [
+            DataRecord(
+                idempotency_key=key_context.idempotency_key,
+                status=STATUS_CONSTANTS["INPROGRESS"],
+                expiry_timestamp=expiry_timestamp,
+                payload_hash=key_context.payload_hash,
+            )
+            for key_context in key_contexts
+            if not self._retrieve_from_cache(idempotency_key=key_context.idempotency_key)
+        ]
+        if not data_records:
+            return set()
+
+        logger.debug(f"Saving {len(data_records)} in progress records")
+        return {data_record.idempotency_key for data_record in self._put_records(data_records=data_records)}
+
+    def save_success_records(self, results: Sequence[Tuple[IdempotencyKeyContext, Any]]) -> None:
+        """
+        Save records of many function executions completing successfully at once
+
+        Parameters
+        ----------
+        results: Sequence[Tuple[IdempotencyKeyContext, Any]]
+            Hashed idempotency key and payload, along with the response from function
+        """
+        if not results:
+            return
+
+        expiry_timestamp = self._get_expiry_timestamp()
+        data_records = [
+            DataRecord(
+                idempotency_key=key_context.idempotency_key,
+                status=STATUS_CONSTANTS["COMPLETED"],
+                expiry_timestamp=expiry_timestamp,
+                response_data=self._serialize_response(result=result),
+                payload_hash=key_context.payload_hash,
+            )
+            for key_context, result in results
+        ]
+        logger.debug(f"Functions successfully executed. Saving {len(data_records)} records to persistence store")
+        self._update_records(data_records=data_records)
+
+        for data_record in data_records:
+            self._save_to_cache(data_record=data_record)
+
+    def delete_records(self, key_contexts: Sequence[IdempotencyKeyContext]) -> None:
+        """
+        Delete many records from the persistence store at once, e.g. after their functions raised an exception
+
+        Parameters
+        ----------
+        key_contexts: Sequence[IdempotencyKeyContext]
+            Hashed idempotency keys and payloads
+        """
+        if not key_contexts:
+            return
+
+        data_records = [DataRecord(idempotency_key=key_context.idempotency_key) for key_context in key_contexts]
+        logger.debug(f"Clearing {len(data_records)} in progress records in persistence store")
+        self._delete_records(data_records=data_records)
+
+        for data_record in data_records:
+            self._delete_from_cache(idempotency_key=data_record.idempotency_key)
+
+    def _get_records(self, idempotency_keys: List[str]) -> Dict[str, DataRecord]:
+        """
+        Retrieve items from persistence store for many idempotency keys.
+
+        Defaults to one `_get_record` call per key, persistence layers supporting batch reads should override it.
+
+        Parameters
+        ----------
+        idempotency_keys: List[str]
+            Idempotency keys to retrieve
+
+        Returns
+        -------
+        Dict[str, DataRecord]
+            DataRecord by idempotency key, keys without a record are left out
+        """
+        records = {}
+        for idempotency_key in idempotency_keys:
+            try:
+                records[idempotency_key] = self._get_record(idempotency_key=idempotency_key)
+            except IdempotencyItemNotFoundError:
+                continue
+        return records
+
+    def _put_records(self, data_records: List[DataRecord]) -> List[DataRecord]:
+        """
+        Add many DataRecords to persistence store, skipping those whose key already has a non-expired entry.
+
+        Defaults to one `_put_record` call per record, persistence layers supporting batch writes should override it.
+
+        Parameters
+        ----------
+        data_records: List[DataRecord]
+            DataRecord instances, with unique idempotency keys
+
+        Returns
+        -------
+        List[DataRecord]
+            DataRecord instances that were added
+        """
+        added = []
+        for data_record in data_records:
+            try:
+                self._put_record(data_record=data_record)
+            except IdempotencyItemAlreadyExistsError:
+                continue
+            added.append(data_record)
+        return added
+
+    def _update_records(self, data_records: List[DataRecord]) -> None:
+        """
+        Update many items in persistence store.
+
+        Defaults to one `_update_record` call per record, persistence layers supporting batch writes should override it.
+
+        Parameters
+        ----------
+        data_records: List[DataRecord]
+            DataRecord instances
+        """
+        for data_record in data_records:
+            self._update_record(data_record=data_record)
+
+    def _delete_records(self, data_records: List[DataRecord]) -> None:
+        """
+        Remove many items from persistence store.
+
+        Defaults to one `_delete_record` call per record, persistence layers supporting batch writes should override it.
+
+        Parameters
+        ----------
+        data_records: List[DataRecord]
+            DataRecord instances
+        """
+        for data_record in data_records:
+            self._delete_record(data_record=data_record)
 
     @abstractmethod
     def _get_record(self, idempotency_key) -> DataRecord:
@@ -434,7 +780,7 @@ class BasePersistenceLayer(ABC):
     def _put_record(self, data_record: DataRecord) -> None:
         """
         Add a DataRecord to persistence store if it does not already exist with that key. Raise ItemAlreadyExists
-        if a non-expired entry already exists.
+        if a non-expired entry already exists, along with the existing record when the persistence store returns it.
 
         Parameters
         ----------
@@ -468,3 +814,130 @@ class BasePersistenceLayer(ABC):
         """
 
         raise NotImplementedError
+
+
+class AsyncBasePersistenceLayer(BasePersistenceLayer):
+    """
+    Abstract Base Class for persistence layers whose I/O is asynchronous, used by coroutine functions decorated with
+    `idempotent` or `idempotent_function`, so idempotency checks don't block the event loop.
+
+    Key hashing, payload validation, and the local cache are the same as BasePersistenceLayer. Only the coroutine
+    counterparts of `_get_record`, `_put_record`, `_update_record`, and `_delete_record` must be implemented, the
+    synchronous methods aren't available.
+    """
+
+    async def save_success_async(
+        self, data: Dict[str, Any], result: dict, key_context: Optional[IdempotencyKeyContext] = None
+    ) -> None:
+        """
+        Save record of function's execution completing successfully, see `save_success`
+        """
+        data_record = self._get_success_record(data=data, result=result, key_context=key_context)
+        await self._update_record_async(data_record=data_record)
+
+        self._save_to_cache(data_record=data_record)
+
+    async def save_inprogress_async(
+        self, data: Dict[str, Any], key_context: Optional[IdempotencyKeyContext] = None
+    ) -> None:
+        """
+        Save record of function's execution being in progress, see `save_inprogress`
+        """
+        data_record = self._get_inprogress_record(data=data, key_context=key_context)
+        await self._put_record_async(data_record=data_record)
+
+    async def delete_record_async(
+        self, data: Dict[str, Any], exception: Exception, key_context: Optional[IdempotencyKeyContext] = None
+    ) -> None:
+        """
+        Delete record from the persistence store, see `delete_record`
+        """
+        data_record = self._get_deleted_record(data=data, exception=exception, key_context=key_context)
+        await self._delete_record_async(data_record=data_record)
+
+        self._delete_from_cache(idempotency_key=data_record.idempotency_key)
+
+    async def get_record_async(
+        self,
+        data: Dict[str, Any],
+        key_context: Optional[IdempotencyKeyContext] = None,
+        existing_record: Optional[DataRecord] = None,
+    ) -> DataRecord:
+        """
+        Retrieve idempotency key for data provided, fetch from persistence store, and convert to DataRecord,
+        see `get_record`
+        """
+        idempotency_key, payload_hash = self._get_record_lookup(data=data, key_context=key_context)
+
+        if existing_record is None:
+            cached_record = self._get_validated_cached_record(
+                data=data, idempotency_key=idempotency_key, payload_hash=payload_hash
+            )
+            if cached_record:
+                return cached_record
+            existing_record = await self._get_record_async(idempotency_key=idempotency_key)
+        else:
+            logger.debug(f"Reusing idempotency record returned by persistence store for key: {idempotency_key}")
+
+        return self._accept_record(data=data, data_record=existing_record, payload_hash=payload_hash)
+
+    @abstractmethod
+    async def _get_record_async(self, idempotency_key: str) -> DataRecord:
+        """
+        Retrieve item from persistence store using idempotency key and return it as a DataRecord instance.
+
+        Raises
+        ------
+        IdempotencyItemNotFoundError
+            Exception raised if no record exists in persistence store with the idempotency key
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _put_record_async(self, data_record: DataRecord) -> None:
+        """
+        Add a DataRecord to persistence store if it does not already exist with that key. Raise ItemAlreadyExists
+        if a non-expired entry already exists, along with the existing record when the persistence store returns it.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _update_record_async(self, data_record: DataRecord) -> None:
+        """
+        Update item in persistence store
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _delete_record_async(self, data_record: DataRecord) -> None:
+        """
+        Remove item from persistence store
+        """
+        raise NotImplementedError
+
+    def _synchronous_call_error(self) -> TypeError:
+        return TypeError(f"{type(self).__name__} is asynchronous, it can only be used by coroutine functions")
+
+    def _get_record(self, idempotency_key) -> DataRecord:
+        raise self._synchronous_call_error()
+
+    def _put_record(self, data_record: DataRecord) -> None:
+        raise self._synchronous_call_error()
+
+    def _update_record(self, data_record: DataRecord) -> None:
+        raise self._synchronous_call_error()
+
+    def _delete_record(self, data_record: DataRecord) -> None:
+        raise self._synchronous_call_error()
+
+    def _get_records(self, idempotency_keys: List[str]) -> Dict[str, DataRecord]:
+        raise self._synchronous_call_error()
+
+    def _put_records(self, data_records: List[DataRecord]) -> List[DataRecord]:
+        raise self._synchronous_call_error()
+
+    def _update_records(self, data_records: List[DataRecord]) -> None:
+        raise self._synchronous_call_error()
+
+    def _delete_records(self, data_records: List[DataRecord]) -> None:
+        raise self._synchronous_call_error()
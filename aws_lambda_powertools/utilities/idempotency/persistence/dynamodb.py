@@ -1,7 +1,9 @@
+import asyncio
 import datetime
 import logging
 import os
-from typing import Any, Dict, Optional
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TypeVar
 
 import boto3
 from botocore.config import Config
@@ -12,10 +14,17 @@ from aws_lambda_powertools.utilities.idempotency.exceptions import (
     IdempotencyItemAlreadyExistsError,
     IdempotencyItemNotFoundError,
 )
-from aws_lambda_powertools.utilities.idempotency.persistence.base import DataRecord
+from aws_lambda_powertools.utilities.idempotency.persistence.base import AsyncBasePersistenceLayer, DataRecord
 
 logger = logging.getLogger(__name__)
 
+# DynamoDB limits for BatchGetItem keys, TransactWriteItems actions, and BatchWriteItem requests in a single call
+BATCH_GET_MAX_KEYS = 100
+TRANSACT_WRITE_MAX_ITEMS = 100
+BATCH_WRITE_MAX_ITEMS = 25
+
+T = TypeVar("T")
+
 
 class DynamoDBPersistenceLayer(BasePersistenceLayer):
     def __init__(
@@ -109,6 +118,25 @@ class DynamoDBPersistenceLayer(BasePersistenceLayer):
         """
         self._table = table
 
+    @property
+    def _client(self):
+        """
+        Client used for every request, the table resource client serializes attribute values on its own
+        """
+        return self.table.meta.client
+
+    def _serialize(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert item, key, or expression attribute values to the format expected by the client
+        """
+        return values
+
+    def _deserialize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert item or key returned by the client to python types
+        """
+        return item
+
     def _get_key(self, idempotency_key: str) -> dict:
         if self.sort_key_attr:
             return {self.key_attr: self.static_pk_value, self.sort_key_attr: idempotency_key}
@@ -130,7 +158,7 @@ class DynamoDBPersistenceLayer(BasePersistenceLayer):
 
         """
         return DataRecord(
-            idempotency_key=item[self.key_attr],
+            idempotency_key=item[self.sort_key_attr or self.key_attr],
             status=item[self.status_attr],
             expiry_timestamp=item[self.expiry_attr],
             response_data=item.get(self.data_attr),
@@ -138,15 +166,34 @@ class DynamoDBPersistenceLayer(BasePersistenceLayer):
         )
 
     def _get_record(self, idempotency_key) -> DataRecord:
-        response = self.table.get_item(Key=self._get_key(idempotency_key), ConsistentRead=True)
+        response = self._client.get_item(
+            TableName=self.table_name, Key=self._serialize(self._get_key(idempotency_key)), ConsistentRead=True
+        )
 
         try:
             item = response["Item"]
         except KeyError:
             raise IdempotencyItemNotFoundError
-        return self._item_to_data_record(item)
+        return self._item_to_data_record(self._deserialize(item))
 
     def _put_record(self, data_record: DataRecord) -> None:
+        try:
+            logger.debug(f"Putting record for idempotency key: {data_record.idempotency_key}")
+            self._client.put_item(
+                TableName=self.table_name,
+                **self._get_put_params(data_record=data_record),
+                **_get_return_old_item_params(self._client),
+            )
+        except self._client.exceptions.ConditionalCheckFailedException as exc:
+            logger.debug(f"Failed to put record for already existing idempotency key: {data_record.idempotency_key}")
+            raise IdempotencyItemAlreadyExistsError(old_data_record=self._get_old_data_record(exc.response))
+
+    def _get_old_data_record(self, error_response: Dict[str, Any]) -> Optional[DataRecord]:
+        # items in error responses are left as attribute values, even by the table resource client
+        old_item = error_response.get("Item")
+        return self._item_to_data_record(_deserialize_attribute_values(old_item)) if old_item else None
+
+    def _get_put_params(self, data_record: DataRecord) -> Dict[str, Any]:
         item = {
             **self._get_key(data_record.idempotency_key),
             self.expiry_attr: data_record.expiry_timestamp,
@@ -157,20 +204,18 @@ class DynamoDBPersistenceLayer(BasePersistenceLayer):
             item[self.validation_key_attr] = data_record.payload_hash
 
         now = datetime.datetime.now()
-        try:
-            logger.debug(f"Putting record for idempotency key: {data_record.idempotency_key}")
-            self.table.put_item(
-                Item=item,
-                ConditionExpression="attribute_not_exists(#id) OR #now < :now",
-                ExpressionAttributeNames={"#id": self.key_attr, "#now": self.expiry_attr},
-                ExpressionAttributeValues={":now": int(now.timestamp())},
-            )
-        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
-            logger.debug(f"Failed to put record for already existing idempotency key: {data_record.idempotency_key}")
-            raise IdempotencyItemAlreadyExistsError
+        return {
+            "Item": self._serialize(item),
+            "ConditionExpression": "attribute_not_exists(#id) OR #now < :now",
+            "ExpressionAttributeNames": {"#id": self.key_attr, "#now": self.expiry_attr},
+            "ExpressionAttributeValues": self._serialize({":now": int(now.timestamp())}),
+        }
 
     def _update_record(self, data_record: DataRecord):
         logger.debug(f"Updating record for idempotency key: {data_record.idempotency_key}")
+        self._client.update_item(**self._get_update_params(data_record=data_record))
+
+    def _get_update_params(self, data_record: DataRecord) -> Dict[str, Any]:
         update_expression = "SET #response_data = :response_data, #expiry = :expiry, #status = :status"
         expression_attr_values = {
             ":expiry": data_record.expiry_timestamp,
@@ -188,15 +233,442 @@ class DynamoDBPersistenceLayer(BasePersistenceLayer):
             expression_attr_values[":validation_key"] = data_record.payload_hash
             expression_attr_names["#validation_key"] = self.validation_key_attr
 
-        kwargs = {
-            "Key": self._get_key(data_record.idempotency_key),
+        return {
+            "TableName": self.table_name,
+            "Key": self._serialize(self._get_key(data_record.idempotency_key)),
             "UpdateExpression": update_expression,
-            "ExpressionAttributeValues": expression_attr_values,
+            "ExpressionAttributeValues": self._serialize(expression_attr_values),
             "ExpressionAttributeNames": expression_attr_names,
         }
 
-        self.table.update_item(**kwargs)
-
     def _delete_record(self, data_record: DataRecord) -> None:
         logger.debug(f"Deleting record for idempotency key: {data_record.idempotency_key}")
-        self.table.delete_item(Key=self._get_key(data_record.idempotency_key))
+        self._client.delete_item(
+            TableName=self.table_name, Key=self._serialize(self._get_key(data_record.idempotency_key))
+        )
+
+    def _get_records(self, idempotency_keys: List[str]) -> Dict[str, DataRecord]:
+        client = self._client
+        records: Dict[str, DataRecord] = {}
+        for chunk in _chunks(idempotency_keys, BATCH_GET_MAX_KEYS):
+            logger.debug(f"Getting {len(chunk)} records in a single request")
+            keys = [self._serialize(self._get_key(key)) for key in chunk]
+            response = client.batch_get_item(RequestItems={self.table_name: {"Keys": keys, "ConsistentRead": True}})
+            for item in response.get("Responses", {}).get(self.table_name, []):
+                record = self._item_to_data_record(self._deserialize(item))
+                records[record.idempotency_key] = record
+
+            # keys left unprocessed, e.g. when throttled, go through botocore retries and backoff one by one instead
+            unprocessed = response.get("UnprocessedKeys", {}).get(self.table_name, {}).get("Keys", [])
+            unprocessed_keys = [self._deserialize(key)[self.sort_key_attr or self.key_attr] for key in unprocessed]
+            records.update(super()._get_records(idempotency_keys=unprocessed_keys))
+
+        return records
+
+    def _put_records(self, data_records: List[DataRecord]) -> List[DataRecord]:
+        added: List[DataRecord] = []
+        for chunk in _chunks(data_records, TRANSACT_WRITE_MAX_ITEMS):
+            added.extend(self._transact_put_records(data_records=chunk))
+        return added
+
+    def _transact_put_records(self, data_records: List[DataRecord]) -> List[DataRecord]:
+        client = self._client
+        pending = data_records
+        # a single put is half the write capacity of a transaction
+        while len(pending) > 1:
+            logger.debug(f"Putting {len(pending)} records in a single transaction")
+            try:
+                client.transact_write_items(
+                    TransactItems=[
+                        {"Put": {"TableName": self.table_name, **self._get_put_params(data_record=data_record)}}
+                        for data_record in pending
+                    ]
+                )
+                return pending
+            except client.exceptions.TransactionCanceledException as exc:
+                # reasons are in the same order as records, and the whole transaction is rolled back
+                reasons = exc.response.get("CancellationReasons", [])
+                existing = {
+                    index for index, reason in enumerate(reasons) if reason.get("Code") == "ConditionalCheckFailed"
+                }
+                if not existing:
+                    # cancelled for another reason, e.g. a conflicting transaction, each record is put on its own
+                    break
+
+                logger.debug(f"Skipping {len(existing)} records for already existing idempotency keys")
+                pending = [data_record for index, data_record in enumerate(pending) if index not in existing]
+
+        return super()._put_records(data_records=pending)
+
+    def _update_records(self, data_records: List[DataRecord]) -> None:
+        # completed records replace in progress records as a whole, so they don't need conditions nor a transaction
+        requests = [
+            {"PutRequest": {"Item": self._serialize(self._get_completed_item(data_record))}}
+            for data_record in data_records
+        ]
+        unprocessed = self._batch_write(data_records=data_records, requests=requests)
+        super()._update_records(data_records=unprocessed)
+
+    def _delete_records(self, data_records: List[DataRecord]) -> None:
+        requests = [
+            {"DeleteRequest": {"Key": self._serialize(self._get_key(data_record.idempotency_key))}}
+            for data_record in data_records
+        ]
+        unprocessed = self._batch_write(data_records=data_records, requests=requests)
+        super()._delete_records(data_records=unprocessed)
+
+    def _get_completed_item(self, data_record: DataRecord) -> Dict[str, Any]:
+        item = {
+            **self._get_key(data_record.idempotency_key),
+            self.expiry_attr: data_record.expiry_timestamp,
+            self.status_attr: data_record.status,
+            self.data_attr: data_record.response_data,
+        }
+
+        if self.payload_validation_enabled:
+            item[self.validation_key_attr] = data_record.payload_hash
+
+        return item
+
+    def _batch_write(self, data_records: List[DataRecord], requests: List[Dict[str, Any]]) -> List[DataRecord]:
+        """
+        Send write requests with BatchWriteItem, and return records whose request was left unprocessed
+
+        A single request is left to the caller, as it's as expensive as a single item call.
+        """
+        if len(data_records) == 1:
+            return data_records
+
+        client = self._client
+        records_by_key = {data_record.idempotency_key: data_record for data_record in data_records}
+        unprocessed: List[DataRecord] = []
+        for chunk in _chunks(requests, BATCH_WRITE_MAX_ITEMS):
+            logger.debug(f"Writing {len(chunk)} records in a single request")
+            response = client.batch_write_item(RequestItems={self.table_name: chunk})
+            for request in response.get("UnprocessedItems", {}).get(self.table_name, []):
+                key = request["PutRequest"]["Item"] if "PutRequest" in request else request["DeleteRequest"]["Key"]
+                unprocessed.append(records_by_key[self._deserialize(key)[self.sort_key_attr or self.key_attr]])
+
+        return unprocessed
+
+
+class DynamoDBClientPersistenceLayer(DynamoDBPersistenceLayer):
+    def __init__(
+        self,
+        table_name: str,
+        key_attr: str = "id",
+        static_pk_value: Optional[str] = None,
+        sort_key_attr: Optional[str] = None,
+        expiry_attr: str = "expiration",
+        status_attr: str = "status",
+        data_attr: str = "data",
+        validation_key_attr: str = "validation",
+        boto_config: Optional[Config] = None,
+        boto3_session: Optional[boto3.session.Session] = None,
+        boto3_client=None,
+    ):
+        """
+        Initialize the DynamoDB persistence layer using a low-level client instead of the boto3 resource
+
+        Items have a small and fixed shape, so their attribute values are built and read by hand. This avoids
+        loading the resource layer at cold start, and its type serialization on every request.
+
+        Parameters
+        ----------
+        table_name: str
+            Name of the table to use for storing execution records
+        key_attr: str, optional
+            DynamoDB attribute name for partition key, by default "id"
+        static_pk_value: str, optional
+            DynamoDB attribute value for partition key, by default "idempotency#<function-name>".
+            This will be used if the sort_key_attr is set.
+        sort_key_attr: str, optional
+            DynamoDB attribute name for the sort key
+        expiry_attr: str, optional
+            DynamoDB attribute name for expiry timestamp, by default "expiration"
+        status_attr: str, optional
+            DynamoDB attribute name for status, by default "status"
+        data_attr: str, optional
+            DynamoDB attribute name for response data, by default "data"
+        boto_config: botocore.config.Config, optional
+            Botocore configuration to pass during client initialization
+        boto3_session : boto3.session.Session, optional
+            Boto3 session to use for AWS API communication
+        boto3_client : DynamoDBClient, optional
+            Low-level DynamoDB client to use, sharing its connection pool, e.g. with the rest of your function.
+            It must not be the client of a DynamoDB resource, as those serialize attribute values on their own.
+
+        Examples
+        --------
+        **Create a DynamoDB persistence layer sharing an existing client**
+
+            >>> import boto3
+            >>> from aws_lambda_powertools.utilities.idempotency import (
+            >>>    idempotent, DynamoDBClientPersistenceLayer
+            >>> )
+            >>>
+            >>> dynamodb = boto3.client("dynamodb")
+            >>> persistence_store = DynamoDBClientPersistenceLayer(table_name="idempotency", boto3_client=dynamodb)
+            >>>
+            >>> @idempotent(persistence_store=persistence_store)
+            >>> def handler(event, context):
+            >>>     return {"StatusCode": 200}
+        """
+        super().__init__(
+            table_name=table_name,
+            key_attr=key_attr,
+            static_pk_value=static_pk_value,
+            sort_key_attr=sort_key_attr,
+            expiry_attr=expiry_attr,
+            status_attr=status_attr,
+            data_attr=data_attr,
+            validation_key_attr=validation_key_attr,
+            boto_config=boto_config,
+            boto3_session=boto3_session,
+        )
+        self._low_level_client = boto3_client
+
+    @property
+    def client(self):
+        """
+        Caching property to store the low-level DynamoDB client
+        """
+        if self._low_level_client is None:
+            self._low_level_client = self._boto3_session.client("dynamodb", config=self._boto_config)
+        return self._low_level_client
+
+    @property
+    def _client(self):
+        return self.client
+
+    def _serialize(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        return {name: _to_attribute_value(value) for name, value in values.items()}
+
+    def _deserialize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        return _deserialize_attribute_values(item)
+
+
+class AsyncDynamoDBPersistenceLayer(AsyncBasePersistenceLayer, DynamoDBClientPersistenceLayer):
+    def __init__(
+        self,
+        table_name: str,
+        key_attr: str = "id",
+        static_pk_value: Optional[str] = None,
+        sort_key_attr: Optional[str] = None,
+        expiry_attr: str = "expiration",
+        status_attr: str = "status",
+        data_attr: str = "data",
+        validation_key_attr: str = "validation",
+        boto_config: Optional[Config] = None,
+        aiobotocore_session=None,
+        aiobotocore_client=None,
+    ):
+        """
+        Initialize the asynchronous DynamoDB persistence layer, for coroutine functions
+
+        Items are the same as DynamoDBPersistenceLayer ones, so both can share the same table. Requests are sent with
+        an aiobotocore client, created when it's first needed and kept across invocations using the same event loop.
+
+        Parameters
+        ----------
+        table_name: str
+            Name of the table to use for storing execution records
+        key_attr: str, optional
+            DynamoDB attribute name for partition key, by default "id"
+        static_pk_value: str, optional
+            DynamoDB attribute value for partition key, by default "idempotency#<function-name>".
+            This will be used if the sort_key_attr is set.
+        sort_key_attr: str, optional
+            DynamoDB attribute name for the sort key
+        expiry_attr: str, optional
+            DynamoDB attribute name for expiry timestamp, by default "expiration"
+        status_attr: str, optional
+            DynamoDB attribute name for status, by default "status"
+        data_attr: str, optional
+            DynamoDB attribute name for response data, by default "data"
+        boto_config: botocore.config.Config, optional
+            Botocore configuration to pass during client initialization
+        aiobotocore_session : aiobotocore.session.AioSession, optional
+            Aiobotocore session to create the client with
+        aiobotocore_client : DynamoDBClient, optional
+            Aiobotocore DynamoDB client already entered, to use instead of creating one
+
+        Examples
+        --------
+        **Process orders concurrently in an idempotent manner**
+
+            >>> import asyncio
+            >>> from aws_lambda_powertools.utilities.idempotency import (
+            >>>    idempotent_function, AsyncDynamoDBPersistenceLayer
+            >>> )
+            >>>
+            >>> persistence_store = AsyncDynamoDBPersistenceLayer(table_name="idempotency_store")
+            >>>
+            >>> @idempotent_function(data_keyword_argument="order", persistence_store=persistence_store)
+            >>> async def process_order(order):
+            >>>     return {"StatusCode": 200}
+            >>>
+            >>> async def process_orders(orders):
+            >>>     return await asyncio.gather(*[process_order(order=order) for order in orders])
+        """
+        super().__init__(
+            table_name=table_name,
+            key_attr=key_attr,
+            static_pk_value=static_pk_value,
+            sort_key_attr=sort_key_attr,
+            expiry_attr=expiry_attr,
+            status_attr=status_attr,
+            data_attr=data_attr,
+            validation_key_attr=validation_key_attr,
+            boto_config=boto_config,
+        )
+        self._aiobotocore_session = aiobotocore_session
+        self._aio_client = aiobotocore_client
+        self._aio_client_context: Any = None
+        self._aio_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._aio_client_lock: Optional[asyncio.Lock] = None
+        self._aio_client_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get_client(self):
+        """
+        Get the aiobotocore DynamoDB client, creating it when it's first needed
+
+        Clients are bound to the event loop they were created in, so a new client is created when the handler runs
+        in a new event loop, e.g. with `asyncio.run` on every invocation, after closing the previous one.
+        """
+        loop = asyncio.get_running_loop()
+        if self._is_client_usable(loop):
+            return self._aio_client
+
+        # locks are bound to the event loop they're first used in too. No coroutine switch can happen between the
+        # check and the assignment, so coroutines of the same loop always share the same lock
+        if self._aio_client_lock is None or self._aio_client_lock_loop is not loop:
+            self._aio_client_lock = asyncio.Lock()
+            self._aio_client_lock_loop = loop
+
+        async with self._aio_client_lock:
+            # another coroutine may have created the client while this one was waiting for the lock
+            if self._is_client_usable(loop):
+                return self._aio_client
+
+            if self._aio_client_context is not None:
+                # the previous client was created in another event loop, its session is released before replacing it
+                try:
+                    await self.close()
+                except Exception:
+                    logger.debug("Failed to close aiobotocore client created in another event loop", exc_info=True)
+
+            session = self._aiobotocore_session
+            if session is None:
+                try:
+                    from aiobotocore.session import get_session
+                except ImportError:
+                    raise ImportError(
+                        "AsyncDynamoDBPersistenceLayer requires the aiobotocore package, "
+                        "install it with `pip install aws-lambda-powertools[aiobotocore]`"
+                    )
+                session = get_session()
+
+            client_context = session.create_client("dynamodb", config=self._boto_config)
+            self._aio_client = await client_context.__aenter__()
+            self._aio_client_context = client_context
+            self._aio_client_loop = loop
+            return self._aio_client
+
+    def _is_client_usable(self, loop: asyncio.AbstractEventLoop) -> bool:
+        # clients passed on initialization aren't bound to a known loop, and are always used
+        return self._aio_client is not None and self._aio_client_loop in (None, loop)
+
+    async def close(self) -> None:
+        """
+        Close the aiobotocore client created by this persistence layer, if any
+        """
+        client_context = self._aio_client_context
+        if client_context is not None:
+            self._aio_client_context = None
+            self._aio_client = None
+            self._aio_client_loop = None
+            await client_context.__aexit__(None, None, None)
+
+    async def _get_record_async(self, idempotency_key: str) -> DataRecord:
+        client = await self.get_client()
+        response = await client.get_item(
+            TableName=self.table_name, Key=self._serialize(self._get_key(idempotency_key)), ConsistentRead=True
+        )
+
+        try:
+            item = response["Item"]
+        except KeyError:
+            raise IdempotencyItemNotFoundError
+        return self._item_to_data_record(self._deserialize(item))
+
+    async def _put_record_async(self, data_record: DataRecord) -> None:
+        client = await self.get_client()
+        try:
+            logger.debug(f"Putting record for idempotency key: {data_record.idempotency_key}")
+            await client.put_item(
+                TableName=self.table_name,
+                **self._get_put_params(data_record=data_record),
+                **_get_return_old_item_params(client),
+            )
+        except client.exceptions.ConditionalCheckFailedException as exc:
+            logger.debug(f"Failed to put record for already existing idempotency key: {data_record.idempotency_key}")
+            raise IdempotencyItemAlreadyExistsError(old_data_record=self._get_old_data_record(exc.response))
+
+    async def _update_record_async(self, data_record: DataRecord) -> None:
+        logger.debug(f"Updating record for idempotency key: {data_record.idempotency_key}")
+        client = await self.get_client()
+        await client.update_item(**self._get_update_params(data_record=data_record))
+
+    async def _delete_record_async(self, data_record: DataRecord) -> None:
+        logger.debug(f"Deleting record for idempotency key: {data_record.idempotency_key}")
+        client = await self.get_client()
+        await client.delete_item(
+            TableName=self.table_name, Key=self._serialize(self._get_key(data_record.idempotency_key))
+        )
+
+
+def _get_return_old_item_params(client: Any) -> Dict[str, str]:
+    """
+    PutItem parameters returning the existing item when the condition fails, saving a separate read to fetch it
+
+    ReturnValuesOnConditionCheckFailure was added to PutItem in botocore 1.29.165, and older releases, like the one
+    provided by some Lambda runtimes, reject it. The existing item is then read with GetItem instead.
+    """
+    members = client.meta.service_model.operation_model("PutItem").input_shape.members
+    if "ReturnValuesOnConditionCheckFailure" not in members:
+        return {}
+    return {"ReturnValuesOnConditionCheckFailure": "ALL_OLD"}
+
+
+def _to_attribute_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, (int, Decimal)):
+        return {"N": str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {"B": bytes(value)}
+    if value is None:
+        return {"NULL": True}
+    raise TypeError(f"Unsupported type {type(value).__name__} for idempotency record attribute")
+
+
+def _deserialize_attribute_values(item: Dict[str, Any]) -> Dict[str, Any]:
+    values = {}
+    for name, attribute_value in item.items():
+        (value_type, value), *_ = attribute_value.items()
+        if value_type == "N":
+            value = int(value) if value.lstrip("-").isdigit() else Decimal(value)
+        elif value_type == "NULL":
+            value = None
+        elif value_type not in ("S", "B", "BOOL"):
+            raise TypeError(f"Unsupported attribute value type {value_type} for idempotency record attribute")
+        values[name] = value
+    return values
+
+
+def _chunks(items: Sequence[T], size: int) -> Iterator[List[T]]:
+    for index in range(0, len(items), size):
+        yield list(items[index : index + size])
@@ -0,0 +1,100 @@
+import logging
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from aws_lambda_powertools.utilities.idempotency import BasePersistenceLayer
+from aws_lambda_powertools.utilities.idempotency.exceptions import (
+    IdempotencyItemAlreadyExistsError,
+    IdempotencyItemNotFoundError,
+)
+from aws_lambda_powertools.utilities.idempotency.persistence.base import DataRecord
+
+logger = logging.getLogger(__name__)
+
+
+class _Item(NamedTuple):
+    status: str
+    expiry_timestamp: Optional[int]
+    response_data: Optional[str]
+    payload_hash: Optional[str]
+
+
+class InMemoryPersistenceLayer(BasePersistenceLayer):
+    def __init__(self):
+        """
+        Initialize a persistence layer storing records in the memory of the current process
+
+        Records are lost when the process ends, and aren't shared with other processes, e.g. other Lambda execution
+        environments. It's meant for tests, benchmarks, and long running workers whose duplicates are always
+        delivered to the same process.
+
+        Examples
+        --------
+        **Create an in-memory persistence layer**
+
+            >>> from aws_lambda_powertools.utilities.idempotency import (
+            >>>    idempotent_function, InMemoryPersistenceLayer
+            >>> )
+            >>>
+            >>> persistence_store = InMemoryPersistenceLayer()
+            >>>
+            >>> @idempotent_function(data_keyword_argument="order", persistence_store=persistence_store)
+            >>> def process_order(order):
+            >>>     return {"StatusCode": 200}
+        """
+        self._items: Dict[str, _Item] = {}
+        self._lock = threading.Lock()
+        super(InMemoryPersistenceLayer, self).__init__()
+
+    def _to_item(self, data_record: DataRecord) -> _Item:
+        # records are stored as immutable items, so callers can't alter stored records
+        return _Item(
+            status=data_record.status,
+            expiry_timestamp=data_record.expiry_timestamp,
+            response_data=data_record.response_data,
+            payload_hash=data_record.payload_hash if self.payload_validation_enabled else None,
+        )
+
+    @staticmethod
+    def _to_data_record(idempotency_key: str, item: _Item) -> DataRecord:
+        return DataRecord(idempotency_key=idempotency_key, **item._asdict())
+
+    def _can_put(self, idempotency_key: str) -> bool:
+        item = self._items.get(idempotency_key)
+        return item is None or self._to_data_record(idempotency_key, item).is_expired
+
+    def _get_record(self, idempotency_key) -> DataRecord:
+        with self._lock:
+            item = self._items.get(idempotency_key)
+        if item is None:
+            raise IdempotencyItemNotFoundError
+        return self._to_data_record(idempotency_key, item)
+
+    def _put_record(self, data_record: DataRecord) -> None:
+        idempotency_key = data_record.idempotency_key
+        with self._lock:
+            if not self._can_put(idempotency_key):
+                logger.debug(f"Failed to put record for already existing idempotency key: {idempotency_key}")
+                old_data_record = self._to_data_record(idempotency_key, self._items[idempotency_key])
+                raise IdempotencyItemAlreadyExistsError(old_data_record=old_data_record)
+
+            logger.debug(f"Putting record for idempotency key: {idempotency_key}")
+            self._items[idempotency_key] = self._to_item(data_record)
+
+    def _update_record(self, data_record: DataRecord) -> None:
+        logger.debug(f"Updating record for idempotency key: {data_record.idempotency_key}")
+        with self._lock:
+            self._items[data_record.idempotency_key] = self._to_item(data_record)
+
+    def _delete_record(self, data_record: DataRecord) -> None:
+        logger.debug(f"Deleting record for idempotency key: {data_record.idempotency_key}")
+        with self._lock:
+            self._items.pop(data_record.idempotency_key, None)
+
+    def _put_records(self, data_records: List[DataRecord]) -> List[DataRecord]:
+        # the lock is held for the whole batch, as a single conditional write
+        with self._lock:
+            added = [data_record for data_record in data_records if self._can_put(data_record.idempotency_key)]
+            for data_record in added:
+                self._items[data_record.idempotency_key] = self._to_item(data_record)
+        return added
@@ -0,0 +1,252 @@
+import datetime
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from aws_lambda_powertools.utilities.idempotency import BasePersistenceLayer
+from aws_lambda_powertools.utilities.idempotency.exceptions import (
+    IdempotencyItemAlreadyExistsError,
+    IdempotencyItemNotFoundError,
+)
+from aws_lambda_powertools.utilities.idempotency.persistence.base import DataRecord
+
+logger = logging.getLogger(__name__)
+
+# stays below the lowest SQLITE_MAX_VARIABLE_NUMBER default of older SQLite versions
+SELECT_MAX_KEYS = 500
+
+T = TypeVar("T")
+
+
+class SQLitePersistenceLayer(BasePersistenceLayer):
+    def __init__(
+        self,
+        database: str,
+        table_name: str = "idempotency",
+        key_attr: str = "id",
+        expiry_attr: str = "expiration",
+        status_attr: str = "status",
+        data_attr: str = "data",
+        validation_key_attr: str = "validation",
+        timeout: float = 5.0,
+    ):
+        """
+        Initialize the SQLite persistence layer
+
+        Conditional writes run in immediate transactions, so processes sharing the same database file, e.g. workers on
+        the same host, never claim the same idempotency key twice. The table is created if it doesn't exist.
+
+        Parameters
+        ----------
+        database: str
+            Path to the database file, ":memory:" for a database private to this persistence layer
+        table_name: str, optional
+            Name of the table to use for storing execution records, by default "idempotency"
+        key_attr: str, optional
+            Column name for idempotency key, by default "id"
+        expiry_attr: str, optional
+            Column name for expiry timestamp, by default "expiration"
+        status_attr: str, optional
+            Column name for status, by default "status"
+        data_attr: str, optional
+            Column name for response data, by default "data"
+        validation_key_attr: str, optional
+            Column name for payload hash, by default "validation"
+        timeout: float, optional
+            Seconds to wait for another process to release its lock on the database, by default 5.0
+
+        Examples
+        --------
+        **Create a SQLite persistence layer shared by workers on the same host**
+
+            >>> from aws_lambda_powertools.utilities.idempotency import (
+            >>>    idempotent_function, SQLitePersistenceLayer
+            >>> )
+            >>>
+            >>> persistence_store = SQLitePersistenceLayer(database="/var/lib/worker/idempotency.db")
+            >>>
+            >>> @idempotent_function(data_keyword_argument="order", persistence_store=persistence_store)
+            >>> def process_order(order):
+            >>>     return {"StatusCode": 200}
+        """
+        for name in (table_name, key_attr, expiry_attr, status_attr, data_attr, validation_key_attr):
+            if not re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", name):
+                raise ValueError(f"Invalid SQLite identifier: {name!r}")
+
+        self.database = database
+        self.table_name = table_name
+        self.key_attr = key_attr
+        self.expiry_attr = expiry_attr
+        self.status_attr = status_attr
+        self.data_attr = data_attr
+        self.validation_key_attr = validation_key_attr
+        self.timeout = timeout
+
+        self._columns = f"{key_attr}, {status_attr}, {expiry_attr}, {data_attr}, {validation_key_attr}"
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+        self._lock = threading.RLock()
+        super(SQLitePersistenceLayer, self).__init__()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Caching property to store the connection, shared by threads and reopened in forked processes
+        """
+        if self._connection is not None and self._connection_pid == os.getpid():
+            return self._connection
+
+        # transactions are managed explicitly, so conditional writes can lock the database upfront
+        connection = sqlite3.connect(self.database, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        if self.database != ":memory:":
+            connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table_name} ("
+            f"{self.key_attr} TEXT PRIMARY KEY, {self.status_attr} TEXT NOT NULL, {self.expiry_attr} INTEGER, "
+            f"{self.data_attr} TEXT, {self.validation_key_attr} TEXT)"
+        )
+        self._connection = connection
+        self._connection_pid = os.getpid()
+        return connection
+
+    @connection.setter
+    def connection(self, connection: sqlite3.Connection):
+        """
+        Allow connection instance variable to be set directly, primarily for use in tests
+        """
+        self._connection = connection
+        self._connection_pid = os.getpid()
+
+    def _row_to_data_record(self, row: Tuple) -> DataRecord:
+        idempotency_key, status, expiry_timestamp, response_data, payload_hash = row
+        return DataRecord(
+            idempotency_key=idempotency_key,
+            status=status,
+            expiry_timestamp=expiry_timestamp,
+            response_data=response_data,
+            payload_hash=payload_hash,
+        )
+
+    def _record_to_row(self, data_record: DataRecord) -> Tuple:
+        return (
+            data_record.idempotency_key,
+            data_record.status,
+            data_record.expiry_timestamp,
+            data_record.response_data,
+            data_record.payload_hash if self.payload_validation_enabled else None,
+        )
+
+    def _select(self, idempotency_key: str) -> Optional[Tuple]:
+        return self.connection.execute(
+            f"SELECT {self._columns} FROM {self.table_name} WHERE {self.key_attr} = ?", (idempotency_key,)
+        ).fetchone()
+
+    def _get_record(self, idempotency_key) -> DataRecord:
+        with self._lock:
+            row = self._select(idempotency_key)
+        if row is None:
+            raise IdempotencyItemNotFoundError
+        return self._row_to_data_record(row)
+
+    def _put_record(self, data_record: DataRecord) -> None:
+        logger.debug(f"Putting record for idempotency key: {data_record.idempotency_key}")
+        _, existing = self._conditional_put([data_record])
+        if existing:
+            logger.debug(f"Failed to put record for already existing idempotency key: {data_record.idempotency_key}")
+            raise IdempotencyItemAlreadyExistsError(old_data_record=existing[0])
+
+    def _put_records(self, data_records: List[DataRecord]) -> List[DataRecord]:
+        logger.debug(f"Putting {len(data_records)} records in a single transaction")
+        added, _ = self._conditional_put(data_records)
+        return added
+
+    def _conditional_put(self, data_records: Sequence[DataRecord]) -> Tuple[List[DataRecord], List[DataRecord]]:
+        """
+        Add records whose key is missing, or whose record expired, same as the DynamoDB condition expression
+
+        Returns
+        -------
+        Tuple[List[DataRecord], List[DataRecord]]
+            Records that were added, and existing records that prevented the others from being added
+        """
+        now = int(datetime.datetime.now().timestamp())
+        added: List[DataRecord] = []
+        existing: List[DataRecord] = []
+        # the write lock is taken before reading, so no other process can claim the same keys in between
+        with self._lock, self._transaction() as connection:
+            for data_record in data_records:
+                row = self._select(data_record.idempotency_key)
+                if row is not None and (row[2] is None or row[2] >= now):
+                    existing.append(self._row_to_data_record(row))
+                    continue
+
+                connection.execute(
+                    f"INSERT OR REPLACE INTO {self.table_name} ({self._columns}) VALUES (?, ?, ?, ?, ?)",
+                    self._record_to_row(data_record),
+                )
+                added.append(data_record)
+        return added, existing
+
+    def _update_record(self, data_record: DataRecord) -> None:
+        logger.debug(f"Updating record for idempotency key: {data_record.idempotency_key}")
+        self._update_records([data_record])
+
+    def _update_records(self, data_records: List[DataRecord]) -> None:
+        rows = [(*self._record_to_row(data_record)[1:], data_record.idempotency_key) for data_record in data_records]
+        with self._lock, self._transaction() as connection:
+            connection.executemany(
+                f"UPDATE {self.table_name} SET {self.status_attr} = ?, {self.expiry_attr} = ?, {self.data_attr} = ?, "
+                f"{self.validation_key_attr} = ? WHERE {self.key_attr} = ?",
+                rows,
+            )
+
+    def _delete_record(self, data_record: DataRecord) -> None:
+        logger.debug(f"Deleting record for idempotency key: {data_record.idempotency_key}")
+        self._delete_records([data_record])
+
+    def _delete_records(self, data_records: List[DataRecord]) -> None:
+        with self._lock, self._transaction() as connection:
+            connection.executemany(
+                f"DELETE FROM {self.table_name} WHERE {self.key_attr} = ?",
+                [(data_record.idempotency_key,) for data_record in data_records],
+            )
+
+    def _get_records(self, idempotency_keys: List[str]) -> Dict[str, DataRecord]:
+        records: Dict[str, DataRecord] = {}
+        with self._lock:
+            for chunk in _chunks(idempotency_keys, SELECT_MAX_KEYS):
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self.connection.execute(
+                    f"SELECT {self._columns} FROM {self.table_name} WHERE {self.key_attr} IN ({placeholders})", chunk
+                )
+                for row in rows:
+                    record = self._row_to_data_record(row)
+                    records[record.idempotency_key] = record
+        return records
+
+    def _transaction(self) -> "_ImmediateTransaction":
+        return _ImmediateTransaction(self.connection)
+
+
+class _ImmediateTransaction:
+    """
+    Transaction taking the database write lock when it begins, committed unless an exception is raised
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.connection.execute("ROLLBACK" if exception_type else "COMMIT")
+
+
+def _chunks(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
@@ -4,17 +4,18 @@ from collections import namedtuple
 from decimal import Decimal
 from unittest import mock
 
+import boto3
 import jmespath
 import pytest
 from botocore import stub
 from botocore.config import Config
 from jmespath import functions
 
-from aws_lambda_powertools.utilities.idempotency import DynamoDBPersistenceLayer
+from aws_lambda_powertools.utilities.idempotency import DynamoDBClientPersistenceLayer, DynamoDBPersistenceLayer
 from aws_lambda_powertools.utilities.idempotency.idempotency import IdempotencyConfig
 from aws_lambda_powertools.utilities.jmespath_utils import extract_data_from_envelope
 from aws_lambda_powertools.utilities.validation import envelopes
-from tests.functional.idempotency.utils import hash_idempotency_key
+from tests.functional.idempotency.utils import PUT_ITEM_RETURN_OLD_ITEM_PARAMS, hash_idempotency_key
 from tests.functional.utils import json_serialize, load_event
 
 TABLE_NAME = "TEST_TABLE"
@@ -122,6 +123,7 @@ def expected_params_put_item(hashed_idempotency_key):
         "ExpressionAttributeValues": {":now": stub.ANY},
         "Item": {"expiration": stub.ANY, "id": hashed_idempotency_key, "status": "INPROGRESS"},
         "TableName": "TEST_TABLE",
+        **PUT_ITEM_RETURN_OLD_ITEM_PARAMS,
     }
 
 
@@ -138,6 +140,7 @@ def expected_params_put_item_with_validation(hashed_idempotency_key, hashed_vali
             "validation": hashed_validation_key,
         },
         "TableName": "TEST_TABLE",
+        **PUT_ITEM_RETURN_OLD_ITEM_PARAMS,
     }
 
 
@@ -166,6 +169,11 @@ def persistence_store(config):
     return DynamoDBPersistenceLayer(table_name=TABLE_NAME, boto_config=config)
 
 
+@pytest.fixture
+def persistence_store_client(config):
+    return DynamoDBClientPersistenceLayer(table_name=TABLE_NAME, boto3_client=boto3.client("dynamodb", config=config))
+
+
 @pytest.fixture
 def persistence_store_compound(config):
     return DynamoDBPersistenceLayer(table_name=TABLE_NAME, boto_config=config, key_attr="id", sort_key_attr="sk")
@@ -1,6 +1,14 @@
+import asyncio
+import base64
 import copy
+import datetime
+import hashlib
+import json
 import sys
+import time
+from decimal import Decimal
 from hashlib import md5
+from typing import List
 from unittest.mock import MagicMock
 
 import jmespath
@@ -8,21 +16,40 @@ import pytest
 from botocore import stub
 from pydantic import BaseModel
 
+from aws_lambda_powertools.shared.json_encoder import Encoder
+from aws_lambda_powertools.utilities.batch import BatchProcessor, EventType
 from aws_lambda_powertools.utilities.data_classes import APIGatewayProxyEventV2, event_source
-from aws_lambda_powertools.utilities.idempotency import DynamoDBPersistenceLayer, IdempotencyConfig
+from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
+from aws_lambda_powertools.utilities.idempotency import (
+    AsyncDynamoDBPersistenceLayer,
+    BatchIdempotency,
+    DynamoDBClientPersistenceLayer,
+    DynamoDBPersistenceLayer,
+    IdempotencyConfig,
+    InMemoryPersistenceLayer,
+    RedisPersistenceLayer,
+    SQLitePersistenceLayer,
+)
 from aws_lambda_powertools.utilities.idempotency.base import _prepare_data
+from aws_lambda_powertools.utilities.idempotency.cache import IdempotencyRecordCache
+from aws_lambda_powertools.utilities.idempotency.compression import BaseCompressionCodec, get_codec
 from aws_lambda_powertools.utilities.idempotency.exceptions import (
     IdempotencyAlreadyInProgressError,
     IdempotencyInconsistentStateError,
     IdempotencyInvalidStatusError,
+    IdempotencyItemAlreadyExistsError,
+    IdempotencyItemNotFoundError,
     IdempotencyKeyError,
     IdempotencyPersistenceLayerError,
     IdempotencyValidationError,
 )
+from aws_lambda_powertools.utilities.idempotency.hashing import HASH_BUFFER_SIZE, get_hash_function, hash_canonical_json
 from aws_lambda_powertools.utilities.idempotency.idempotency import idempotent, idempotent_function
 from aws_lambda_powertools.utilities.idempotency.persistence.base import BasePersistenceLayer, DataRecord
 from aws_lambda_powertools.utilities.validation import envelopes, validator
 from tests.functional.idempotency.utils import (
+    PUT_ITEM_RETURN_OLD_ITEM_PARAMS,
+    PUT_ITEM_RETURNS_OLD_ITEM,
     build_idempotency_put_item_stub,
     build_idempotency_update_item_stub,
     hash_idempotency_key,
@@ -234,6 +261,34 @@ def test_idempotent_lambda_first_execution(
     stubber.deactivate()
 
 
+@pytest.mark.parametrize("config_with_validation", [False], indirect=True)
+def test_idempotent_lambda_hashes_payload_once_per_invocation(
+    config_with_validation: IdempotencyConfig,
+    persistence_store: DynamoDBPersistenceLayer,
+    lambda_apigw_event,
+    lambda_context,
+    mocker,
+):
+    # GIVEN payload validation is enabled
+    stubber = stub.Stubber(persistence_store.table.meta.client)
+    stubber.add_response("put_item", {})
+    stubber.add_response("update_item", {})
+    stubber.activate()
+    generate_hash = mocker.spy(persistence_store, "_generate_hash")
+
+    @idempotent(config=config_with_validation, persistence_store=persistence_store)
+    def lambda_handler(event, context):
+        return {"message": "test"}
+
+    # WHEN saving both in progress and completed records
+    lambda_handler(lambda_apigw_event, lambda_context)
+
+    # THEN idempotency key and payload are hashed only once
+    assert generate_hash.call_count == 2
+    stubber.assert_no_pending_responses()
+    stubber.deactivate()
+
+
 @pytest.mark.parametrize("idempotency_config", [{"use_local_cache": True}], indirect=True)
 def test_idempotent_lambda_first_execution_cached(
     idempotency_config: IdempotencyConfig,
@@ -270,9 +325,9 @@ def test_idempotent_lambda_first_execution_cached(
     assert save_to_cache_spy.call_args[1]["data_record"].status == "COMPLETED"
     assert persistence_store._cache.get(hashed_idempotency_key).status == "COMPLETED"
 
-    # This lambda call should not call AWS API
+    # This lambda call should not call AWS API, and reuses the cached record found when saving it as in progress
     lambda_handler(lambda_apigw_event, lambda_context)
-    assert retrieve_from_cache_spy.call_count == 3
+    assert retrieve_from_cache_spy.call_count == 2
     retrieve_from_cache_spy.assert_called_with(idempotency_key=hashed_idempotency_key)
 
     # This assertion fails if an AWS API operation was called more than once
@@ -1113,7 +1168,8 @@ def test_idempotent_function_duplicates(
 
     assert one(data=mock_event) == "one"
     assert two(data=mock_event) == "two"
-    assert len(persistence_store.table.method_calls) == 4
+    requests = [name for name, *_ in persistence_store.table.method_calls if name.endswith(("put_item", "update_item"))]
+    assert requests == ["meta.client.put_item", "meta.client.update_item"] * 2
 
 
 def test_invalid_dynamodb_persistence_layer():
@@ -1256,3 +1312,836 @@ def test_idempotent_lambda_compound_already_completed(
 
     stubber.assert_no_pending_responses()
     stubber.deactivate()
+
+
+@pytest.mark.skipif(not PUT_ITEM_RETURNS_OLD_ITEM, reason="requires botocore 1.29.165 or higher")
+@pytest.mark.parametrize("idempotency_config", [{"use_local_cache": False}], indirect=True)
+def test_idempotent_lambda_already_completed_single_round_trip(
+    idempotency_config: IdempotencyConfig,
+    persistence_store: DynamoDBPersistenceLayer,
+    lambda_apigw_event,
+    timestamp_future,
+    hashed_idempotency_key,
+    serialized_lambda_response,
+    deserialized_lambda_response,
+    expected_params_put_item,
+    lambda_context,
+):
+    """
+    Test idempotent decorator reusing the existing record returned along with the failed conditional put
+    """
+
+    stubber = stub.Stubber(persistence_store.table.meta.client)
+    stubber.add_client_error(
+        "put_item",
+        service_error_code="ConditionalCheckFailedException",
+        expected_params=expected_params_put_item,
+        modeled_fields={
+            "Item": {
+                "id": {"S": hashed_idempotency_key},
+                "expiration": {"N": timestamp_future},
+                "data": {"S": serialized_lambda_response},
+                "status": {"S": "COMPLETED"},
+            }
+        },
+    )
+    stubber.activate()
+
+    @idempotent(config=idempotency_config, persistence_store=persistence_store)
+    def lambda_handler(event, context):
+        raise Exception
+
+    lambda_resp = lambda_handler(lambda_apigw_event, lambda_context)
+    assert lambda_resp == deserialized_lambda_response
+
+    # no get_item call is stubbed, so any additional request would fail
+    stubber.assert_no_pending_responses()
+    stubber.deactivate()
+
+
+@pytest.mark.parametrize("idempotency_config", [{"use_local_cache": False}], indirect=True)
+def test_idempotent_lambda_first_execution_low_level_client(
+    idempotency_config: IdempotencyConfig,
+    persistence_store_client: DynamoDBClientPersistenceLayer,
+    lambda_apigw_event,
+    hashed_idempotency_key,
+    serialized_lambda_response,
+    lambda_response,
+    lambda_context,
+):
+    """
+    Test idempotent decorator with the low-level client persistence layer, building attribute values by hand
+    """
+
+    stubber = stub.Stubber(persistence_store_client.client)
+    stubber.add_response(
+        "put_item",
+        {},
+        {
+            "TableName": TABLE_NAME,
+            "Item": {"id": {"S": hashed_idempotency_key}, "expiration": {"N": stub.ANY}, "status": {"S": "INPROGRESS"}},
+            "ConditionExpression": "attribute_not_exists(#id) OR #now < :now",
+            "ExpressionAttributeNames": {"#id": "id", "#now": "expiration"},
+            "ExpressionAttributeValues": {":now": {"N": stub.ANY}},
+            **PUT_ITEM_RETURN_OLD_ITEM_PARAMS,
+        },
+    )
+    stubber.add_response(
+        "update_item",
+        {},
+        {
+            "TableName": TABLE_NAME,
+            "Key": {"id": {"S": hashed_idempotency_key}},
+            "UpdateExpression": "SET #response_data = :response_data, #expiry = :expiry, #status = :status",
+            "ExpressionAttributeNames": {"#expiry": "expiration", "#response_data": "data", "#status": "status"},
+            "ExpressionAttributeValues": {
+                ":expiry": {"N": stub.ANY},
+                ":response_data": {"S": serialized_lambda_response},
+                ":status": {"S": "COMPLETED"},
+            },
+        },
+    )
+    stubber.activate()
+
+    @idempotent(config=idempotency_config, persistence_store=persistence_store_client)
+    def lambda_handler(event, context):
+        return lambda_response
+
+    lambda_handler(lambda_apigw_event, lambda_context)
+
+    stubber.assert_no_pending_responses()
+    stubber.deactivate()
+
+
+@pytest.mark.parametrize("idempotency_config", [{"use_local_cache": False}], indirect=True)
+def test_idempotent_lambda_already_completed_low_level_client(
+    idempotency_config: IdempotencyConfig,
+    persistence_store_client: DynamoDBClientPersistenceLayer,
+    lambda_apigw_event,
+    timestamp_future,
+    hashed_idempotency_key,
+    serialized_lambda_response,
+    deserialized_lambda_response,
+    lambda_context,
+):
+    """
+    Test idempotent decorator with the low-level client persistence layer, reading attribute values by hand
+    """
+
+    stubber = stub.Stubber(persistence_store_client.client)
+    stubber.add_client_error("put_item", "ConditionalCheckFailedException")
+    stubber.add_response(
+        "get_item",
+        {
+            "Item": {
+                "id": {"S": hashed_idempotency_key},
+                "expiration": {"N": timestamp_future},
+                "data": {"S": serialized_lambda_response},
+                "status": {"S": "COMPLETED"},
+            }
+        },
+        {"TableName": TABLE_NAME, "Key": {"id": {"S": hashed_idempotency_key}}, "ConsistentRead": True},
+    )
+    stubber.activate()
+
+    @idempotent(config=idempotency_config, persistence_store=persistence_store_client)
+    def lambda_handler(event, context):
+        raise Exception
+
+    lambda_resp = lambda_handler(lambda_apigw_event, lambda_context)
+    assert lambda_resp == deserialized_lambda_response
+
+    stubber.assert_no_pending_responses()
+    stubber.deactivate()
+
+
+class RecordingPersistenceLayer(BasePersistenceLayer):
+    def __init__(self):
+        self.records = {}
+        super(RecordingPersistenceLayer, self).__init__()
+
+    def _put_record(self, data_record: DataRecord) -> None:
+        self.records[data_record.idempotency_key] = data_record
+
+    def _update_record(self, data_record: DataRecord) -> None:
+        self.records[data_record.idempotency_key] = data_record
+
+    def _get_record(self, idempotency_key) -> DataRecord:
+        return self.records[idempotency_key]
+
+    def _delete_record(self, data_record: DataRecord) -> None:
+        self.records.pop(data_record.idempotency_key, None)
+
+
+class IdentityCodec(BaseCompressionCodec):
+    name = "identity"
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+@pytest.mark.parametrize("response_size", [10, 2048])
+def test_idempotent_function_compressed_response(response_size):
+    # GIVEN a configuration compressing responses larger than 1024 bytes
+    persistence_layer = RecordingPersistenceLayer()
+    config = IdempotencyConfig(response_compression="zlib", compression_threshold_bytes=1024)
+    response = {"message": "x" * response_size}
+
+    @idempotent_function(data_keyword_argument="record", persistence_store=persistence_layer, config=config)
+    def record_handler(record):
+        return response
+
+    # WHEN saving the response
+    assert record_handler(record={"id": 1}) == response
+
+    # THEN only large responses are stored compressed, and are read back as is
+    (data_record,) = persistence_layer.records.values()
+    assert data_record.response_data.startswith("~zlib:") == (response_size > 1024)
+    assert len(data_record.response_data) < 1024
+    assert data_record.response_json_as_dict() == response
+
+
+def test_data_record_compressed_response_formats():
+    # GIVEN records stored uncompressed, with a custom codec, and with a codec unknown to this environment
+    plain_record = DataRecord("key", response_data='{"message": "plain"}')
+    get_codec(IdentityCodec())
+    custom_record = DataRecord("key", response_data="~identity:" + base64.b64encode(b'{"x": "x"}').decode())
+    unknown_record = DataRecord("key", response_data="~unknown:AAAA")
+
+    # THEN uncompressed and custom codec records are readable, and the unknown codec is reported
+    assert plain_record.response_json_as_dict() == {"message": "plain"}
+    assert custom_record.response_json_as_dict() == {"x": "x"}
+    with pytest.raises(IdempotencyPersistenceLayerError, match="unknown codec: unknown"):
+        unknown_record.response_json_as_dict()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        "value",
+        {"b": [1, 2.5, None], "a": {"ä": True, "decimal": Decimal("2.5")}},
+        {"records": [{"id": i, "body": "x" * i, "attrs": {2: list(range(i % 40))}} for i in range(600)]},
+        [[Decimal("NaN"), float("inf")] * 20] * 300,
+    ],
+)
+def test_canonical_json_hash_matches_json_dumps(data):
+    # GIVEN payloads with containers small enough to be serialized at once, and large enough to be walked
+    # THEN their streamed digest matches the digest of the whole JSON string
+    expected = hashlib.md5(json.dumps(data, cls=Encoder, sort_keys=True).encode()).hexdigest()
+    assert hash_canonical_json(data, hash_function=hashlib.md5) == expected
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"Records": [{"messageId": str(i), "body": "x" * 100, "attributes": {"id": i}} for i in range(20000)]},
+        {"body": {"k": 1, "items": [{"id": i, "values": [i] * 10} for i in range(30000)]}, "k": 1},
+        [{"a": {"b": [list(range(50)) for _ in range(5000)]}}],
+    ],
+)
+def test_canonical_json_hash_bounds_chunk_size(data):
+    # GIVEN large payloads nested within small containers
+    class RecordingHash:
+        def __init__(self):
+            self.hash_object = hashlib.md5()
+            self.largest_chunk = 0
+
+        def update(self, chunk: bytes):
+            self.largest_chunk = max(self.largest_chunk, len(chunk))
+            self.hash_object.update(chunk)
+
+        def hexdigest(self) -> str:
+            return self.hash_object.hexdigest()
+
+    hash_object = RecordingHash()
+    payload = json.dumps(data, cls=Encoder, sort_keys=True).encode()
+
+    # WHEN
+    digest = hash_canonical_json(data, hash_function=lambda: hash_object)
+
+    # THEN the digest matches the whole JSON string, which is never hashed at once
+    assert digest == hashlib.md5(payload).hexdigest()
+    assert hash_object.largest_chunk <= 4 * HASH_BUFFER_SIZE < len(payload)
+
+
+def test_idempotent_function_custom_hash_function():
+    # GIVEN a configuration using blake2b to hash idempotency keys
+    mock_event = {"data": "value"}
+    expected_hash = hashlib.blake2b(json_serialize(mock_event).encode()).hexdigest()
+    persistence_layer = MockPersistenceLayer(expected_idempotency_key=f"test-func.record_handler#{expected_hash}")
+
+    @idempotent_function(
+        data_keyword_argument="record",
+        persistence_store=persistence_layer,
+        config=IdempotencyConfig(hash_function="blake2b"),
+    )
+    def record_handler(record):
+        return {"message": "Foo"}
+
+    # WHEN/THEN assertion will happen at MockPersistenceLayer
+    record_handler(record=mock_event)
+
+
+def test_unknown_hash_function():
+    with pytest.raises(ValueError, match="Unknown hash function: sha0"):
+        get_hash_function("sha0")
+
+
+def test_local_cache_evicts_least_recently_used_records_over_byte_limit():
+    # GIVEN a local cache bounded to 10 bytes of responses
+    cache = IdempotencyRecordCache(max_items=10, max_bytes=10)
+    cache["a"] = DataRecord("a", status="COMPLETED", response_data="1234")
+    cache["b"] = DataRecord("b", status="COMPLETED", response_data="1234")
+    assert cache.get("a") is not None
+
+    # WHEN adding a record exceeding the limit, and a record larger than the limit on its own
+    cache["c"] = DataRecord("c", status="COMPLETED", response_data="1234")
+    cache["d"] = DataRecord("d", status="COMPLETED", response_data="12345678901")
+
+    # THEN the least recently used record is evicted, and the larger record isn't cached
+    assert "b" not in cache
+    assert "d" not in cache
+    stats = cache.stats
+    assert (stats.items, stats.size_bytes, stats.evictions) == (2, 8, 1)
+    assert (stats.hits, stats.misses) == (1, 0)
+
+
+def test_local_cache_removes_expired_records_without_reading_them(mocker):
+    # GIVEN a local cache with a record expiring before another
+    now = int(datetime.datetime.now().timestamp())
+    cache = IdempotencyRecordCache()
+    cache["short"] = DataRecord("short", status="COMPLETED", expiry_timestamp=now + 10, response_data="{}")
+    cache["long"] = DataRecord("long", status="COMPLETED", expiry_timestamp=now + 100, response_data="{}")
+
+    # WHEN the first record expires
+    mock_datetime = mocker.patch("aws_lambda_powertools.utilities.idempotency.cache.datetime")
+    mock_datetime.datetime.now.return_value.timestamp.return_value = now + 50
+    assert cache.get("long") is not None
+
+    # THEN it's removed, even though it was never read
+    assert "short" not in cache
+    stats = cache.stats
+    assert (stats.items, stats.expirations, stats.evictions) == (1, 1, 0)
+
+
+@pytest.mark.parametrize("idempotency_config", [{"use_local_cache": True}], indirect=True)
+def test_local_cache_stats(idempotency_config: IdempotencyConfig, persistence_store: DynamoDBPersistenceLayer):
+    # GIVEN a persistence store using the local cache
+    persistence_store.configure(idempotency_config)
+    data_record = DataRecord("key", status="COMPLETED", expiry_timestamp=4102444800, response_data="{}")
+
+    # WHEN a record is missed, saved, then hit
+    persistence_store._retrieve_from_cache("key")
+    persistence_store._save_to_cache(data_record)
+    persistence_store._retrieve_from_cache("key")
+
+    # THEN counters reflect every lookup
+    stats = persistence_store.local_cache_stats
+    assert (stats.hits, stats.misses, stats.items, stats.size_bytes) == (1, 1, 1, 2)
+
+
+@pytest.mark.parametrize("idempotency_config", [{"use_local_cache": False}], indirect=True)
+def test_local_cache_stats_when_disabled(
+    idempotency_config: IdempotencyConfig, persistence_store: DynamoDBPersistenceLayer
+):
+    persistence_store.configure(idempotency_config)
+    assert persistence_store.local_cache_stats is None
+
+
+def build_local_persistence_layer(layer: str, tmp_path) -> BasePersistenceLayer:
+    if layer == "in_memory":
+        return InMemoryPersistenceLayer()
+    if layer == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        return RedisPersistenceLayer(key_prefix="idempotency:", redis_client=fakeredis.FakeRedis())
+    return SQLitePersistenceLayer(database=str(tmp_path / "idempotency.db"))
+
+
+@pytest.mark.parametrize("layer", ["in_memory", "sqlite", "redis"])
+def test_idempotent_function_local_persistence_layers(layer, tmp_path):
+    # GIVEN an in-process or SQLite persistence layer with payload validation
+    persistence_layer = build_local_persistence_layer(layer, tmp_path)
+    config = IdempotencyConfig(event_key_jmespath="id", payload_validation_jmespath="amount")
+    calls = []
+
+    @idempotent_function(data_keyword_argument="order", persistence_store=persistence_layer, config=config)
+    def process_order(order):
+        calls.append(order)
+        return {"amount": order["amount"]}
+
+    # WHEN processing the same order twice, then tampering with it
+    assert process_order(order={"id": 1, "amount": 10}) == {"amount": 10}
+    assert process_order(order={"id": 1, "amount": 10}) == {"amount": 10}
+    with pytest.raises(IdempotencyValidationError):
+        process_order(order={"id": 1, "amount": 20})
+
+    # THEN the function only ran once
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("layer", ["in_memory", "sqlite", "redis"])
+def test_local_persistence_layers_conditional_put(layer, tmp_path):
+    # GIVEN a persistence layer with an in progress record, and an expired one
+    persistence_layer = build_local_persistence_layer(layer, tmp_path)
+    persistence_layer.configure(IdempotencyConfig())
+    now = int(datetime.datetime.now().timestamp())
+    persistence_layer._put_record(DataRecord("in_progress", status="INPROGRESS", expiry_timestamp=now + 60))
+    persistence_layer._put_record(DataRecord("expired", status="COMPLETED", expiry_timestamp=now - 60))
+    # servers expiring records on their own keep them for at least a millisecond
+    time.sleep(0.01)
+
+    # WHEN putting records for the same keys
+    with pytest.raises(IdempotencyItemAlreadyExistsError) as exc_info:
+        persistence_layer._put_record(DataRecord("in_progress", status="INPROGRESS", expiry_timestamp=now + 120))
+    persistence_layer._put_record(DataRecord("expired", status="INPROGRESS", expiry_timestamp=now + 120))
+
+    # THEN only the expired record is replaced, and the existing one is returned with the failure
+    assert exc_info.value.old_data_record.expiry_timestamp == now + 60
+    assert persistence_layer._get_record("in_progress").expiry_timestamp == now + 60
+    assert persistence_layer._get_record("expired").status == "INPROGRESS"
+    with pytest.raises(IdempotencyItemNotFoundError):
+        persistence_layer._get_record("missing")
+
+
+def test_sqlite_persistence_layer_shared_by_workers(tmp_path):
+    # GIVEN two workers sharing the same database file
+    database = str(tmp_path / "idempotency.db")
+    worker, other_worker = SQLitePersistenceLayer(database=database), SQLitePersistenceLayer(database=database)
+    worker.configure(IdempotencyConfig())
+    other_worker.configure(IdempotencyConfig())
+    now = int(datetime.datetime.now().timestamp())
+
+    # WHEN both claim records, one of them in common, in bulk
+    claimed = worker._put_records([DataRecord(key, "INPROGRESS", now + 60) for key in ("a", "b")])
+    other_claimed = other_worker._put_records([DataRecord(key, "INPROGRESS", now + 60) for key in ("b", "c")])
+
+    # THEN each key is claimed once
+    assert [record.idempotency_key for record in claimed] == ["a", "b"]
+    assert [record.idempotency_key for record in other_claimed] == ["c"]
+
+    # AND records updated or deleted by one worker are seen by the other
+    worker._update_records([DataRecord("a", "COMPLETED", now + 60, response_data="{}")])
+    worker._delete_records([DataRecord("b")])
+    assert set(other_worker._get_records(["a", "b", "c"])) == {"a", "c"}
+    assert other_worker._get_record("a").status == "COMPLETED"
+
+
+def test_redis_persistence_layer_claims_and_reads_in_single_round_trip(mocker):
+    # GIVEN a Redis persistence layer with a completed record
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    persistence_layer = RedisPersistenceLayer(redis_client=client)
+    persistence_layer.configure(IdempotencyConfig(expires_after_seconds=60))
+    now = int(datetime.datetime.now().timestamp())
+    persistence_layer._put_record(DataRecord("key", status="INPROGRESS", expiry_timestamp=now + 60))
+    persistence_layer._update_record(DataRecord("key", "COMPLETED", now + 60, response_data='{"message": "done"}'))
+    pipeline_spy = mocker.spy(client, "pipeline")
+    get_spy = mocker.spy(client, "get")
+
+    # WHEN claiming the same key again
+    with pytest.raises(IdempotencyItemAlreadyExistsError) as exc_info:
+        persistence_layer._put_record(DataRecord("key", status="INPROGRESS", expiry_timestamp=now + 60))
+
+    # THEN the existing record comes back from the same pipeline, without a separate GET
+    assert exc_info.value.old_data_record.response_json_as_dict() == {"message": "done"}
+    assert pipeline_spy.call_count == 1
+    get_spy.assert_not_called()
+
+    # AND the record expires along with its expiry timestamp
+    assert 0 < client.pttl("key") <= 60 * 1000
+
+
+def test_redis_persistence_layer_bulk_operations():
+    # GIVEN a Redis persistence layer with an in progress record
+    fakeredis = pytest.importorskip("fakeredis")
+    persistence_layer = RedisPersistenceLayer(redis_client=fakeredis.FakeRedis())
+    persistence_layer.configure(IdempotencyConfig())
+    now = int(datetime.datetime.now().timestamp())
+    persistence_layer._put_record(DataRecord("b", status="INPROGRESS", expiry_timestamp=now + 60))
+
+    # WHEN claiming, completing, and deleting records in bulk
+    claimed = persistence_layer._put_records([DataRecord(key, "INPROGRESS", now + 60) for key in ("a", "b", "c")])
+    persistence_layer._update_records([DataRecord("a", "COMPLETED", now + 60, response_data="{}")])
+    persistence_layer._delete_records([DataRecord("c")])
+
+    # THEN only keys without a record are claimed
+    assert [record.idempotency_key for record in claimed] == ["a", "c"]
+    records = persistence_layer._get_records(["a", "b", "c"])
+    assert {key: record.status for key, record in records.items()} == {"a": "COMPLETED", "b": "INPROGRESS"}
+
+
+def test_redis_persistence_layer_shares_connection_pool():
+    # GIVEN persistence layers created at different times for the same server
+    pytest.importorskip("redis")
+    persistence_layer = RedisPersistenceLayer(url="redis://localhost:6379/0")
+    other_persistence_layer = RedisPersistenceLayer(url="redis://localhost:6379/0")
+
+    # THEN their clients share the same connection pool, without connecting until they're used
+    assert persistence_layer.client.connection_pool is other_persistence_layer.client.connection_pool
+    assert persistence_layer.client is persistence_layer.client
+
+
+@pytest.mark.asyncio
+async def test_idempotent_function_coroutine():
+    # GIVEN a coroutine function using a synchronous persistence layer
+    persistence_layer = InMemoryPersistenceLayer()
+    calls = []
+
+    @idempotent_function(data_keyword_argument="order", persistence_store=persistence_layer)
+    async def process_order(order):
+        calls.append(order["id"])
+        await asyncio.sleep(0)
+        return {"order_id": order["id"]}
+
+    # WHEN processing orders concurrently, twice
+    orders = [{"id": order_id} for order_id in range(3)]
+    responses = await asyncio.gather(*[process_order(order=order) for order in orders])
+    repeated_responses = await asyncio.gather(*[process_order(order=order) for order in orders])
+
+    # THEN the awaited responses are stored, not the coroutines, and each order is processed once
+    assert responses == repeated_responses == [{"order_id": order_id} for order_id in range(3)]
+    assert sorted(calls) == [0, 1, 2]
+    assert asyncio.iscoroutinefunction(process_order)
+
+
+@pytest.mark.asyncio
+async def test_idempotent_coroutine_lambda_handler(lambda_apigw_event, lambda_context):
+    # GIVEN a coroutine lambda handler
+    persistence_layer = InMemoryPersistenceLayer()
+    calls = []
+
+    @idempotent(persistence_store=persistence_layer)
+    async def lambda_handler(event, context):
+        calls.append(event)
+        return {"message": "done"}
+
+    # WHEN calling it twice with the same event
+    first_response = await lambda_handler(lambda_apigw_event, lambda_context)
+    second_response = await lambda_handler(lambda_apigw_event, lambda_context)
+
+    # THEN the handler ran once
+    assert first_response == second_response == {"message": "done"}
+    assert len(calls) == 1
+
+
+def test_idempotent_function_async_persistence_layer_requires_coroutine():
+    # GIVEN an asynchronous persistence layer
+    persistence_layer = AsyncDynamoDBPersistenceLayer(table_name="idempotency_store")
+
+    # WHEN decorating a synchronous function with it
+    # THEN it's rejected before it's ever called
+    with pytest.raises(TypeError, match="AsyncDynamoDBPersistenceLayer is asynchronous"):
+
+        @idempotent_function(data_keyword_argument="order", persistence_store=persistence_layer)
+        def process_order(order):
+            return order
+
+
+@pytest.mark.asyncio
+async def test_idempotent_function_async_dynamodb_persistence_layer():
+    # GIVEN an asynchronous DynamoDB persistence layer using a stubbed aiobotocore client
+    aiobotocore_session = pytest.importorskip("aiobotocore.session")
+    aiobotocore_stub = pytest.importorskip("aiobotocore.stub")
+    config = IdempotencyConfig(event_key_jmespath="id")
+    session = aiobotocore_session.get_session()
+    async with session.create_client(
+        "dynamodb", region_name="us-east-1", aws_access_key_id="test", aws_secret_access_key="test"
+    ) as client:
+        persistence_layer = AsyncDynamoDBPersistenceLayer(table_name="idempotency_store", aiobotocore_client=client)
+
+        @idempotent_function(data_keyword_argument="order", persistence_store=persistence_layer, config=config)
+        async def process_order(order):
+            if order.get("fail"):
+                raise ValueError("Failed to process order")
+            return {"order_id": order["id"]}
+
+        stored_item = {
+            "id": {"S": f"test-func.process_order#{hash_idempotency_key(1)}"},
+            "expiration": {"N": "4102444800"},
+            "status": {"S": "COMPLETED"},
+            "data": {"S": '{"order_id": 1}'},
+        }
+        stubber = aiobotocore_stub.AioStubber(client)
+        stubber.add_response("put_item", {})
+        stubber.add_response("update_item", {})
+        if PUT_ITEM_RETURNS_OLD_ITEM:
+            stubber.add_client_error(
+                "put_item", "ConditionalCheckFailedException", modeled_fields={"Item": stored_item}
+            )
+        else:
+            stubber.add_client_error("put_item", "ConditionalCheckFailedException")
+            stubber.add_response("get_item", {"Item": stored_item})
+        stubber.add_response("put_item", {})
+        stubber.add_response("delete_item", {}, {"TableName": "idempotency_store", "Key": {"id": {"S": stub.ANY}}})
+
+        # WHEN processing an order, processing it again, then failing another one
+        with stubber:
+            first_response = await process_order(order={"id": 1})
+            second_response = await process_order(order={"id": 1})
+            with pytest.raises(ValueError):
+                await process_order(order={"id": 2, "fail": True})
+
+            # THEN the stored response is returned, and the failed order's record is deleted
+            stubber.assert_no_pending_responses()
+
+    assert first_response == second_response == {"order_id": 1}
+
+
+class FakeAioClientContext:
+    def __init__(self):
+        self.entered = 0
+        self.exited = 0
+
+    async def __aenter__(self):
+        # let other coroutines run while the client is created, like aiobotocore does
+        await asyncio.sleep(0)
+        self.entered += 1
+        return self
+
+    async def __aexit__(self, *args):
+        self.exited += 1
+
+
+class FakeAioSession:
+    def __init__(self):
+        self.client_contexts: List[FakeAioClientContext] = []
+
+    def create_client(self, service_name, config=None):
+        client_context = FakeAioClientContext()
+        self.client_contexts.append(client_context)
+        return client_context
+
+
+@pytest.mark.asyncio
+async def test_async_dynamodb_persistence_layer_creates_client_once():
+    # GIVEN an asynchronous DynamoDB persistence layer without a client yet
+    session = FakeAioSession()
+    persistence_layer = AsyncDynamoDBPersistenceLayer(table_name="idempotency_store", aiobotocore_session=session)
+
+    # WHEN coroutines get the client concurrently
+    clients = await asyncio.gather(*[persistence_layer.get_client() for _ in range(5)])
+
+    # THEN a single client is created and shared
+    assert len(session.client_contexts) == 1
+    assert all(client is clients[0] for client in clients)
+
+    await persistence_layer.close()
+    assert session.client_contexts[0].exited == 1
+
+
+def test_async_dynamodb_persistence_layer_closes_client_of_previous_event_loop():
+    # GIVEN an asynchronous DynamoDB persistence layer used with asyncio.run on every invocation
+    session = FakeAioSession()
+    persistence_layer = AsyncDynamoDBPersistenceLayer(table_name="idempotency_store", aiobotocore_session=session)
+
+    # WHEN getting the client in two event loops
+    first_client = asyncio.run(persistence_layer.get_client())
+    second_client = asyncio.run(persistence_layer.get_client())
+
+    # THEN the client of the previous event loop is closed before it's replaced
+    assert first_client is not second_client
+    assert [(context.entered, context.exited) for context in session.client_contexts] == [(1, 1), (1, 0)]
+
+
+@pytest.mark.parametrize("idempotency_config", [{"use_local_cache": False}], indirect=True)
+def test_idempotent_lambda_already_completed_without_return_values_support(
+    idempotency_config: IdempotencyConfig,
+    persistence_store: DynamoDBPersistenceLayer,
+    lambda_apigw_event,
+    timestamp_future,
+    hashed_idempotency_key,
+    serialized_lambda_response,
+    deserialized_lambda_response,
+    expected_params_put_item,
+    lambda_context,
+    mocker,
+):
+    """
+    Test idempotent decorator reading the existing record when botocore doesn't support returning it from PutItem
+    """
+    # GIVEN a botocore release without ReturnValuesOnConditionCheckFailure, like the one of some Lambda runtimes
+    mocker.patch(
+        "aws_lambda_powertools.utilities.idempotency.persistence.dynamodb._get_return_old_item_params",
+        return_value={},
+    )
+    expected_params_put_item.pop("ReturnValuesOnConditionCheckFailure", None)
+
+    stubber = stub.Stubber(persistence_store.table.meta.client)
+    stubber.add_client_error(
+        "put_item", service_error_code="ConditionalCheckFailedException", expected_params=expected_params_put_item
+    )
+    stubber.add_response(
+        "get_item",
+        {
+            "Item": {
+                "id": {"S": hashed_idempotency_key},
+                "expiration": {"N": timestamp_future},
+                "data": {"S": serialized_lambda_response},
+                "status": {"S": "COMPLETED"},
+            }
+        },
+        {"TableName": TABLE_NAME, "Key": {"id": hashed_idempotency_key}, "ConsistentRead": True},
+    )
+    stubber.activate()
+
+    @idempotent(config=idempotency_config, persistence_store=persistence_store)
+    def lambda_handler(event, context):
+        raise Exception
+
+    # WHEN
+    lambda_resp = lambda_handler(lambda_apigw_event, lambda_context)
+
+    # THEN the parameter isn't sent, and the existing record is read instead
+    assert lambda_resp == deserialized_lambda_response
+    stubber.assert_no_pending_responses()
+    stubber.deactivate()
+
+
+def sqs_record(message_id: str) -> dict:
+    return {
+        "messageId": message_id,
+        "receiptHandle": "AQEBwJnKyrHigUMZj6rYigCgxlaS3SLy0a",
+        "body": f"body of {message_id}",
+        "attributes": {},
+        "messageAttributes": {},
+        "eventSource": "aws:sqs",
+        "eventSourceARN": "arn:aws:sqs:us-east-2:123456789012:my-queue",
+        "awsRegion": "us-east-1",
+    }
+
+
+def test_batch_idempotency_saves_records_in_bulk(persistence_store: DynamoDBPersistenceLayer, timestamp_future):
+    # GIVEN a SQS batch where the first record was already completed
+    batch = [sqs_record("completed"), sqs_record("new-1"), sqs_record("new-2")]
+    keys = {
+        record["messageId"]: "test-func.record_handler#" + hash_idempotency_key(record["messageId"]) for record in batch
+    }
+    handled = []
+
+    def record_handler(record: SQSRecord):
+        handled.append(record.message_id)
+        return {"message": record.body}
+
+    idempotent_handler = BatchIdempotency(
+        record_handler, persistence_store=persistence_store, config=IdempotencyConfig(event_key_jmespath="messageId")
+    )
+    processor = BatchProcessor(event_type=EventType.SQS)
+
+    stubber = stub.Stubber(persistence_store.table.meta.client)
+    stubber.add_response(
+        "batch_get_item",
+        {
+            "Responses": {
+                TABLE_NAME: [
+                    {
+                        "id": {"S": keys["completed"]},
+                        "expiration": {"N": timestamp_future},
+                        "data": {"S": '{"message": "stored"}'},
+                        "status": {"S": "COMPLETED"},
+                    }
+                ]
+            }
+        },
+        {"RequestItems": {TABLE_NAME: {"Keys": [{"id": key} for key in keys.values()], "ConsistentRead": True}}},
+    )
+    stubber.add_response(
+        "transact_write_items",
+        {},
+        {
+            "TransactItems": [
+                {
+                    "Put": {
+                        "TableName": TABLE_NAME,
+                        "Item": {"id": keys[message_id], "expiration": stub.ANY, "status": "INPROGRESS"},
+                        "ConditionExpression": "attribute_not_exists(#id) OR #now < :now",
+                        "ExpressionAttributeNames": {"#id": "id", "#now": "expiration"},
+                        "ExpressionAttributeValues": {":now": stub.ANY},
+                    }
+                }
+                for message_id in ("new-1", "new-2")
+            ]
+        },
+    )
+    stubber.add_response(
+        "batch_write_item",
+        {},
+        {
+            "RequestItems": {
+                TABLE_NAME: [
+                    {
+                        "PutRequest": {
+                            "Item": {
+                                "id": keys[message_id],
+                                "expiration": stub.ANY,
+                                "status": "COMPLETED",
+                                "data": json_serialize({"message": f"body of {message_id}"}),
+                            }
+                        }
+                    }
+                    for message_id in ("new-1", "new-2")
+                ]
+            }
+        },
+    )
+    stubber.activate()
+
+    # WHEN processing the batch
+    with idempotent_handler.batch(batch), processor(records=batch, handler=idempotent_handler):
+        processed_messages = processor.process()
+
+    # THEN only new records are handled, and the completed record returns its stored response
+    assert handled == ["new-1", "new-2"]
+    assert [result for _, result, _ in processed_messages] == [
+        {"message": "stored"},
+        {"message": "body of new-1"},
+        {"message": "body of new-2"},
+    ]
+    stubber.assert_no_pending_responses()
+    stubber.deactivate()
+
+
+def test_batch_idempotency_skips_records_claimed_concurrently(persistence_store: DynamoDBPersistenceLayer):
+    # GIVEN a SQS batch whose first record is claimed by another execution between the get and the put
+    # AND records that fail, or share their idempotency key with another record
+    batch = [sqs_record("claimed"), sqs_record("failing"), sqs_record("new"), sqs_record("new")]
+    keys = {
+        record["messageId"]: "test-func.record_handler#" + hash_idempotency_key(record["messageId"]) for record in batch
+    }
+
+    def record_handler(record: SQSRecord):
+        if record.message_id == "failing":
+            raise ValueError("Failed to process record")
+        return {"message": record.body}
+
+    idempotent_handler = BatchIdempotency(
+        record_handler, persistence_store=persistence_store, config=IdempotencyConfig(event_key_jmespath="messageId")
+    )
+    processor = BatchProcessor(event_type=EventType.SQS)
+
+    stubber = stub.Stubber(persistence_store.table.meta.client)
+    stubber.add_response("batch_get_item", {"Responses": {TABLE_NAME: []}})
+    stubber.add_client_error(
+        "transact_write_items",
+        service_error_code="TransactionCanceledException",
+        modeled_fields={
+            "CancellationReasons": [{"Code": "ConditionalCheckFailed"}, {"Code": "None"}, {"Code": "None"}]
+        },
+    )
+    stubber.add_response("transact_write_items", {})
+    stubber.add_response("delete_item", {}, {"TableName": TABLE_NAME, "Key": {"id": keys["failing"]}})
+    stubber.add_response("update_item", {})
+    stubber.activate()
+
+    # WHEN processing the batch
+    with idempotent_handler.batch(batch), processor(records=batch, handler=idempotent_handler):
+        processed_messages = processor.process()
+
+    # THEN the claimed and failing records are reported as failures, and the duplicate reuses the response
+    assert [status for status, _, _ in processed_messages] == ["fail", "fail", "success", "success"]
+    assert "IdempotencyAlreadyInProgressError" in processed_messages[0][1]
+    assert processed_messages[2][1] == processed_messages[3][1] == {"message": "body of new"}
+    stubber.assert_no_pending_responses()
+    stubber.deactivate()
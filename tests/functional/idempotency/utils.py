@@ -2,9 +2,18 @@ import hashlib
 from typing import Any, Dict
 
 from botocore import stub
+from botocore.session import get_session
 
 from tests.functional.utils import json_serialize
 
+# PutItem only accepts ReturnValuesOnConditionCheckFailure since botocore 1.29.165
+PUT_ITEM_RETURNS_OLD_ITEM = "ReturnValuesOnConditionCheckFailure" in (
+    get_session().get_service_model("dynamodb").operation_model("PutItem").input_shape.members
+)
+PUT_ITEM_RETURN_OLD_ITEM_PARAMS = {"ReturnValuesOnConditionCheckFailure": "ALL_OLD"}
+if not PUT_ITEM_RETURNS_OLD_ITEM:
+    PUT_ITEM_RETURN_OLD_ITEM_PARAMS = {}
+
 
 def hash_idempotency_key(data: Any):
     """Serialize data to JSON, encode, and hash it for idempotency key"""
@@ -21,6 +30,7 @@ def build_idempotency_put_item_stub(
         "ExpressionAttributeValues": {":now": stub.ANY},
         "Item": {"expiration": stub.ANY, "id": idempotency_key_hash, "status": "INPROGRESS"},
         "TableName": "TEST_TABLE",
+        **PUT_ITEM_RETURN_OLD_ITEM_PARAMS,
     }
 
 
@@ -16,6 +16,7 @@ from aws_lambda_powertools.utilities.data_classes import (
     CloudWatchLogsEvent,
     CodePipelineJobEvent,
     EventBridgeEvent,
+    KinesisFirehoseEvent,
     KinesisStreamEvent,
     S3Event,
     SESEvent,
@@ -76,7 +77,7 @@ from aws_lambda_powertools.utilities.data_classes.dynamo_db_stream_event import
 )
 from aws_lambda_powertools.utilities.data_classes.event_source import event_source
 from aws_lambda_powertools.utilities.data_classes.s3_object_event import S3ObjectLambdaEvent
-from tests.functional.utils import load_event
+from tests.functional.utils import kpl_aggregate, load_event
 
 
 def test_dict_wrapper_equals():
@@ -1135,6 +1136,74 @@ def test_kinesis_stream_event_json_data():
     assert record.kinesis.data_as_json() == json_value
 
 
+def test_kinesis_firehose_kinesis_event():
+    event = KinesisFirehoseEvent(load_event("kinesisFirehoseKinesisEvent.json"))
+
+    assert event.region == "us-east-2"
+    assert event.invocation_id == "2b4d1ad9-2f48-94bd-a088-767c317e994a"
+    assert event.delivery_stream_arn == event["deliveryStreamArn"]
+    assert event.source_kinesis_stream_arn == event["sourceKinesisStreamArn"]
+
+    records = list(event.records)
+    assert len(records) == 2
+    record = records[0]
+    assert record.record_id == "record1"
+    assert record.approximate_arrival_timestamp == 1664028820148
+    assert record.data_as_text() == "Hello World"
+    assert records[1].data_as_json() == {"Hello": "World"}
+
+    metadata = record.metadata
+    assert metadata.shard_id == "shardId-000000000000"
+    assert metadata.partition_key == "4d1ad2b9-24f8-4b9d-a088-76e9947c317a"
+    assert metadata.approximate_arrival_timestamp == 1664028820148
+    assert metadata.sequence_number == "49546986683135544286507457936321625675700192471156785154"
+    assert metadata.subsequence_number == ""
+
+
+def test_kinesis_firehose_direct_put_event():
+    event = KinesisFirehoseEvent({"records": [{"recordId": "record1", "data": "SGVsbG8gV29ybGQ="}]})
+
+    record = next(event.records)
+    assert event.source_kinesis_stream_arn is None
+    assert record.metadata is None
+    assert record.data_as_bytes() == b"Hello World"
+
+
+def test_kinesis_stream_event_kpl_aggregated_records():
+    data = kpl_aggregate([("first", b'{"id": 1}'), ("second", b"second"), ("first", b"third")])
+    event = KinesisStreamEvent({"Records": [{"kinesis": {"data": data, "partitionKey": "a", "sequenceNumber": "1"}}]})
+    kinesis = next(event.records).kinesis
+
+    user_records = list(kinesis.user_records())
+
+    assert kinesis.is_aggregated()
+    assert [user_record.partition_key for user_record in user_records] == ["first", "second", "first"]
+    assert [user_record.sub_sequence_number for user_record in user_records] == [0, 1, 2]
+    assert all(isinstance(user_record.data, memoryview) for user_record in user_records)
+    assert user_records[0].data_as_json() == {"id": 1}
+    assert user_records[1].data_as_text() == "second"
+    assert user_records[2].data_as_bytes() == b"third"
+    assert user_records[2].sequence_number == "1"
+
+
+def test_kinesis_stream_event_not_aggregated_records():
+    # GIVEN data that isn't aggregated, or whose MD5 digest doesn't match
+    aggregated = base64.b64decode(kpl_aggregate([("first", b"data")]))
+    corrupted = base64.b64encode(aggregated[:-1] + b"\x00").decode("utf-8")
+    for data in (base64.b64encode(b"Hello").decode("utf-8"), corrupted):
+        event = KinesisStreamEvent(
+            {"Records": [{"kinesis": {"data": data, "partitionKey": "a", "sequenceNumber": "1"}}]}
+        )
+        kinesis = next(event.records).kinesis
+
+        # THEN data is a single user record
+        user_records = list(kinesis.user_records())
+        assert not kinesis.is_aggregated()
+        assert len(user_records) == 1
+        assert user_records[0].data_as_bytes() == base64.b64decode(data)
+        assert user_records[0].partition_key == "a"
+
+
 def test_alb_event():
     event = ALBEvent(load_event("albEvent.json"))
     assert event.request_context.elb_target_group_arn == event["requestContext"]["elb"]["targetGroupArn"]
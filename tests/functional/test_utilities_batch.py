@@ -1,30 +1,64 @@
+import asyncio
+import copy
+import gc
+import io
 import json
 import math
+import os
+import threading
+import uuid
+import weakref
 from random import randint
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, List, Optional
 from unittest.mock import patch
 
 import pytest
 from botocore.config import Config
+from botocore.response import StreamingBody
 from botocore.stub import Stubber
 
+from aws_lambda_powertools.metrics import Metrics
 from aws_lambda_powertools.utilities.batch import (
+    AsyncBatchProcessor,
     BatchProcessor,
     EventType,
+    FirehoseTransformationProcessor,
     PartialSQSProcessor,
+    S3PointerResolver,
+    SqsFifoPartialProcessor,
+    async_batch_processor,
     batch_processor,
     sqs_batch_processor,
 )
-from aws_lambda_powertools.utilities.batch.exceptions import BatchProcessingError, SQSBatchProcessingError
+from aws_lambda_powertools.utilities.batch.exceptions import (
+    BatchProcessingError,
+    FirehoseResponseSizeExceededError,
+    SQSBatchProcessingError,
+)
+from aws_lambda_powertools.utilities.batch.sqs import _clients as sqs_clients
+from aws_lambda_powertools.utilities.batch.sqs import _queue_urls as sqs_queue_urls
 from aws_lambda_powertools.utilities.data_classes.dynamo_db_stream_event import DynamoDBRecord
-from aws_lambda_powertools.utilities.data_classes.kinesis_stream_event import KinesisStreamRecord
+from aws_lambda_powertools.utilities.data_classes.kinesis_firehose_event import KinesisFirehoseRecord
+from aws_lambda_powertools.utilities.data_classes.kinesis_stream_event import KinesisStreamRecord, KinesisUserRecord
 from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
 from aws_lambda_powertools.utilities.parser import BaseModel, validator
 from aws_lambda_powertools.utilities.parser.models import DynamoDBStreamChangedRecordModel, DynamoDBStreamRecordModel
 from aws_lambda_powertools.utilities.parser.models import KinesisDataStreamRecord as KinesisDataStreamRecordModel
 from aws_lambda_powertools.utilities.parser.models import KinesisDataStreamRecordPayload, SqsRecordModel
 from aws_lambda_powertools.utilities.parser.types import Literal
-from tests.functional.utils import b64_to_str, str_to_b64
+from tests.functional.utils import b64_to_str, kpl_aggregate, str_to_b64
+
+
+def kinesis_process_pool_record_handler(record: KinesisStreamRecord):
+    # record handlers used with a process pool must be picklable, e.g. defined at module level
+    body = b64_to_str(record.kinesis.data)
+    if "fail" in body:
+        raise ValueError(f"Failed to process record in process {os.getpid()}.")
+    return body, os.getpid()
+
+
+def exiting_record_handler(record: KinesisStreamRecord):
+    os._exit(1)
 
 
 @pytest.fixture(scope="module")
@@ -50,6 +84,18 @@ def sqs_event_factory() -> Callable:
     return factory
 
 
+@pytest.fixture(scope="module")
+def sqs_fifo_event_factory(sqs_event_factory) -> Callable:
+    def factory(body: str, message_group_id: str):
+        record = sqs_event_factory(body)
+        record["messageId"] = str(uuid.uuid4())
+        record["attributes"] = {**record["attributes"], "MessageGroupId": message_group_id}
+        record["eventSourceARN"] = "arn:aws:sqs:us-east-2:123456789012:my-queue.fifo"
+        return record
+
+    return factory
+
+
 @pytest.fixture(scope="module")
 def kinesis_event_factory() -> Callable:
     def factory(body: str):
@@ -130,6 +176,17 @@ def dynamodb_record_handler() -> Callable:
     return handler
 
 
+@pytest.fixture(scope="module")
+def async_record_handler() -> Callable:
+    async def handler(record: SQSRecord):
+        await asyncio.sleep(0)
+        if "fail" in record.body:
+            raise Exception("Failed to process record.")
+        return record.body
+
+    return handler
+
+
 @pytest.fixture(scope="module")
 def config() -> Config:
     return Config(region_name="us-east-1")
@@ -216,6 +273,77 @@ def test_partial_sqs_processor_context_with_failure_exception(sqs_event_factory,
         stubber.assert_no_pending_responses()
 
 
+def test_partial_sqs_processor_retries_only_failed_deletes(sqs_fifo_event_factory, record_handler, config):
+    # GIVEN SQS failing to delete messages, due to both server and sender errors
+    processor = PartialSQSProcessor(config=config, suppress_exception=True)
+    fail_record = sqs_fifo_event_factory("fail", "group")
+    success_records = [sqs_fifo_event_factory("success", "group") for _ in range(3)]
+    first, second, third = [record["messageId"] for record in success_records]
+    queue_url = f"{processor.client._endpoint.host}/123456789012/my-queue.fifo"
+
+    first_response = {
+        "Successful": [{"Id": first}],
+        "Failed": [
+            {"Id": second, "SenderFault": False, "Code": "InternalError"},
+            {"Id": third, "SenderFault": True, "Code": "ReceiptHandleIsInvalid"},
+        ],
+    }
+    retry_entries = [{"Id": second, "ReceiptHandle": success_records[1]["receiptHandle"]}]
+
+    # WHEN
+    with Stubber(processor.client) as stubber, patch("time.sleep") as sleep:
+        stubber.add_response("delete_message_batch", first_response)
+        stubber.add_response(
+            "delete_message_batch",
+            {"Successful": [{"Id": second}], "Failed": []},
+            expected_params={"QueueUrl": queue_url, "Entries": retry_entries},
+        )
+        with processor([fail_record, *success_records], record_handler) as ctx:
+            ctx.process()
+
+        # THEN only the message that failed due to a server error is retried, after a jittered backoff
+        stubber.assert_no_pending_responses()
+        sleep.assert_called_once()
+        assert 0 <= sleep.call_args[0][0] <= processor.delete_retry_backoff
+
+
+def test_partial_sqs_processor_reuses_client(config):
+    # GIVEN processors created with the same config, e.g. by sqs_batch_processor on every invocation
+    first_processor = PartialSQSProcessor(config=config)
+    second_processor = PartialSQSProcessor(config=config)
+
+    # THEN their SQS client and its connection pool is reused
+    assert first_processor.client is second_processor.client
+
+
+def test_partial_sqs_processor_bounds_cached_clients():
+    # GIVEN processors created with a new config on every invocation
+    processors = [PartialSQSProcessor(config=Config(region_name="us-east-1")) for _ in range(20)]
+
+    # THEN only the most recently used clients are kept
+    assert len(sqs_clients) == sqs_clients.max_items
+    assert processors[0].client not in sqs_clients.values()
+    assert processors[-1].client in sqs_clients.values()
+
+
+def test_partial_sqs_processor_bounds_cached_queue_urls(sqs_event_factory):
+    # GIVEN processors created with a new config, hence a new client, on every invocation
+    record = sqs_event_factory("success")
+    processors = [PartialSQSProcessor(config=Config(region_name="us-east-1")) for _ in range(20)]
+
+    # WHEN
+    queue_urls = []
+    for processor in processors:
+        processor.records = [record]
+        queue_urls.append(processor._get_queue_url())
+
+    # THEN queue URLs are built from the client endpoint, and only the most recently used ones are kept
+    assert len(sqs_queue_urls) == sqs_queue_urls.max_items
+    assert queue_urls[-1] == f"{processors[-1].client.meta.endpoint_url}/123456789012/my-queue"
+    assert sqs_queue_urls[(processors[-1].client, record["eventSourceARN"])] == queue_urls[-1]
+    assert (processors[0].client, record["eventSourceARN"]) not in sqs_queue_urls
+
+
 def test_partial_sqs_processor_context_only_success(sqs_event_factory, record_handler, partial_processor):
     """
     Test processor without failure
@@ -908,3 +1036,949 @@ def test_batch_processor_error_when_entire_batch_fails(sqs_event_factory, record
 
     # THEN raise BatchProcessingError
     assert "All records failed processing. " in str(e.value)
+
+
+def test_batch_processor_concurrent_context_with_failure(sqs_event_factory, record_handler):
+    # GIVEN
+    first_record = SQSRecord(sqs_event_factory("fail"))
+    second_record = SQSRecord(sqs_event_factory("success"))
+    third_record = SQSRecord(sqs_event_factory("fail"))
+    records = [first_record.raw_event, second_record.raw_event, third_record.raw_event]
+    processor = BatchProcessor(event_type=EventType.SQS, max_concurrency=3)
+
+    # WHEN
+    with processor(records, record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN results are returned in record order
+    assert [message[0] for message in processed_messages] == ["fail", "success", "fail"]
+    assert processed_messages[1] == ("success", second_record.body, second_record.raw_event)
+    assert len(batch.success_messages) == 1
+    assert len(batch.fail_messages) == 2
+    assert batch.response() == {
+        "batchItemFailures": [{"itemIdentifier": first_record.message_id}, {"itemIdentifier": third_record.message_id}]
+    }
+
+
+def test_batch_processor_concurrent_runs_records_in_parallel(sqs_event_factory):
+    # GIVEN a handler that only completes when all workers are waiting at the same time
+    barrier = threading.Barrier(parties=2, timeout=5)
+
+    def record_handler(record: SQSRecord):
+        barrier.wait()
+        return record.body
+
+    records = [sqs_event_factory("success"), sqs_event_factory("success")]
+    processor = BatchProcessor(event_type=EventType.SQS, max_concurrency=2)
+
+    # WHEN
+    with processor(records, record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN
+    assert [message[0] for message in processed_messages] == ["success", "success"]
+    assert batch.response() == {"batchItemFailures": []}
+
+
+def test_batch_processor_concurrent_reuses_executor(sqs_event_factory, record_handler):
+    # GIVEN
+    records = [sqs_event_factory("success"), sqs_event_factory("fail")]
+    processor = BatchProcessor(event_type=EventType.SQS, max_concurrency=2)
+
+    # WHEN processing two batches (warm start)
+    with processor(records, record_handler) as batch:
+        batch.process()
+    executor = processor._executor
+
+    with processor(records, record_handler) as batch:
+        batch.process()
+
+    # THEN
+    assert processor._executor is executor
+    assert len(batch.fail_messages) == 1
+    assert len(batch.response()["batchItemFailures"]) == 1
+
+
+def test_batch_processor_invalid_max_concurrency():
+    with pytest.raises(ValueError):
+        BatchProcessor(event_type=EventType.SQS, max_concurrency=0)
+
+
+def test_async_batch_processor_middleware_with_failure(sqs_event_factory, async_record_handler):
+    # GIVEN
+    first_record = SQSRecord(sqs_event_factory("fail"))
+    second_record = SQSRecord(sqs_event_factory("success"))
+    third_record = SQSRecord(sqs_event_factory("fail"))
+    event = {"Records": [first_record.raw_event, second_record.raw_event, third_record.raw_event]}
+
+    processor = AsyncBatchProcessor(event_type=EventType.SQS)
+
+    @async_batch_processor(record_handler=async_record_handler, processor=processor)
+    def lambda_handler(event, context):
+        return processor.response()
+
+    # WHEN
+    result = lambda_handler(event, {})
+
+    # THEN
+    assert len(result["batchItemFailures"]) == 2
+
+
+def test_async_batch_processor_context_with_failure(sqs_event_factory, async_record_handler):
+    # GIVEN
+    first_record = SQSRecord(sqs_event_factory("failure"))
+    second_record = SQSRecord(sqs_event_factory("success"))
+    records = [first_record.raw_event, second_record.raw_event]
+    processor = AsyncBatchProcessor(event_type=EventType.SQS)
+
+    # WHEN
+    with processor(records, async_record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN
+    assert processed_messages[0][0] == "fail"
+    assert processed_messages[1] == ("success", second_record.body, second_record.raw_event)
+    assert batch.response() == {"batchItemFailures": [{"itemIdentifier": first_record.message_id}]}
+
+
+def test_async_batch_processor_limits_concurrency(sqs_event_factory):
+    # GIVEN
+    in_flight, max_in_flight = 0, 0
+
+    async def record_handler(record: SQSRecord):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return record.body
+
+    records = [sqs_event_factory("success") for _ in range(10)]
+    processor = AsyncBatchProcessor(event_type=EventType.SQS, max_concurrency=3)
+
+    # WHEN
+    with processor(records, record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN
+    assert len(processed_messages) == 10
+    assert max_in_flight == 3
+
+
+def test_async_batch_processor_reuses_event_loop(sqs_event_factory, async_record_handler):
+    # GIVEN
+    loops = []
+
+    async def record_handler(record: SQSRecord):
+        loops.append(asyncio.get_event_loop())
+        return await async_record_handler(record)
+
+    records = [sqs_event_factory("success")]
+    processor = AsyncBatchProcessor(event_type=EventType.SQS)
+
+    # WHEN processing two batches (warm start)
+    for _ in range(2):
+        with processor(records, record_handler) as batch:
+            batch.process()
+
+    # THEN
+    assert loops[0] is loops[1]
+
+
+def test_async_batch_processor_error_when_entire_batch_fails(sqs_event_factory, async_record_handler):
+    # GIVEN
+    records = [sqs_event_factory("fail"), sqs_event_factory("fail")]
+    processor = AsyncBatchProcessor(event_type=EventType.SQS)
+
+    # WHEN/THEN
+    with pytest.raises(BatchProcessingError):
+        with processor(records, async_record_handler) as batch:
+            batch.process()
+
+
+@pytest.mark.asyncio
+async def test_async_batch_processor_async_process_within_running_loop(sqs_event_factory, async_record_handler):
+    # GIVEN
+    first_record = SQSRecord(sqs_event_factory("fail"))
+    second_record = SQSRecord(sqs_event_factory("success"))
+    records = [first_record.raw_event, second_record.raw_event]
+    processor = AsyncBatchProcessor(event_type=EventType.SQS)
+
+    # WHEN
+    with processor(records, async_record_handler) as batch:
+        await batch.async_process()
+
+    # THEN
+    assert batch.response() == {"batchItemFailures": [{"itemIdentifier": first_record.message_id}]}
+
+
+@pytest.mark.parametrize("max_concurrency", [None, 2])
+def test_sqs_fifo_processor_short_circuits_failed_message_group(sqs_fifo_event_factory, max_concurrency):
+    # GIVEN two message groups, where the second record of group "a" fails
+    records = [
+        sqs_fifo_event_factory("success", "a"),
+        sqs_fifo_event_factory("success", "b"),
+        sqs_fifo_event_factory("fail", "a"),
+        sqs_fifo_event_factory("success", "b"),
+        sqs_fifo_event_factory("success", "a"),
+    ]
+    handled = []
+
+    def record_handler(record: SQSRecord):
+        handled.append(record.message_id)
+        if "fail" in record.body:
+            raise Exception("Failed to process record.")
+        return record.body
+
+    processor = SqsFifoPartialProcessor(max_concurrency=max_concurrency)
+
+    # WHEN
+    with processor(records, record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN the remaining record of group "a" is never handled, and results are returned in record order
+    assert records[4]["messageId"] not in handled
+    assert len(handled) == 4
+    assert [message[0] for message in processed_messages] == ["success", "success", "fail", "success", "fail"]
+    assert "SQSFifoCircuitBreakerError" in processed_messages[4][1]
+    assert batch.response() == {
+        "batchItemFailures": [
+            {"itemIdentifier": records[2]["messageId"]},
+            {"itemIdentifier": records[4]["messageId"]},
+        ]
+    }
+
+
+def test_sqs_fifo_processor_groups_processed_concurrently(sqs_fifo_event_factory):
+    # GIVEN a handler that only completes when both message groups are in flight at the same time
+    barrier = threading.Barrier(parties=2, timeout=5)
+
+    def record_handler(record: SQSRecord):
+        barrier.wait()
+        return record.body
+
+    records = [sqs_fifo_event_factory("success", "a"), sqs_fifo_event_factory("success", "b")]
+    processor = SqsFifoPartialProcessor(max_concurrency=2)
+
+    # WHEN
+    with processor(records, record_handler) as batch:
+        batch.process()
+
+    # THEN
+    assert batch.response() == {"batchItemFailures": []}
+
+
+def test_batch_processor_kinesis_checkpoint_stops_at_first_failure(kinesis_event_factory, kinesis_record_handler):
+    # GIVEN
+    first_record = KinesisStreamRecord(kinesis_event_factory("success"))
+    second_record = KinesisStreamRecord(kinesis_event_factory("failure"))
+    third_record = KinesisStreamRecord(kinesis_event_factory("fail"))
+    records = [first_record.raw_event, second_record.raw_event, third_record.raw_event]
+    processor = BatchProcessor(event_type=EventType.KinesisDataStreams, checkpoint=True)
+
+    # WHEN
+    with patch.object(processor, "_to_batch_type", wraps=processor._to_batch_type) as to_batch_type_mock:
+        with processor(records, kinesis_record_handler) as batch:
+            processed_messages = batch.process()
+
+    # THEN records after the checkpoint are never converted nor processed
+    assert to_batch_type_mock.call_count == 2
+    assert [message[0] for message in processed_messages] == ["success", "fail"]
+    assert batch.response() == {"batchItemFailures": [{"itemIdentifier": second_record.kinesis.sequence_number}]}
+
+
+def test_batch_processor_dynamodb_checkpoint_stops_at_first_failure(dynamodb_event_factory, dynamodb_record_handler):
+    # GIVEN
+    first_record = dynamodb_event_factory("success")
+    second_record = dynamodb_event_factory("failure")
+    third_record = dynamodb_event_factory("fail")
+    records = [first_record, second_record, third_record]
+    processor = BatchProcessor(event_type=EventType.DynamoDBStreams, checkpoint=True)
+
+    # WHEN
+    with processor(records, dynamodb_record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN
+    assert len(processed_messages) == 2
+    assert batch.response() == {"batchItemFailures": [{"itemIdentifier": second_record["dynamodb"]["SequenceNumber"]}]}
+
+
+def test_batch_processor_checkpoint_success_only(kinesis_event_factory, kinesis_record_handler):
+    # GIVEN
+    records = [kinesis_event_factory("success"), kinesis_event_factory("success")]
+    processor = BatchProcessor(event_type=EventType.KinesisDataStreams, checkpoint=True)
+
+    # WHEN
+    with processor(records, kinesis_record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN
+    assert len(processed_messages) == 2
+    assert batch.response() == {"batchItemFailures": []}
+
+
+def test_batch_processor_checkpoint_not_supported_for_sqs():
+    with pytest.raises(ValueError):
+        BatchProcessor(event_type=EventType.SQS, checkpoint=True)
+
+    with pytest.raises(ValueError):
+        BatchProcessor(event_type=EventType.KinesisDataStreams, checkpoint=True, max_concurrency=2)
+
+
+def test_batch_processor_process_pool_with_failure(kinesis_event_factory):
+    # GIVEN
+    first_record = KinesisStreamRecord(kinesis_event_factory("success"))
+    second_record = KinesisStreamRecord(kinesis_event_factory("failure"))
+    third_record = KinesisStreamRecord(kinesis_event_factory("success"))
+    records = [first_record.raw_event, second_record.raw_event, third_record.raw_event]
+    processor = BatchProcessor(event_type=EventType.KinesisDataStreams, max_concurrency=2, use_process_pool=True)
+
+    # WHEN
+    try:
+        with processor(records, kinesis_process_pool_record_handler) as batch:
+            processed_messages = batch.process()
+    finally:
+        processor._process_pool.shutdown()
+
+    # THEN records are processed in worker processes, and results are returned in record order
+    assert [message[0] for message in processed_messages] == ["success", "fail", "success"]
+    assert processed_messages[0][1][0] == "success"
+    assert processed_messages[0][1][1] != os.getpid()
+    assert processed_messages[0][2] == first_record.raw_event
+    assert "ValueError" in processed_messages[1][1]
+    assert batch.response() == {"batchItemFailures": [{"itemIdentifier": second_record.kinesis.sequence_number}]}
+
+    # THEN the remote traceback is kept for failure reporting
+    _, exception, _ = batch.exceptions[0]
+    assert "kinesis_process_pool_record_handler" in str(exception.__cause__)
+
+
+def test_batch_processor_process_pool_reuses_workers(kinesis_event_factory):
+    # GIVEN
+    records = [kinesis_event_factory("success") for _ in range(4)]
+    processor = BatchProcessor(event_type=EventType.KinesisDataStreams, max_concurrency=2, use_process_pool=True)
+
+    # WHEN processing two batches (warm start)
+    pids = set()
+    try:
+        for _ in range(2):
+            with processor(records, kinesis_process_pool_record_handler) as batch:
+                pids.update(result[1] for _, result, _ in batch.process())
+    finally:
+        processor._process_pool.shutdown()
+
+    # THEN
+    assert len(pids) <= 2
+
+
+def test_batch_processor_process_pool_worker_exits(kinesis_event_factory):
+    # GIVEN a record handler that kills its worker process
+    records = [kinesis_event_factory("success")]
+    processor = BatchProcessor(event_type=EventType.KinesisDataStreams, max_concurrency=1, use_process_pool=True)
+
+    # WHEN
+    try:
+        with pytest.raises(BatchProcessingError) as error:
+            with processor(records, exiting_record_handler) as batch:
+                batch.process()
+        error_message = str(error.value)
+
+        # THEN the worker process is replaced for the next batch
+        with processor(records, kinesis_process_pool_record_handler) as batch:
+            processed_messages = batch.process()
+    finally:
+        processor._process_pool.shutdown()
+
+    assert "WorkerProcessError" in error_message
+    assert processed_messages[0][0] == "success"
+
+
+def test_batch_processor_process_pool_unpicklable_handler(kinesis_event_factory):
+    # GIVEN a record handler that can't be pickled to be sent to worker processes
+    records = [kinesis_event_factory("success") for _ in range(2)]
+    processor = BatchProcessor(event_type=EventType.KinesisDataStreams, max_concurrency=1, use_process_pool=True)
+
+    def record_handler(record: KinesisStreamRecord):
+        return record.kinesis.sequence_number
+
+    # WHEN
+    try:
+        with pytest.raises(BatchProcessingError) as error:
+            with processor(records, record_handler) as batch:
+                batch.process()
+        error_message = str(error.value)
+
+        # THEN records fail instead of the whole batch processing, and workers are still usable
+        with processor(records, kinesis_process_pool_record_handler) as batch:
+            processed_messages = batch.process()
+    finally:
+        processor._process_pool.shutdown()
+
+    assert "Unable to send records to worker process" in error_message
+    assert len(batch.exceptions) == 0
+    assert [message[0] for message in processed_messages] == ["success", "success"]
+
+
+@pytest.mark.parametrize("max_concurrency", [None, 2])
+def test_batch_processor_chunk_size_with_per_record_outcomes(sqs_fifo_event_factory, max_concurrency):
+    # GIVEN a record handler receiving chunks of records, and returning an outcome for each of them
+    records = [sqs_fifo_event_factory(body, "a") for body in ("success", "fail", "success", "fail", "success")]
+    chunk_sizes = []
+
+    def record_handler(records: List[SQSRecord]):
+        chunk_sizes.append(len(records))
+        return [Exception("Failed to write record.") if "fail" in record.body else record.body for record in records]
+
+    processor = BatchProcessor(event_type=EventType.SQS, chunk_size=2, max_concurrency=max_concurrency)
+
+    # WHEN
+    with processor(records, record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN
+    assert sorted(chunk_sizes) == [1, 2, 2]
+    assert [message[0] for message in processed_messages] == ["success", "fail", "success", "fail", "success"]
+    assert processed_messages[0] == ("success", "success", records[0])
+    assert batch.response() == {
+        "batchItemFailures": [
+            {"itemIdentifier": records[1]["messageId"]},
+            {"itemIdentifier": records[3]["messageId"]},
+        ]
+    }
+
+
+def test_batch_processor_chunk_size_handler_raises(sqs_fifo_event_factory):
+    # GIVEN a record handler failing for the first chunk, and returning None when all records succeeded
+    records = [sqs_fifo_event_factory("fail", "a"), sqs_fifo_event_factory("fail", "a")]
+    records.append(sqs_fifo_event_factory("success", "a"))
+
+    def record_handler(records: List[SQSRecord]):
+        if any("fail" in record.body for record in records):
+            raise Exception("Failed to write chunk.")
+
+    processor = BatchProcessor(event_type=EventType.SQS, chunk_size=2)
+
+    # WHEN
+    with processor(records, record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN all records from the failed chunk are reported
+    assert [message[0] for message in processed_messages] == ["fail", "fail", "success"]
+    assert batch.response() == {
+        "batchItemFailures": [
+            {"itemIdentifier": records[0]["messageId"]},
+            {"itemIdentifier": records[1]["messageId"]},
+        ]
+    }
+
+
+def test_batch_processor_chunk_size_outcomes_mismatch(sqs_fifo_event_factory):
+    # GIVEN a record handler returning fewer outcomes than records
+    records = [sqs_fifo_event_factory("success", "a"), sqs_fifo_event_factory("success", "a")]
+    records.append(sqs_fifo_event_factory("success", "a"))
+
+    def record_handler(records: List[SQSRecord]):
+        return [True]
+
+    processor = BatchProcessor(event_type=EventType.SQS, chunk_size=2)
+
+    # WHEN
+    with processor(records, record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN
+    assert [message[0] for message in processed_messages] == ["fail", "fail", "success"]
+    assert "returned 1 outcomes for 2 records" in processed_messages[0][1]
+
+
+@pytest.mark.parametrize("outcomes", ["ok", {"a": True, "b": True}, 1, (True for _ in range(2))])
+def test_batch_processor_chunk_size_outcomes_not_a_list(sqs_fifo_event_factory, outcomes):
+    # GIVEN a record handler returning something else than a list of outcomes
+    records = [sqs_fifo_event_factory("success", "a"), sqs_fifo_event_factory("success", "a")]
+
+    def record_handler(records: List[SQSRecord]):
+        return outcomes
+
+    processor = BatchProcessor(event_type=EventType.SQS, chunk_size=2)
+
+    # WHEN
+    with pytest.raises(BatchProcessingError) as error:
+        with processor(records, record_handler) as batch:
+            batch.process()
+
+    # THEN all records of the chunk are failed, instead of being mapped to characters, keys, or raising
+    assert len(batch.fail_messages) == 2
+    assert f"must return a list or tuple of outcomes, or None, not {type(outcomes).__name__}" in str(error.value)
+
+
+def test_batch_processor_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        BatchProcessor(event_type=EventType.SQS, chunk_size=0)
+
+    with pytest.raises(ValueError):
+        BatchProcessor(event_type=EventType.KinesisDataStreams, chunk_size=10, checkpoint=True)
+
+
+def test_batch_processor_timeout_margin_reports_records_not_started(sqs_fifo_event_factory, mocker):
+    # GIVEN an invocation with 10s left, where each record takes 3s to process
+    clock = mocker.patch("aws_lambda_powertools.utilities.batch.base.time.monotonic", return_value=0)
+    lambda_context = mocker.Mock(get_remaining_time_in_millis=mocker.Mock(return_value=10_000))
+    records = [sqs_fifo_event_factory("success", "a") for _ in range(4)]
+    event = {"Records": records}
+
+    def record_handler(record: SQSRecord):
+        clock.return_value += 3
+        return record.body
+
+    processor = BatchProcessor(event_type=EventType.SQS, timeout_margin_ms=5_000)
+
+    @batch_processor(record_handler=record_handler, processor=processor)
+    def lambda_handler(event, context):
+        return processor.response()
+
+    # WHEN
+    result = lambda_handler(event, lambda_context)
+
+    # THEN records not started within the first 5s are reported as failures
+    assert result == {
+        "batchItemFailures": [
+            {"itemIdentifier": records[2]["messageId"]},
+            {"itemIdentifier": records[3]["messageId"]},
+        ]
+    }
+    assert "BatchDeadlineExceededError" in str(processor.exceptions[0][0])
+
+
+def test_batch_processor_timeout_margin_without_lambda_context(sqs_event_factory, record_handler):
+    # GIVEN
+    records = [sqs_event_factory("success")]
+    processor = BatchProcessor(event_type=EventType.SQS, timeout_margin_ms=5_000)
+
+    # WHEN
+    with processor(records, record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN
+    assert processed_messages[0][0] == "success"
+
+
+def test_batch_processor_metrics_added_once_per_batch(sqs_event_factory, record_handler):
+    # GIVEN
+    metrics = Metrics(namespace="test", service="batch")
+    metrics.clear_metrics()
+    records = [sqs_event_factory("success"), sqs_event_factory("fail"), sqs_event_factory("success")]
+    processor = BatchProcessor(event_type=EventType.SQS, metrics=metrics)
+
+    # WHEN
+    try:
+        with processor(records, record_handler) as batch:
+            batch.process()
+        metric_set = copy.deepcopy(metrics.metric_set)
+    finally:
+        metrics.clear_metrics()
+
+    # THEN
+    assert metric_set["BatchRecordSuccesses"]["Value"] == [2]
+    assert metric_set["BatchRecordFailures"]["Value"] == [1]
+    assert metric_set["BatchRecordHandlerInvocations"]["Value"] == [3]
+    assert metric_set["BatchRecordHandlerLatencyMin"]["Unit"] == "Milliseconds"
+    latency_min = metric_set["BatchRecordHandlerLatencyMin"]["Value"][0]
+    latency_p99 = metric_set["BatchRecordHandlerLatencyP99"]["Value"][0]
+    latency_max = metric_set["BatchRecordHandlerLatencyMax"]["Value"][0]
+    assert latency_min <= latency_p99 <= latency_max
+    assert metric_set["BatchRecordHandlerLatencySum"]["Value"][0] >= latency_max
+    assert metric_set["BatchRecordConversionTime"]["Value"][0] > 0
+
+
+def test_batch_processor_metrics_when_entire_batch_fails(sqs_event_factory, record_handler):
+    # GIVEN
+    metrics = Metrics(namespace="test", service="batch")
+    metrics.clear_metrics()
+    records = [sqs_event_factory("fail")]
+    processor = BatchProcessor(event_type=EventType.SQS, metrics=metrics, max_concurrency=2)
+
+    # WHEN
+    try:
+        with pytest.raises(BatchProcessingError):
+            with processor(records, record_handler) as batch:
+                batch.process()
+        metric_set = copy.deepcopy(metrics.metric_set)
+    finally:
+        metrics.clear_metrics()
+
+    # THEN
+    assert metric_set["BatchRecordFailures"]["Value"] == [1]
+    assert metric_set["BatchRecordHandlerInvocations"]["Value"] == [1]
+
+
+def test_batch_processor_streaming_keeps_only_failed_identifiers(kinesis_event_factory, kinesis_record_handler):
+    # GIVEN
+    first_record = KinesisStreamRecord(kinesis_event_factory("success"))
+    second_record = KinesisStreamRecord(kinesis_event_factory("fail"))
+    third_record = KinesisStreamRecord(kinesis_event_factory("success"))
+    records = [first_record.raw_event, second_record.raw_event, third_record.raw_event]
+    results = []
+    processor = BatchProcessor(event_type=EventType.KinesisDataStreams, streaming=True, result_callback=results.append)
+
+    # WHEN
+    with processor(records, kinesis_record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN results are only passed to the callback
+    assert processed_messages == []
+    assert batch.success_messages == []
+    assert batch.fail_messages == []
+    assert [result[0] for result in results] == ["success", "fail", "success"]
+    assert results[0] == ("success", "success", first_record.raw_event)
+    assert batch.response() == {"batchItemFailures": [{"itemIdentifier": second_record.kinesis.sequence_number}]}
+
+
+def test_batch_processor_streaming_with_checkpoint(kinesis_event_factory, kinesis_record_handler):
+    # GIVEN
+    first_record = KinesisStreamRecord(kinesis_event_factory("fail"))
+    second_record = KinesisStreamRecord(kinesis_event_factory("success"))
+    records = [first_record.raw_event, second_record.raw_event]
+    results = []
+    processor = BatchProcessor(
+        event_type=EventType.KinesisDataStreams, streaming=True, checkpoint=True, result_callback=results.append
+    )
+
+    # WHEN
+    with processor(records, kinesis_record_handler) as batch:
+        batch.process()
+
+    # THEN
+    assert len(results) == 1
+    assert batch.response() == {"batchItemFailures": [{"itemIdentifier": first_record.kinesis.sequence_number}]}
+
+
+def test_batch_processor_streaming_error_when_entire_batch_fails(sqs_event_factory, record_handler):
+    # GIVEN
+    records = [sqs_event_factory("fail"), sqs_event_factory("fail")]
+    processor = BatchProcessor(event_type=EventType.SQS, streaming=True)
+
+    # WHEN
+    with pytest.raises(BatchProcessingError) as error:
+        with processor(records, record_handler) as batch:
+            batch.process()
+
+    # THEN exception messages are reported, without tracebacks referencing records
+    assert "Failed to process record." in str(error.value)
+    assert "Traceback" not in str(error.value)
+
+
+def test_batch_processor_streaming_releases_failed_records(kinesis_event_factory):
+    # GIVEN a record handler failing with a chained exception, while referencing the record in its frame
+    converted_records = []
+
+    def record_handler(record: KinesisStreamRecord):
+        converted_records.append(weakref.ref(record))
+        if "fail" not in b64_to_str(record.kinesis.data):
+            return "success"
+        try:
+            raise ValueError("Unable to decode record.")
+        except ValueError as exc:
+            raise Exception("Failed to process record.") from exc
+
+    records = [kinesis_event_factory("fail"), kinesis_event_factory("success")]
+    processor = BatchProcessor(event_type=EventType.KinesisDataStreams, streaming=True)
+
+    # WHEN
+    with processor(records, record_handler) as batch:
+        batch.process()
+    gc.collect()
+
+    # THEN converted records are released, while exception types and messages are kept
+    assert len(converted_records) == 2
+    assert all(record() is None for record in converted_records)
+    exc_type, exc_value, exc_traceback = batch.exceptions[0]
+    assert exc_type is Exception
+    assert str(exc_value) == "Failed to process record."
+    assert exc_traceback is None
+
+
+def test_batch_processor_result_callback_without_streaming(sqs_event_factory, record_handler):
+    # GIVEN
+    records = [sqs_event_factory("success"), sqs_event_factory("fail")]
+    results = []
+    processor = BatchProcessor(event_type=EventType.SQS, max_concurrency=2, result_callback=results.append)
+
+    # WHEN
+    with processor(records, record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN
+    assert results == processed_messages
+
+
+def test_batch_processor_streaming_invalid_mode():
+    with pytest.raises(ValueError):
+        BatchProcessor(event_type=EventType.SQS, streaming=True, max_concurrency=2)
+
+
+class OrderSqs(SqsRecordModel):
+    body: Dict
+
+    @validator("body", pre=True)
+    def transform_body_to_dict(cls, value: str):
+        return json.loads(value)
+
+
+@pytest.mark.parametrize("max_concurrency", [None, 2])
+def test_batch_processor_model_validation_failure_reported(sqs_fifo_event_factory, max_concurrency):
+    # GIVEN a batch with a record that fails model validation
+    def record_handler(record: OrderSqs):
+        return record.body["item"]
+
+    valid_record = sqs_fifo_event_factory(json.dumps({"item": "success"}), "group")
+    invalid_record = sqs_fifo_event_factory("not json", "group")
+    records = [valid_record, invalid_record, copy.deepcopy(valid_record)]
+
+    # WHEN
+    processor = BatchProcessor(event_type=EventType.SQS, model=OrderSqs, max_concurrency=max_concurrency)
+    with processor(records, record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN only the invalid record is reported, and the remaining ones are still processed
+    assert [message[0] for message in processed_messages] == ["success", "fail", "success"]
+    assert batch.response() == {"batchItemFailures": [{"itemIdentifier": invalid_record["messageId"]}]}
+
+
+def test_batch_processor_model_validated_in_bulk(sqs_fifo_event_factory, mocker):
+    # GIVEN
+    import pydantic
+
+    parse_obj_as = mocker.spy(pydantic, "parse_obj_as")
+    records = [sqs_fifo_event_factory(json.dumps({"item": index}), "group") for index in range(5)]
+
+    # WHEN
+    processor = BatchProcessor(event_type=EventType.SQS, model=OrderSqs)
+    with processor(records, lambda record: record.body["item"]) as batch:
+        processed_messages = batch.process()
+
+    # THEN all records are validated at once
+    parse_obj_as.assert_called_once()
+    assert [message[1] for message in processed_messages] == list(range(5))
+
+
+def test_sqs_fifo_processor_model_validation_failure_short_circuits_group(sqs_fifo_event_factory):
+    # GIVEN
+    first_record = sqs_fifo_event_factory("not json", "group")
+    second_record = sqs_fifo_event_factory(json.dumps({"item": "success"}), "group")
+    third_record = sqs_fifo_event_factory(json.dumps({"item": "success"}), "other-group")
+
+    # WHEN
+    processor = SqsFifoPartialProcessor(model=OrderSqs)
+    with processor([first_record, second_record, third_record], lambda record: record.body["item"]) as batch:
+        batch.process()
+
+    # THEN
+    assert batch.response() == {
+        "batchItemFailures": [
+            {"itemIdentifier": first_record["messageId"]},
+            {"itemIdentifier": second_record["messageId"]},
+        ]
+    }
+
+
+@pytest.mark.parametrize("max_concurrency", [None, 2])
+def test_batch_processor_deduplication_fans_out_outcome(sqs_fifo_event_factory, max_concurrency):
+    # GIVEN a batch where the same order was delivered several times
+    calls: List[str] = []
+
+    def record_handler(record: SQSRecord):
+        payload = json.loads(record.body)
+        calls.append(payload["order_id"])
+        if payload["order_id"] == "fail":
+            raise ValueError("Failed to process record.")
+        return payload["order_id"]
+
+    first_record = sqs_fifo_event_factory(json.dumps({"order_id": "success"}), "group")
+    second_record = sqs_fifo_event_factory(json.dumps({"order_id": "fail"}), "group")
+    third_record = sqs_fifo_event_factory(json.dumps({"order_id": "success", "retry": 1}), "group")
+    fourth_record = sqs_fifo_event_factory(json.dumps({"order_id": "fail", "retry": 1}), "group")
+    records = [first_record, second_record, third_record, fourth_record]
+
+    # WHEN
+    processor = BatchProcessor(
+        event_type=EventType.SQS,
+        max_concurrency=max_concurrency,
+        deduplication_key_jmespath="powertools_json(body).order_id",
+    )
+    with processor(records, record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN the record handler is called once per order, and duplicates share its outcome
+    assert sorted(calls) == ["fail", "success"]
+    assert [message[0] for message in processed_messages] == ["success", "fail", "success", "fail"]
+    assert batch.response() == {
+        "batchItemFailures": [
+            {"itemIdentifier": second_record["messageId"]},
+            {"itemIdentifier": fourth_record["messageId"]},
+        ]
+    }
+
+
+def test_batch_processor_deduplication_without_key(sqs_fifo_event_factory, record_handler):
+    # GIVEN records without a deduplication key, or whose key can't be extracted
+    first_record = sqs_fifo_event_factory("success", "group")
+    second_record = sqs_fifo_event_factory("success", "group")
+    third_record = sqs_fifo_event_factory(json.dumps({"no_key": 1}), "group")
+
+    # WHEN
+    processor = BatchProcessor(event_type=EventType.SQS, deduplication_key_jmespath="powertools_json(body).order_id")
+    with processor([first_record, second_record, third_record], record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN they're all processed
+    assert [message[1] for message in processed_messages] == ["success", "success", json.dumps({"no_key": 1})]
+
+
+def test_batch_processor_deduplication_invalid_mode():
+    with pytest.raises(ValueError):
+        BatchProcessor(event_type=EventType.SQS, chunk_size=10, deduplication_key_jmespath="messageId")
+
+
+def s3_pointer_body(key: str) -> str:
+    return json.dumps(
+        ["software.amazon.payloadoffloading.PayloadS3Pointer", {"s3BucketName": "large-payloads", "s3Key": key}]
+    )
+
+
+def test_batch_processor_resolves_s3_pointers(sqs_fifo_event_factory):
+    # GIVEN a batch mixing SQS Extended Client messages and regular messages
+    resolver = S3PointerResolver(max_workers=1, config=Config(region_name="us-east-1"))
+    first_record = sqs_fifo_event_factory(s3_pointer_body("first"), "group")
+    second_record = sqs_fifo_event_factory("inline", "group")
+    third_record = sqs_fifo_event_factory(s3_pointer_body("third"), "group")
+    missing_record = sqs_fifo_event_factory(s3_pointer_body("missing"), "group")
+    records = [first_record, second_record, third_record, missing_record]
+
+    def record_handler(record: SQSRecord):
+        return record.body
+
+    # WHEN
+    processor = BatchProcessor(event_type=EventType.SQS, s3_pointer_resolver=resolver)
+    with Stubber(resolver.client) as stubber:
+        for key, payload in (("first", b"first payload"), ("third", b"third payload")):
+            stubber.add_response(
+                "get_object",
+                {"Body": StreamingBody(io.BytesIO(payload), len(payload))},
+                expected_params={"Bucket": "large-payloads", "Key": key},
+            )
+        stubber.add_client_error("get_object", service_error_code="NoSuchKey", http_status_code=404)
+
+        with processor(records, record_handler) as batch:
+            processed_messages = batch.process()
+
+        stubber.assert_no_pending_responses()
+
+    # THEN record handlers receive the S3 object content, and payloads that couldn't be fetched are reported
+    assert [message[1] for message in processed_messages[:3]] == ["first payload", "inline", "third payload"]
+    assert processed_messages[3][0] == "fail"
+    assert batch.response() == {"batchItemFailures": [{"itemIdentifier": missing_record["messageId"]}]}
+
+
+def test_batch_processor_s3_pointer_resolver_only_for_sqs():
+    with pytest.raises(ValueError):
+        BatchProcessor(
+            event_type=EventType.KinesisDataStreams,
+            s3_pointer_resolver=S3PointerResolver(config=Config(region_name="us-east-1")),
+        )
+
+
+@pytest.mark.parametrize("max_concurrency", [None, 2])
+def test_batch_processor_deaggregates_kpl_records(kinesis_event_factory, max_concurrency):
+    # GIVEN KPL aggregated records, one of them containing a failing user record
+    calls: List[str] = []
+
+    def record_handler(record: KinesisUserRecord):
+        calls.append(record.data_as_text())
+        if record.data_as_text() == "fail":
+            raise ValueError("Failed to process user record.")
+        return record.data_as_text()
+
+    first_record = kinesis_event_factory("")
+    first_record["kinesis"]["data"] = kpl_aggregate([("1", b"success"), ("2", b"success")])
+    second_record = kinesis_event_factory("")
+    second_record["kinesis"]["data"] = kpl_aggregate([("1", b"success"), ("1", b"fail"), ("2", b"skipped")])
+    third_record = kinesis_event_factory("not aggregated")
+
+    # WHEN
+    processor = BatchProcessor(
+        event_type=EventType.KinesisDataStreams, deaggregate=True, max_concurrency=max_concurrency
+    )
+    with processor([first_record, second_record, third_record], record_handler) as batch:
+        processed_messages = batch.process()
+
+    # THEN failures are reported for the Kinesis record, skipping its remaining user records
+    assert "skipped" not in calls
+    assert processed_messages[0][1] == ["success", "success"]
+    assert processed_messages[2][1] == ["not aggregated"]
+    assert batch.response() == {"batchItemFailures": [{"itemIdentifier": second_record["kinesis"]["sequenceNumber"]}]}
+
+
+def test_batch_processor_deaggregate_only_for_kinesis():
+    with pytest.raises(ValueError):
+        BatchProcessor(event_type=EventType.SQS, deaggregate=True)
+
+
+@pytest.fixture(scope="module")
+def firehose_event_factory() -> Callable:
+    def factory(body: str):
+        return {
+            "recordId": str(uuid.uuid4()),
+            "approximateArrivalTimestamp": 1664028820148,
+            "data": str_to_b64(body),
+        }
+
+    return factory
+
+
+@pytest.mark.parametrize("max_concurrency", [None, 2])
+def test_firehose_processor_transforms_records(firehose_event_factory, max_concurrency):
+    # GIVEN
+    def record_handler(record: KinesisFirehoseRecord):
+        payload = record.data_as_text()
+        if payload == "fail":
+            raise ValueError("Failed to transform record.")
+        if payload == "drop":
+            return None
+        return {"payload": payload}
+
+    records = [firehose_event_factory(body) for body in ("success", "fail", "drop")]
+    processor = FirehoseTransformationProcessor(max_concurrency=max_concurrency)
+
+    # WHEN
+    @batch_processor(record_handler=record_handler, processor=processor)
+    def lambda_handler(event, context):
+        return processor.response()
+
+    response = lambda_handler({"records": records}, {})
+
+    # THEN
+    assert response == {
+        "records": [
+            {"recordId": records[0]["recordId"], "result": "Ok", "data": str_to_b64('{"payload": "success"}')},
+            {"recordId": records[1]["recordId"], "result": "ProcessingFailed", "data": ""},
+            {"recordId": records[2]["recordId"], "result": "Dropped", "data": ""},
+        ]
+    }
+    assert len(processor.fail_messages) == 1
+
+
+def test_firehose_processor_response_size_limit(firehose_event_factory):
+    # GIVEN a response size limit fitting only two transformed records
+    records = [firehose_event_factory("x" * 200) for _ in range(3)]
+    processor = FirehoseTransformationProcessor(max_response_size=900)
+
+    # WHEN
+    with processor(records, lambda record: record.data_as_bytes()) as batch:
+        batch.process()
+
+    # THEN records that don't fit are marked as failed, and the response is within the limit
+    response = batch.response()
+    assert [record["result"] for record in response["records"]] == ["Ok", "Ok", "ProcessingFailed"]
+    assert len(json.dumps(response)) <= 900
+    assert isinstance(batch.exceptions[0][1], FirehoseResponseSizeExceededError)
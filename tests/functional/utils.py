@@ -1,7 +1,8 @@
 import base64
+import hashlib
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, List, Tuple
 
 from aws_lambda_powertools.shared.json_encoder import Encoder
 
@@ -21,3 +22,33 @@ def b64_to_str(data: str) -> str:
 
 def json_serialize(data):
     return json.dumps(data, sort_keys=True, cls=Encoder)
+
+
+def _protobuf_varint(value: int) -> bytes:
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            return bytes(encoded)
+
+
+def _protobuf_field(field_number: int, value: Any) -> bytes:
+    if isinstance(value, int):
+        return _protobuf_varint(field_number << 3) + _protobuf_varint(value)
+    return _protobuf_varint(field_number << 3 | 2) + _protobuf_varint(len(value)) + value
+
+
+def kpl_aggregate(user_records: List[Tuple[str, bytes]]) -> str:
+    """Aggregate (partition key, data) user records as the Kinesis Producer Library does, base64 encoded"""
+    partition_keys = list(dict.fromkeys(partition_key for partition_key, _ in user_records))
+    message = b"".join(_protobuf_field(1, partition_key.encode()) for partition_key in partition_keys)
+    for partition_key, data in user_records:
+        record = _protobuf_field(1, partition_keys.index(partition_key)) + _protobuf_field(3, data)
+        message += _protobuf_field(3, record)
+
+    aggregated = b"\xf3\x89\x9a\xc2" + message + hashlib.md5(message).digest()  # nosec
+    return base64.b64encode(aggregated).decode("utf-8")
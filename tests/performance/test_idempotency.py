@@ -0,0 +1,101 @@
+import itertools
+from collections import namedtuple
+from typing import Any, Callable, Dict
+
+import pytest
+
+from aws_lambda_powertools.utilities.idempotency import (
+    IdempotencyConfig,
+    InMemoryPersistenceLayer,
+    SQLitePersistenceLayer,
+    idempotent,
+    idempotent_function,
+)
+
+# payload sizes, in number of order lines of ~100 bytes each
+PAYLOAD_SIZES = {"1KB": 10, "100KB": 1000, "1MB": 10000}
+LOCAL_CACHE = {"no_cache": False, "cache": True}
+
+LambdaContext = namedtuple("LambdaContext", ["function_name", "aws_request_id"])
+
+
+def build_payload(lines_count: int, order_id: Any = 0) -> Dict[str, Any]:
+    lines = [{"sku": f"SKU-{line:08d}", "quantity": line % 7, "description": "x" * 60} for line in range(lines_count)]
+    return {"id": order_id, "lines": lines}
+
+
+def build_persistence_layer(layer: str, tmp_path):
+    if layer == "in_memory":
+        return InMemoryPersistenceLayer()
+    return SQLitePersistenceLayer(database=str(tmp_path / "idempotency.db"))
+
+
+def build_handler(decorator: str, persistence_layer, config: IdempotencyConfig) -> Callable[[Dict[str, Any]], Any]:
+    """Wrap a trivial handler with `idempotent` or `idempotent_function`, so benchmarks only measure overhead"""
+    if decorator == "idempotent":
+        context = LambdaContext(function_name="test-func", aws_request_id="test-request")
+
+        @idempotent(persistence_store=persistence_layer, config=config)
+        def lambda_handler(event, context):
+            return {"statusCode": 200}
+
+        return lambda payload: lambda_handler(payload, context)
+
+    @idempotent_function(data_keyword_argument="order", persistence_store=persistence_layer, config=config)
+    def process_order(order):
+        return {"statusCode": 200}
+
+    return lambda payload: process_order(order=payload)
+
+
+@pytest.mark.perf
+@pytest.mark.benchmark(group="idempotency-first-call")
+@pytest.mark.parametrize("layer", ["in_memory", "sqlite"])
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+@pytest.mark.parametrize("decorator", ["idempotent", "idempotent_function"])
+def test_idempotency_first_call_overhead(benchmark, tmp_path, decorator, size, layer):
+    # GIVEN a handler whose payloads are always new
+    # WHEN calling it
+    # THEN measure hashing the payload, saving the in progress record, and saving the response
+    handler = build_handler(decorator, build_persistence_layer(layer, tmp_path), IdempotencyConfig())
+    payload = build_payload(PAYLOAD_SIZES[size])
+    order_ids = itertools.count()
+
+    def call():
+        payload["id"] = next(order_ids)
+        handler(payload)
+
+    benchmark(call)
+
+
+@pytest.mark.perf
+@pytest.mark.benchmark(group="idempotency-repeated-call")
+@pytest.mark.parametrize("cache", LOCAL_CACHE)
+@pytest.mark.parametrize("layer", ["in_memory", "sqlite"])
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+@pytest.mark.parametrize("decorator", ["idempotent", "idempotent_function"])
+def test_idempotency_repeated_call_overhead(benchmark, tmp_path, decorator, size, layer, cache):
+    # GIVEN a handler that already completed for a payload
+    # WHEN calling it again with the same payload
+    # THEN measure returning the stored response, with and without the local cache
+    config = IdempotencyConfig(use_local_cache=LOCAL_CACHE[cache])
+    handler = build_handler(decorator, build_persistence_layer(layer, tmp_path), config)
+    payload = build_payload(PAYLOAD_SIZES[size])
+    handler(payload)
+
+    benchmark(handler, payload)
+
+
+@pytest.mark.perf
+@pytest.mark.benchmark(group="idempotency-key-extraction")
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def test_idempotency_key_jmespath_overhead(benchmark, size):
+    # GIVEN a handler whose idempotency key is a small part of a large payload
+    # WHEN calling it again with the same payload
+    # THEN measure returning the stored response when only the key is hashed
+    config = IdempotencyConfig(event_key_jmespath="id", use_local_cache=True)
+    handler = build_handler("idempotent_function", InMemoryPersistenceLayer(), config)
+    payload = build_payload(PAYLOAD_SIZES[size], order_id="order-1")
+    handler(payload)
+
+    benchmark(handler, payload)